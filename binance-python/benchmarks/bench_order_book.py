@@ -0,0 +1,111 @@
+from asyncio import run as run_async
+from random import Random
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.market_stream import BinanceMarketStream
+from binance_python.spot.order_book import LocalOrderBook
+from binance_python.spot.typings import OrderBookResponse
+
+
+def make_snapshot(levels: int) -> OrderBookResponse:
+    """
+    Order book of "levels" price levels per side around 20000, spaced by 0.01.
+    """
+    return {
+        "lastUpdateId": 0,
+        "bids": [[f"{20000 - level / 100:.2f}", "1.00000"] for level in range(levels)],
+        "asks": [
+            [f"{20000.01 + level / 100:.2f}", "1.00000"] for level in range(levels)
+        ],
+    }
+
+
+def make_updates(count: int, seed: int = 0) -> list[dict]:
+    """
+    Depth update events changing 3 levels per side near the top of the book; 1 in 5 removes its level.
+    """
+    random = Random(seed)
+
+    def levels(first: float, direction: int) -> list[list[str]]:
+        return [
+            [
+                f"{first + direction * random.randint(0, 50) / 100:.2f}",
+                "0" if random.random() < 0.2 else f"{random.uniform(0.1, 5.0):.5f}",
+            ]
+            for _ in range(3)
+        ]
+
+    return [
+        {
+            "e": "depthUpdate",
+            "U": update_id,
+            "u": update_id,
+            "b": levels(20000.0, -1),
+            "a": levels(20000.01, 1),
+        }
+        for update_id in range(1, count + 1)
+    ]
+
+
+async def measure(
+    updates: int, levels: int, symbols: int, repeat: int
+) -> dict[str, float]:
+    """
+    Measures the depth update application rate of a local order book, and the memory
+    taken by each symbol: a loaded order book, and the market stream subscriptions with handlers.
+    """
+    client = BinanceSpotClient("", "")
+    snapshot = make_snapshot(levels)
+    events = make_updates(updates)
+
+    # best of "repeat" runs, each over a freshly loaded book
+    book = LocalOrderBook(client, "BTCUSDT")
+    elapsed = []
+    for _ in range(repeat):
+        book._load_snapshot(snapshot)
+        started = perf_counter()
+        for event in events:
+            book._apply_event(event)
+        elapsed.append(perf_counter() - started)
+
+    # memory allocated while setting up the symbols, kept alive until measured
+    start()
+    books = []
+    for index in range(symbols):
+        symbol_book = LocalOrderBook(client, f"SYMBOL{index}USDT")
+        symbol_book._load_snapshot(snapshot)
+        books.append(symbol_book)
+    order_book_bytes = get_traced_memory()[0]
+
+    market_stream = BinanceMarketStream()
+    handler = lambda stream, event: None
+    for index in range(symbols):
+        market_stream.subscribe_trades(f"SYMBOL{index}USDT", handler)
+        market_stream.subscribe_depth(f"SYMBOL{index}USDT", handler=handler)
+        market_stream.subscribe_book_ticker(f"SYMBOL{index}USDT", handler)
+    market_stream_bytes = get_traced_memory()[0] - order_book_bytes
+    stop()
+
+    await client.dispose()
+    return {
+        "order_book.updates_per_second": updates / min(elapsed),
+        "memory.order_book.bytes_per_symbol": order_book_bytes / symbols,
+        "memory.market_stream.bytes_per_symbol": market_stream_bytes / symbols,
+    }
+
+
+def run(
+    updates: int = 100000, levels: int = 1000, symbols: int = 100, repeat: int = 3
+) -> dict[str, float]:
+    return run_async(measure(updates, levels, symbols, repeat))
+
+
+def main() -> None:
+    for name, value in run().items():
+        print(f"{name:>45}: {value:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from asyncio import gather, run as run_async
+from time import perf_counter
+
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.rate_limiter import RateLimiter
+
+
+CONCURRENCY_LEVELS = (1, 8, 64)
+
+
+async def measure(requests: int) -> dict[str, float]:
+    """
+    Measures the round-trip throughput of _send_request against a local fake server,
+    for unsigned and signed requests at each concurrency level.
+    """
+    results = {}
+    async with FakeBinanceServer(weight_limit=10**9, market_rate=0.0) as server:
+        # timestamps wait for a connection at high concurrency: the receive window is widened
+        client = server.client(
+            rate_limiter=RateLimiter(weight_limit=10**9), recv_window=60000
+        )
+        await client.warm_up(max(CONCURRENCY_LEVELS))
+
+        endpoints = {
+            "ping": lambda: client._send_request("GET", "/api/v3/ping"),
+            "signed": lambda: client._send_request(
+                "GET", "/api/v3/openOrders", dict(timestamp=""), weight=6
+            ),
+        }
+        for name, request in endpoints.items():
+            for concurrency in CONCURRENCY_LEVELS:
+
+                async def worker() -> None:
+                    for _ in range(requests // concurrency):
+                        await request()
+
+                started = perf_counter()
+                await gather(*[worker() for _ in range(concurrency)])
+                elapsed = perf_counter() - started
+                results[
+                    f"requests.{name}.concurrency_{concurrency}.requests_per_second"
+                ] = (requests // concurrency * concurrency / elapsed)
+
+        await client.dispose()
+    return results
+
+
+def run(requests: int = 1024) -> dict[str, float]:
+    return run_async(measure(requests))
+
+
+def main() -> None:
+    for name, value in run().items():
+        print(f"{name:>55}: {value:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from asyncio import create_task, run as run_async
+from time import perf_counter
+from typing import AsyncIterator
+from orjson import dumps
+
+from binance_python.base_ws_client import BaseWebsocketClient
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.market_stream import BinanceMarketStream
+
+
+STREAM = "btcusdt@trade"
+TRADE = dumps(
+    {
+        "e": "trade",
+        "E": 1650000000000,
+        "s": "BTCUSDT",
+        "t": 12345,
+        "p": "20000.01000000",
+        "q": "0.00100000",
+        "b": 88,
+        "a": 50,
+        "T": 1650000000000,
+        "m": True,
+        "M": True,
+    }
+).decode("utf-8")
+
+
+async def measure_client(
+    server: FakeBinanceServer,
+    client: BaseWebsocketClient,
+    messages: AsyncIterator,
+    count: int,
+) -> float:
+    """
+    Publishes "count" trades once the client is subscribed, and times their consumption.
+    :return: messages consumed per second
+    """
+    client.subscribe([STREAM])
+
+    async def consume() -> None:
+        received = 0
+        async for _ in messages:
+            received += 1
+            if received == count:
+                return
+
+    consumer = create_task(consume())
+    await client.subscribed.wait()
+    started = perf_counter()
+    for _ in range(count):
+        server.publish(STREAM, TRADE)
+    await consumer
+    elapsed = perf_counter() - started
+    await messages.aclose()  # type: ignore
+    return count / elapsed
+
+
+async def measure(count: int) -> dict[str, float]:
+    """
+    Measures the websocket throughput of the clients against a local fake server:
+    _stream alone (read and json decode), and the market stream (plus typed decode and dispatch).
+    """
+    async with FakeBinanceServer(
+        market_rate=0.0, connection_queue_size=count + 100
+    ) as server:
+        raw_client = BaseWebsocketClient(None, base_url=server.ws_url)
+        market_stream = BinanceMarketStream(base_url=server.ws_url)
+        market_stream.add_handler(STREAM, lambda stream, event: event.price)
+        return {
+            "stream.read_decode.messages_per_second": await measure_client(
+                server, raw_client, raw_client._stream(raw_stream=False), count
+            ),
+            "stream.decode_dispatch.messages_per_second": await measure_client(
+                server, market_stream, market_stream.stream(), count
+            ),
+        }
+
+
+def run(count: int = 50000) -> dict[str, float]:
+    return run_async(measure(count))
+
+
+def main() -> None:
+    for name, value in run().items():
+        print(f"{name:>45}: {value:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Runs the benchmarks and writes their results as JSON, optionally comparing them with a previous run.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output new.json --compare results.json --threshold 0.1
+
+Metrics ending in "_per_second" are better when higher; the others (times, bytes) when lower.
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from platform import platform, python_version
+from subprocess import CalledProcessError, check_output
+from sys import exit
+from typing import Callable, Optional
+from orjson import OPT_INDENT_2, OPT_SORT_KEYS, dumps, loads
+
+from benchmarks import bench_order_book, bench_requests, bench_signing, bench_stream
+
+
+BENCHMARKS: dict[str, Callable[[], dict[str, float]]] = {
+    "signing": bench_signing.run,
+    "requests": bench_requests.run,
+    "stream": bench_stream.run,
+    "order_book": bench_order_book.run,
+}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (CalledProcessError, OSError):
+        return None
+
+
+def run_benchmarks(names: list[str]) -> dict:
+    """
+    Runs the benchmarks, returning their metrics with the context needed to compare runs.
+    """
+    metrics: dict[str, float] = {}
+    for name in names:
+        print(f"running {name} benchmarks")
+        metrics.update(BENCHMARKS[name]())
+    return {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": python_version(),
+        "platform": platform(),
+        "metrics": metrics,
+    }
+
+
+def compare(
+    previous: dict[str, float], current: dict[str, float], threshold: float
+) -> list[str]:
+    """
+    Prints the relative change of each metric.
+    :return: names of the metrics that got worse by more than "threshold"
+    """
+    regressions = []
+    for name, value in current.items():
+        old_value = previous.get(name)
+        if not old_value:
+            print(f"{name:>60}: {value:14.2f}")
+            continue
+
+        change = (value - old_value) / old_value
+        worse = -change if name.endswith("_per_second") else change
+        marker = ""
+        if worse > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:>60}: {value:14.2f} ({change:+.1%}){marker}")
+    return regressions
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"benchmarks to run, among: {', '.join(BENCHMARKS)}. Default all",
+    )
+    parser.add_argument("--output", help="file where the results are written as JSON")
+    parser.add_argument("--compare", help="results of a previous run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change counted as a regression. Default 0.1 (10%%)",
+    )
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.benchmarks or list(BENCHMARKS))
+    if args.output:
+        with open(args.output, "wb") as file:
+            file.write(dumps(results, option=OPT_INDENT_2 | OPT_SORT_KEYS))
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, "rb") as file:
+            previous = loads(file.read())["metrics"]
+    regressions = compare(previous, results["metrics"], args.threshold)
+    if regressions:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
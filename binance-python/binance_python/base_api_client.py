@@ -1,62 +1,275 @@
-from httpx import AsyncClient
-from time import time
-from hashlib import sha256
-from hmac import new as hmac
+from httpx import AsyncClient, Limits
+from asyncio import CancelledError, Task, create_task, gather, sleep
+from decimal import Decimal
+from logging import getLogger
+from time import perf_counter, time
 from orjson import loads
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+from binance_python.clock_sync import ClockSync
+from binance_python.metrics import MetricsHooks
+from binance_python.rate_limiter import RateLimiter
+from binance_python.signing import HmacSigner, Signer
 
 
 CONNECTION_ERROR_CODE = 99
+RATE_LIMIT_STATUS_CODES = (429, 418)
 Params = dict[str, str]
+Number = Union[Decimal, float, int, str]
+
+logger = getLogger(__name__)
 
 
 class BinanceApiException(Exception):
-    def __init__(self, error_code: int, error_message: str) -> None:
+    def __init__(
+        self, error_code: int, error_message: str, data: Optional[Any] = None
+    ) -> None:
         self.error_code = error_code
         self.error_message = error_message
+        self.data = data  # extra error details, e.g. the results of a cancel-replace
         super().__init__(f"{self.error_code}: {self.error_message}")
 
 
+def to_decimal(value: Number) -> Decimal:
+    """
+    Converts a number to Decimal. Floats are converted from their shortest representation.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def format_number(value: Number) -> str:
+    """
+    Formats a number in plain decimal notation, as accepted by the API (never "1e-05").
+    """
+    if isinstance(value, str):
+        return value
+    return format(to_decimal(value).normalize(), "f")
+
+
+class PoolStats:
+    """
+    Statistics of the http connection pool.
+    """
+
+    requests: int
+    new_connections: int
+    waits: int
+    in_flight: int
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.waits = 0
+        self.in_flight = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Requests served by an already open connection.
+        """
+        return self.requests - self.new_connections
+
+    def __repr__(self) -> str:
+        return (
+            f"PoolStats(requests={self.requests}, hits={self.hits}, "
+            f"new_connections={self.new_connections}, waits={self.waits})"
+        )
+
+
 class BaseApiClient:
     """
     Base class to handle calls to the Binance API endpoints.
     """
 
     testnet: bool
+    rate_limiter: RateLimiter
+    clock: ClockSync
+    recv_window: Optional[int]
+    pool_stats: PoolStats
+    metrics: Optional[MetricsHooks]
+
+    _signer: Signer
+    _limits: Limits
+    _http2: bool
+    _clock_sync_task: Optional[Task] = None
+    _keep_alive_task: Optional[Task] = None
 
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = False) -> None:
-        self._api_secret = api_secret.encode("utf-8")
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        testnet: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        recv_window: Optional[int] = None,
+        limits: Optional[Limits] = None,
+        http2: bool = False,
+        signer: Optional[Signer] = None,
+        metrics: Optional[MetricsHooks] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param recv_window: default milliseconds a signed request stays valid after its timestamp. Server default 5000
+        :param limits: connection pool limits. Default 100 connections, 20 kept alive for 60 seconds
+        :param http2: multiplexes requests over HTTP/2 connections. Requires the "h2" package
+        :param signer: signs the requests, e.g. an Ed25519Signer. Otherwise signs with the HMAC api secret
+        :param metrics: receives the latency, error code and used weight of each request
+        :param base_url: url of the REST API, e.g. a FakeBinanceServer. Overrides "testnet"
+        """
+        self._signer = signer if signer else HmacSigner(api_secret)
+        self._limits = (
+            limits
+            if limits
+            else Limits(
+                max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+            )
+        )
+        self._http2 = http2
         self._http = AsyncClient(
-            base_url="https://testnet.binance.vision"
+            base_url=base_url
+            if base_url
+            else "https://testnet.binance.vision"
             if testnet
             else "https://api.binance.com",
             headers={"X-MBX-APIKEY": api_key},
+            limits=self._limits,
+            http2=http2,
         )
+        self.pool_stats = PoolStats()
         self.testnet = testnet
+        self.rate_limiter = rate_limiter if rate_limiter else RateLimiter()
+        self.clock = ClockSync()
+        self.recv_window = recv_window
+        self.metrics = metrics
 
     async def dispose(self) -> None:
         """
         Disposes the client and releases inner resources.
         """
+        # the background tasks may be in the middle of a request: they end before the pool is closed
+        tasks = [
+            task for task in (self._clock_sync_task, self._keep_alive_task) if task
+        ]
+        self.stop_clock_sync()
+        self.stop_keep_alive()
+        await gather(*tasks, return_exceptions=True)
         await self._http.aclose()
 
-    @staticmethod
-    def _get_timestamp() -> str:
+    async def warm_up(self, connections: int = 1) -> None:
+        """
+        Opens connections ahead of time, so later requests don't pay the TCP and TLS handshakes.
+        """
+        # concurrent requests force the pool to open one connection each
+        await gather(
+            *[self._send_request("GET", "/api/v3/ping") for _ in range(connections)]
+        )
+
+    async def _keep_alive_loop(self, connections: int, interval: float) -> None:
         """
-        Returns the UTC milliseconds since epoch.
+        Periodically uses the pooled connections so they are not closed for being idle.
         """
-        return str(int(time() * 1000))
+        while True:
+            await sleep(interval)
+            try:
+                await self.warm_up(connections)
+            except CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"unable to keep connections alive: {exc}")
+
+    def start_keep_alive(
+        self, connections: int = 1, interval: Optional[float] = None
+    ) -> None:
+        """
+        Starts keeping "connections" alive in background. By default, pings at half the keep alive expiry.
+        """
+        if not self._keep_alive_task:
+            expiry = self._limits.keepalive_expiry
+            self._keep_alive_task = create_task(
+                self._keep_alive_loop(
+                    connections, interval if interval else (expiry or 60.0) / 2
+                )
+            )
+
+    def stop_keep_alive(self) -> None:
+        """
+        Stops the background keep alive.
+        """
+        if self._keep_alive_task:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+
+    async def _trace(self, event: str, info: dict) -> None:
+        """
+        Receives the http transport events, to count new connections.
+        """
+        if event == "connection.connect_tcp.complete":
+            self.pool_stats.new_connections += 1
+
+    def _get_timestamp(self) -> str:
+        """
+        Returns the UTC milliseconds since epoch, corrected by the server clock offset.
+        """
+        return str(int(self.clock.now()))
+
+    async def sync_clock(self, samples: int = 3) -> None:
+        """
+        Samples the server time to estimate the offset of the local clock.
+        """
+        for _ in range(samples):
+            sent_at = time() * 1000
+            data = await self._send_request("GET", "/api/v3/time")
+            self.clock.add_sample(sent_at, data["serverTime"], time() * 1000)
+        logger.debug(
+            f"clock offset: {self.clock.offset:.1f} ms, rtt: {self.clock.rtt:.1f} ms"
+        )
+
+    async def _clock_sync_loop(self, interval: float) -> None:
+        """
+        Periodically samples the server time.
+        """
+        while True:
+            try:
+                await self.sync_clock()
+            except CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"unable to sync clock: {exc}")
+            await sleep(interval)
+
+    def start_clock_sync(self, interval: float = 60.0) -> None:
+        """
+        Starts synchronizing the clock with the server in background.
+        """
+        if not self._clock_sync_task:
+            self._clock_sync_task = create_task(self._clock_sync_loop(interval))
+
+    def stop_clock_sync(self) -> None:
+        """
+        Stops the background clock synchronization.
+        """
+        if self._clock_sync_task:
+            self._clock_sync_task.cancel()
+            self._clock_sync_task = None
 
     def _generate_query_params(self, params: Params) -> str:
         """
         Form query parameters for the requests. Adds "signature" if "timestamp" is present.
         """
-        # generate query parameters as bytes
-        query_params = "&".join([f"{key}={value}" for key, value in params.items()])
+        # applies the default receive window to signed methods
+        if "timestamp" in params and self.recv_window and "recvWindow" not in params:
+            params["recvWindow"] = str(self.recv_window)
+
+        # generate query parameters
+        query_params = "&".join(map("=".join, params.items()))
 
         # check if it is a signed method (has a timestamp)
         if "timestamp" in params:
-            query_params += f"&signature={hmac(self._api_secret, query_params.encode('utf-8'), sha256).hexdigest()}"
+            signature = self._signer.sign(query_params.encode("utf-8"))
+            query_params += f"&signature={signature}"
 
         return query_params
 
@@ -65,29 +278,73 @@ class BaseApiClient:
         method: str,
         endpoint: str,
         params: Optional[Params] = None,
+        weight: int = 1,
+        orders: int = 0,
     ) -> Any:
         """
         Performs an http request to the Binance server.
+        :param weight: request weight of the endpoint
+        :param orders: number of orders the request counts against the order limits
         """
+        # waits for rate limit budget
+        await self.rate_limiter.acquire(weight, orders)
+
+        # refreshes the timestamp, since the request may have waited for budget
+        if params and "timestamp" in params:
+            params["timestamp"] = self._get_timestamp()
+
         # generate query params
         query_params = self._generate_query_params(params) if params else None
 
+        # requests wait for a connection when all HTTP/1.1 connections are busy
+        stats = self.pool_stats
+        stats.requests += 1
+        if not self._http2 and stats.in_flight >= (
+            self._limits.max_connections or stats.in_flight + 1
+        ):
+            stats.waits += 1
+
         # make the request
+        started = perf_counter()
+        stats.in_flight += 1
         try:
             response = await self._http.request(
                 method=method,
                 url=endpoint,
                 params=query_params,
+                extensions={"trace": self._trace},
             )
         except Exception:
+            if self.metrics:
+                self.metrics.record_request(
+                    f"{method} {endpoint}",
+                    perf_counter() - started,
+                    CONNECTION_ERROR_CODE,
+                    None,
+                )
             raise BinanceApiException(
                 CONNECTION_ERROR_CODE,
                 "Unable to connect with binance server",
             )
+        finally:
+            stats.in_flight -= 1
+
+        # keeps track of the rate limits
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code in RATE_LIMIT_STATUS_CODES:
+            retry_after = response.headers.get("retry-after")
+            self.rate_limiter.block(float(retry_after) if retry_after else None)
 
         # handles response
         data = loads(response.content)
+        if self.metrics:
+            self.metrics.record_request(
+                f"{method} {endpoint}",
+                perf_counter() - started,
+                None if response.status_code == 200 else data.get("code"),
+                response.headers.get("x-mbx-used-weight-1m"),
+            )
         if response.status_code == 200:
             return data
         else:
-            raise BinanceApiException(data["code"], data["msg"])
+            raise BinanceApiException(data["code"], data["msg"], data.get("data"))
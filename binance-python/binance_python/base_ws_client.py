@@ -1,9 +1,159 @@
 from websockets.client import connect, WebSocketClientProtocol
 from websockets.exceptions import ConnectionClosed
+from asyncio import (
+    Event,
+    Future,
+    Queue,
+    Task,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+    wait_for,
+)
+from enum import Enum
+from itertools import count
 from logging import Logger, getLogger
-from typing import Optional, AsyncIterator, cast
+from random import uniform
+from typing import Any, Hashable, Iterator, Optional, AsyncIterator, Union, cast
 from orjson import loads, dumps
-from time import time
+from time import monotonic, time
+
+from binance_python.base_api_client import BinanceApiException, CONNECTION_ERROR_CODE
+from binance_python.metrics import MetricsHooks
+from binance_python.recorder import StreamRecorder, StreamReplayer
+
+
+# event type of the message yielded when the connection is lost and messages may have been missed
+STREAM_GAP_EVENT = "streamGap"
+
+# maximum number of streams sent in a single subscription message
+MAX_STREAMS_PER_MESSAGE = 200
+
+# seconds to wait for a renewed connection to be subscribed
+RENEWAL_TIMEOUT = 10.0
+
+# seconds after a connection renewal during which the messages received twice are skipped
+RENEWAL_OVERLAP = 10.0
+
+
+class OverflowPolicy(Enum):
+    """
+    What the reader does when the queue of the consumer is full.
+    """
+
+    BLOCK = "BLOCK"  # waits for the consumer, stops reading the websocket meanwhile
+    DROP_OLDEST = "DROP_OLDEST"  # discards the oldest queued message
+    DISCONNECT = "DISCONNECT"  # drops the connection, signaling a stream gap
+
+
+class QueueStats:
+    """
+    Backpressure statistics of the queue between the websocket reader and the consumer.
+    """
+
+    depth: int
+    max_depth: int
+    overflows: int
+    dropped: int
+    conflated: int
+    lag: float
+    max_lag: float
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.max_depth = 0
+        self.overflows = 0  # times a message found the queue full
+        self.dropped = 0
+        self.conflated = 0  # messages replaced by a newer one of the same stream
+        self.lag = 0.0  # seconds a message waits in the queue, smoothed
+        self.max_lag = 0.0
+
+    def record_lag(self, lag: float) -> None:
+        """
+        Accounts the time a message waited in the queue before being consumed.
+        """
+        self.lag += (lag - self.lag) * 0.1
+        self.max_lag = max(self.max_lag, lag)
+
+    def __repr__(self) -> str:
+        return (
+            f"QueueStats(depth={self.depth}, max_depth={self.max_depth}, overflows={self.overflows}, "
+            f"dropped={self.dropped}, conflated={self.conflated}, lag={self.lag:.4f}, max_lag={self.max_lag:.4f})"
+        )
+
+
+class MessageQueue(Queue):
+    """
+    Queue between the websocket reader and the consumer, able to drop its oldest data message.
+    """
+
+    def drop_oldest(self) -> bool:
+        """
+        Discards the oldest data message. Stream gap markers and the end of stream are kept,
+        so consumers always learn that messages were missed.
+        :return: False if the queue holds no data message
+        """
+        for index, (_, message) in enumerate(self._queue):  # type: ignore
+            if message is not None and message.get("e") != STREAM_GAP_EVENT:
+                del self._queue[index]  # type: ignore
+                return True
+        return False
+
+
+class ConflatingQueue:
+    """
+    Buffer keeping only the latest message of each stream and symbol, handed out in batches.
+    Its size is bounded by the number of streams instead of the message rate.
+    """
+
+    _latest: dict[Hashable, tuple[float, Optional[dict]]]
+    _ready: Event
+    _stats: QueueStats
+
+    def __init__(self, stats: QueueStats) -> None:
+        self._latest = {}
+        self._ready = Event()
+        self._stats = stats
+
+    @staticmethod
+    def key(message: dict) -> Hashable:
+        """
+        Returns the conflation key of a message: the stream name of combined stream messages,
+        or the event type and symbol of raw stream messages.
+        """
+        if "stream" in message:
+            return message["stream"]
+        return message.get("e"), message.get("s")
+
+    def full(self) -> bool:
+        return False
+
+    def qsize(self) -> int:
+        return len(self._latest)
+
+    async def put(self, item: tuple[float, Optional[dict]]) -> None:
+        """
+        Stores a message, replacing the previous one with the same key.
+        """
+        message = item[1]
+        key = None if message is None else self.key(message)
+
+        # moves the key to the end, so batches keep the order of the latest updates
+        if self._latest.pop(key, None) is not None:
+            self._stats.conflated += 1
+        self._latest[key] = item
+        self._ready.set()
+
+    async def get_batch(self) -> list[tuple[float, Optional[dict]]]:
+        """
+        Waits for messages and takes all of them.
+        """
+        await self._ready.wait()
+        batch = list(self._latest.values())
+        self._latest.clear()
+        self._ready.clear()
+        return batch
 
 
 class BaseWebsocketClient:
@@ -11,79 +161,643 @@ class BaseWebsocketClient:
     Websocket client class.
     """
 
-    _websocket = Optional[WebSocketClientProtocol]
-    _subscriptions: set[str] = set()
+    _websocket: Optional[WebSocketClientProtocol]
+    _subscriptions: set[str]
     _base_url: str
     _logger: Logger
+    _reconnect: bool
+    _max_connection_age: float
+    _backoff_base: float
+    _backoff_max: float
+    _queue_size: int
+    _overflow_policy: OverflowPolicy
+    queue_stats: QueueStats
+    metrics: Optional[MetricsHooks]
+    recorder: Optional[StreamRecorder]
+    _replayer: Optional[StreamReplayer] = None
+    subscribed: Event  # set while connected, once the server acknowledged the subscriptions
+
+    # control channel state
+    _request_ids: Iterator[int]
+    _requests: dict[int, Future]
+    _pending_changes: dict[str, bool]
+    _pending_waiters: list[Future]
+    _control_interval: float
+    _next_control_time: float
+    _send_tasks: set[Task]
+    _flush_task: Optional[Task] = None
+
+    # connection renewal state
+    _handover: Optional[tuple[WebSocketClientProtocol, list[str], set[str]]] = None
+    _overlap: Optional[set[str]] = None
 
-    def __init__(self, logger: Optional[Logger], testnet=False) -> None:
+    def __init__(
+        self,
+        logger: Optional[Logger],
+        testnet=False,
+        reconnect: bool = True,
+        max_connection_age: float = 23.5 * 3600,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_control_messages_per_second: float = 4.0,
+        queue_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        metrics: Optional[MetricsHooks] = None,
+        recorder: Optional[StreamRecorder] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param reconnect: reconnects and resubscribes when the connection is lost
+        :param max_connection_age: seconds after which the connection is replaced by a new one, ahead of the server 24h disconnection
+        :param backoff_base: seconds to wait before the first reconnection attempt, doubled at each failed attempt
+        :param backoff_max: maximum seconds to wait before a reconnection attempt
+        :param max_control_messages_per_second: rate of control messages. Server max 5, including pings and pongs
+        :param queue_size: messages buffered between the websocket reader and the consumer
+        :param overflow_policy: what the reader does when the buffer is full
+        :param metrics: receives the stream and event time of each message
+        :param recorder: records the received frames, to be replayed later
+        :param base_url: url of the websocket server, e.g. a FakeBinanceServer. Overrides "testnet"
+        """
         self._base_url = (
-            "wss://testnet.binance.vision"
+            base_url
+            if base_url
+            else "wss://testnet.binance.vision"
             if testnet
             else "wss://stream.binance.com:9443"
         )
         self._logger = logger if logger else getLogger(__name__)
+        self._websocket = None
+        self._subscriptions = set()
+        self._reconnect = reconnect
+        self._max_connection_age = max_connection_age
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._request_ids = count(1)
+        self._requests = {}
+        self._pending_changes = {}
+        self._pending_waiters = []
+        self._control_interval = 1.0 / max_control_messages_per_second
+        self._next_control_time = 0.0
+        self._send_tasks = set()
+        self._queue_size = queue_size
+        self._overflow_policy = overflow_policy
+        self.queue_stats = QueueStats()
+        self.subscribed = Event()
+        self.metrics = metrics
+        self.recorder = recorder
+
+    @property
+    def subscriptions(self) -> set[str]:
+        """
+        Streams the client is subscribed to, or will subscribe to when connected.
+        """
+        return set(self._subscriptions)
 
-    async def _send_subscription(self, subscriptions: list[str], subscribe: bool):
+    def subscribe(self, streams: list[str]) -> Future:
         """
-        Sends a subscribe / unsubscribe message over websocket.
+        Subscribes to streams. The changes are sent in batches, respecting the control messages rate.
+        :return: future resolved when the server acknowledges the subscription
+        """
+        self._subscriptions.update(streams)
+        for stream in streams:
+            self._pending_changes[stream] = True
+        return self._schedule_changes()
+
+    def unsubscribe(self, streams: list[str]) -> Future:
+        """
+        Unsubscribes from streams. The changes are sent in batches, respecting the control messages rate.
+        :return: future resolved when the server acknowledges the unsubscription
+        """
+        self._subscriptions.difference_update(streams)
+        for stream in streams:
+            self._pending_changes[stream] = False
+        return self._schedule_changes()
+
+    async def list_subscriptions(self) -> list[str]:
+        """
+        Asks the server for the current subscriptions. The messages must be consumed meanwhile.
+        """
+        return await self._send_request("LIST_SUBSCRIPTIONS")
+
+    def _schedule_changes(self) -> Future:
+        """
+        Returns a future for the pending changes and starts sending them if connected.
+        """
+        waiter = get_running_loop().create_future()
+        # failures are logged already: callers may ignore the future
+        waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._pending_waiters.append(waiter)
+        if self._websocket and not self._flush_task:
+            self._flush_task = create_task(self._flush_changes())
+        return waiter
+
+    async def _wait_control_slot(self) -> None:
         """
-        if self._websocket:
+        Waits until a control message can be sent without exceeding the rate limit.
+        """
+        # reserves the slot before sleeping, so concurrent senders queue behind each other
+        now = monotonic()
+        slot = max(now, self._next_control_time)
+        self._next_control_time = slot + self._control_interval
+        if slot > now:
+            await sleep(slot - now)
+
+    async def _send_request(self, method: str, params: Optional[list] = None) -> Any:
+        """
+        Sends a control message and waits for the reply with the same id.
+        """
+        future = self._send_request_nowait(method, params)
+        return await future
+
+    def _send_request_nowait(
+        self,
+        method: str,
+        params: Optional[list] = None,
+        websocket: Optional[WebSocketClientProtocol] = None,
+    ) -> Future:
+        """
+        Sends a control message in background. Returns a future resolved by the reply with the same id.
+        :param websocket: connection to send the message over. Otherwise the current one
+        """
+        request_id = next(self._request_ids)
+        future = self._requests[request_id] = get_running_loop().create_future()
+        message: dict = {"method": method, "id": request_id}
+        if params is not None:
+            message["params"] = params
+
+        async def send() -> None:
+            await self._wait_control_slot()
             try:
-                message = {
-                    "method": "SUBSCRIBE" if subscribe else "UNSUBSCRIBE",
-                    "params": subscriptions,
-                    "id": int(time() * 1000),
-                }
-                await self._websocket.send(dumps(message).decode("utf-8"))  # type: ignore
+                await (websocket or self._websocket).send(  # type: ignore
+                    dumps(message).decode("utf-8")
+                )
             except Exception as exc:
-                self._logger.warning(f"unable to send subscription message: {exc}")
+                self._logger.warning(f"unable to send {method} message: {exc}")
+                self._resolve_request(
+                    request_id,
+                    exception=BinanceApiException(CONNECTION_ERROR_CODE, str(exc)),
+                )
+
+        # keeps a reference, so the task is not garbage collected while sending
+        task = create_task(send())
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+        return future
+
+    def _send_subscription(
+        self,
+        subscriptions: list[str],
+        subscribe: bool,
+        websocket: Optional[WebSocketClientProtocol] = None,
+    ) -> list[Future]:
+        """
+        Sends subscribe / unsubscribe messages over websocket, in chunks of MAX_STREAMS_PER_MESSAGE streams.
+        """
+        method = "SUBSCRIBE" if subscribe else "UNSUBSCRIBE"
+        return [
+            self._send_request_nowait(
+                method,
+                subscriptions[index : index + MAX_STREAMS_PER_MESSAGE],
+                websocket,
+            )
+            for index in range(0, len(subscriptions), MAX_STREAMS_PER_MESSAGE)
+        ]
+
+    @staticmethod
+    def _chain(requests: list[Future], waiters: list[Future]) -> None:
+        """
+        Resolves the waiters when all requests are done.
+        """
+
+        def resolve(done: Future) -> None:
+            exception = done.exception() if not done.cancelled() else None
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if exception:
+                    waiter.set_exception(exception)
+                else:
+                    waiter.set_result(None)
+
+        if requests:
+            gather(*requests).add_done_callback(resolve)
         else:
-            self._logger.warning(
-                f"unable to send subscription: websocket is disconnected"
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _flush_changes(self) -> None:
+        """
+        Sends the pending subscription changes, batched in as few messages as possible.
+        """
+        try:
+            while self._pending_changes and self._websocket:
+                changes, self._pending_changes = self._pending_changes, {}
+                waiters, self._pending_waiters = self._pending_waiters, []
+                subscribe = [stream for stream, add in changes.items() if add]
+                unsubscribe = [stream for stream, add in changes.items() if not add]
+                requests = []
+                if unsubscribe:
+                    requests += self._send_subscription(unsubscribe, subscribe=False)
+                if subscribe:
+                    requests += self._send_subscription(subscribe, subscribe=True)
+                self._chain(requests, waiters)
+
+                # lets the requests take their slots, so later changes are batched meanwhile
+                await sleep(self._next_control_time - monotonic())
+        finally:
+            self._flush_task = None
+
+    def _on_connected(self) -> None:
+        """
+        Sends all subscriptions over a new connection. Pending changes are part of them.
+        """
+        self._pending_changes.clear()
+        waiters, self._pending_waiters = self._pending_waiters, []
+        requests = []
+        if self._subscriptions:
+            self._logger.info(f"subscribing to streams {self._subscriptions}")
+            requests = self._send_subscription(
+                list(self._subscriptions), subscribe=True
             )
+        connected = get_running_loop().create_future()
+        connected.add_done_callback(self._on_subscribed)
+        self._chain(requests, waiters + [connected])
 
-    async def _stream(self, raw_stream: bool) -> AsyncIterator[dict]:
+    def _on_subscribed(self, done: Future) -> None:
         """
-        Provides a stream of messages received over a connected websocket.
+        Signals that the server acknowledged the subscriptions of a new connection.
         """
-        # defines the kind of stream: raw or combined
-        url = f"{self._base_url}/ws" if raw_stream else f"{self._base_url}/stream"
+        if not done.cancelled() and done.exception() is None:
+            self.subscribed.set()
 
-        # connects with binance server
-        self._logger.info(f"connecting websocket: {url}")
-        async with connect(uri=url, ssl=True) as websocket:
-            try:
-                # handles websocket connection
-                self._logger.info(f"connected websocket: {url}")
-                self._websocket = websocket
+    def _on_disconnected(self) -> None:
+        """
+        Fails the requests waiting for a reply. Subscriptions are sent again when reconnected.
+        """
+        self._websocket = None
+        self.subscribed.clear()
+        self._fail_requests("websocket disconnected")
 
-                # send subscriptions if there are any
-                if self._subscriptions:
-                    self._logger.info(f"subscribing to streams {self._subscriptions}")
-                    await self._send_subscription(list(self._subscriptions), subscribe=True)
+    def _on_renewed(
+        self, websocket: WebSocketClientProtocol, subscriptions: set[str]
+    ) -> None:
+        """
+        Moves the control channel to a renewed connection. Requests sent over the old one are failed,
+        and the subscription changes made while renewing are sent again.
+        :param subscriptions: streams subscribed by the renewed connection
+        """
+        self._websocket = websocket
+        self._fail_requests("websocket renewed")
+        for stream in self._subscriptions - subscriptions:
+            self._pending_changes[stream] = True
+        for stream in subscriptions - self._subscriptions:
+            self._pending_changes[stream] = False
+        if self._pending_changes and not self._flush_task:
+            self._flush_task = create_task(self._flush_changes())
 
-                # keep waiting for messages and process them
-                async for data in websocket:
-                    
-                    # just type cast Data as str for type checking properly
-                    message = cast(str, data)
+    def _fail_requests(self, reason: str) -> None:
+        """
+        Fails all the requests waiting for a reply.
+        """
+        for request_id in list(self._requests):
+            self._resolve_request(
+                request_id,
+                exception=BinanceApiException(CONNECTION_ERROR_CODE, reason),
+            )
 
-                    # logs the received message for debug purposes
-                    self._logger.debug(f"received raw message: {message}")
+    def _resolve_request(
+        self,
+        request_id: int,
+        result: Any = None,
+        exception: Optional[Exception] = None,
+    ) -> None:
+        """
+        Resolves the future of a control message.
+        """
+        future = self._requests.pop(request_id, None)
+        if future and not future.done():
+            if exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
 
-                    # it is a subscription response
-                    if message.startswith('{"return"'):
-                        self._logger.debug("ignoring subscription response")
+    def _handle_reply(self, message: dict) -> bool:
+        """
+        Resolves the request of a control reply. Returns False if the message is not a reply.
+        """
+        # replies have an id and a result or an error, data messages never have an id
+        if "id" not in message or not ("result" in message or "error" in message):
+            return False
+        error = message.get("error")
+        if error:
+            self._logger.warning(f"control message {message['id']} failed: {error}")
+            self._resolve_request(
+                message["id"],
+                exception=BinanceApiException(error.get("code"), error.get("msg")),
+            )
+        else:
+            self._resolve_request(message["id"], result=message["result"])
+        return True
 
-                    # it is a new data message
-                    else:
-                        # parses the json object and passes as dict
-                        yield loads(message)
+    def _record_message(self, message: dict) -> None:
+        """
+        Reports the arrival of a message to the metrics, by stream name or by event type for raw streams.
+        """
+        data = message.get("data", message)
+        event = data if isinstance(data, dict) else {}
+        self.metrics.record_message(  # type: ignore
+            message.get("stream") or event.get("e", ""), event.get("E"), time()
+        )
 
-            except ConnectionClosed:
-                self._logger.warning(f"disconnected websocket: {url}")
-                self._websocket = None
+    def replay(self, replayer: StreamReplayer) -> None:
+        """
+        Feeds the client with recorded messages instead of the network, so strategies consuming
+        the streams run offline. Order books and account mirrors still fetch their REST snapshots
+        through their client, e.g. a FakeBinanceServer client.
+        """
+        self._replayer = replayer
 
+    def _backoff(self, attempt: int) -> float:
+        """
+        Returns the seconds to wait before a reconnection attempt, with exponential backoff and jitter.
+        """
+        delay = min(self._backoff_base * 2**attempt, self._backoff_max)
+        return uniform(delay / 2, delay)
+
+    async def _enqueue(
+        self, queue: Union[MessageQueue, ConflatingQueue], message: Optional[dict]
+    ) -> bool:
+        """
+        Puts a message in the queue of the consumer, applying the overflow policy when it is full.
+        Returns False if the connection must be dropped.
+        """
+        stats = self.queue_stats
+        if queue.full():
+            stats.overflows += 1
+            if self._overflow_policy is OverflowPolicy.DROP_OLDEST:
+                stats.dropped += 1
+                if not queue.drop_oldest():  # type: ignore
+                    # only markers are queued: drops the new message instead
+                    return True
+            elif self._overflow_policy is OverflowPolicy.DISCONNECT:
+                stats.dropped += 1
+                return False
+
+        await queue.put((monotonic(), message))
+        stats.depth = queue.qsize()
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        return True
+
+    async def _connect(self, url: str) -> WebSocketClientProtocol:
+        return await connect(uri=url, ssl=True if url.startswith("wss:") else None)
+
+    async def _open_renewal(
+        self, url: str
+    ) -> tuple[WebSocketClientProtocol, list[str], set[str]]:
+        """
+        Opens and subscribes a connection replacing the current one, buffering its messages until the reader switches to it.
+        :return: the connection, its buffered messages and its subscriptions
+        """
+        websocket = await self._connect(url)
+        frames: list[str] = []
+
+        async def buffer() -> None:
+            async for data in websocket:
+                message = cast(str, data)
+                if not self._handle_reply(loads(message)):
+                    frames.append(message)
+
+        reader = create_task(buffer())
+        subscriptions = set(self._subscriptions)
+        try:
+            # from now on the messages of the current connection may also arrive on the new one
+            self._overlap = set()
+            requests = self._send_subscription(
+                list(subscriptions), subscribe=True, websocket=websocket
+            )
+            await wait_for(gather(*requests), RENEWAL_TIMEOUT)
+        except BaseException:
+            self._overlap = None
+            await websocket.close()
+            raise
+        finally:
+            reader.cancel()
+            await gather(reader, return_exceptions=True)
+        return websocket, frames, subscriptions
+
+    async def _renew(self, url: str, websocket: WebSocketClientProtocol) -> None:
+        """
+        Replaces the connection before the server closes it. The new connection is subscribed first,
+        then the old one is closed and the reader switches over without a stream gap.
+        """
+        await sleep(self._max_connection_age)
+        while True:
+            try:
+                self._handover = await self._open_renewal(url)
+                break
             except Exception as exc:
-                self._logger.error(f"unknown error in websocket: {exc}")
+                self._logger.warning(f"unable to renew websocket {url}: {exc}")
+                await sleep(self._backoff_max)
+        await websocket.close()
+
+    @staticmethod
+    async def _frames(
+        websocket: WebSocketClientProtocol, buffered: list[str]
+    ) -> AsyncIterator[str]:
+        for message in buffered:
+            yield message
+        async for data in websocket:
+            # just type cast Data as str for type checking properly
+            yield cast(str, data)
+
+    async def _read(
+        self, url: str, queue: Union[MessageQueue, ConflatingQueue]
+    ) -> None:
+        """
+        Reads the websocket in its own task, so a slow consumer does not stop the pings from being answered.
+        Renews the connection before the server closes it, switching over once the new one is subscribed.
+        When the connection is lost, queues a {"e": STREAM_GAP_EVENT} message and reconnects.
+        Failed reconnection attempts do not queue more gaps until a connection is established again.
+        """
+        attempt = 0
+        # a gap was already reported for the current outage
+        gap_reported = False
+        handover: Optional[tuple[WebSocketClientProtocol, list[str], set[str]]] = None
+
+        try:
+            while True:
+                websocket: Optional[WebSocketClientProtocol] = None
+                renewal: Optional[Task] = None
+                try:
+                    if handover:
+                        # continues over the renewed connection, starting with its buffered messages
+                        websocket, buffered, subscriptions = handover
+                        handover = None
+                        self._on_renewed(websocket, subscriptions)
+                        self._logger.info(f"renewed websocket: {url}")
+                    else:
+                        # connects with binance server
+                        self._logger.info(f"connecting websocket: {url}")
+                        websocket = await self._connect(url)
+                        buffered = []
+                        self._logger.info(f"connected websocket: {url}")
+                        self._websocket = websocket
+                        gap_reported = False
+
+                        # send subscriptions if there are any
+                        self._on_connected()
+
+                    # renews the connection before the server closes it
+                    renewal = create_task(self._renew(url, websocket))
+
+                    # skips the messages already received by the old connection
+                    overlap, self._overlap = self._overlap or set(), None
+                    overlap_until = monotonic() + RENEWAL_OVERLAP
+
+                    # keep waiting for messages and process them
+                    async for message in self._frames(websocket, buffered):
+                        attempt = 0
+
+                        # logs the received message for debug purposes
+                        self._logger.debug(f"received raw message: {message}")
+
+                        # parses the json object
+                        parsed = loads(message)
+
+                        # control replies never reach the data consumers
+                        if self._handle_reply(parsed):
+                            continue
+
+                        if overlap:
+                            if monotonic() > overlap_until:
+                                overlap.clear()
+                            elif message in overlap:
+                                overlap.discard(message)
+                                continue
+                        if self._overlap is not None:
+                            self._overlap.add(message)
+
+                        if self.metrics:
+                            self._record_message(parsed)
+                        if self.recorder:
+                            self.recorder.write(message, time())
+
+                        if not await self._enqueue(queue, parsed):
+                            self._logger.warning(
+                                f"consumer is too slow, dropping websocket: {url}"
+                            )
+                            break
+
+                    self._logger.info(f"closed websocket: {url}")
+
+                except ConnectionClosed:
+                    self._logger.warning(f"disconnected websocket: {url}")
+
+                except Exception as exc:
+                    self._logger.error(f"unknown error in websocket: {exc}")
+
+                finally:
+                    handover, self._handover = self._handover, None
+                    if renewal:
+                        if not handover:
+                            renewal.cancel()
+                        await gather(renewal, return_exceptions=True)
+                    if websocket:
+                        await websocket.close()
+                    if not handover:
+                        self._on_disconnected()
+
+                # the renewed connection is subscribed: no messages were missed
+                if handover:
+                    continue
+
+                if not self._reconnect:
+                    await queue.put((monotonic(), None))
+                    return
+
+                # tells the consumers that messages may have been missed, once per outage.
+                # Never dropped by the overflow policies
+                if not gap_reported:
+                    gap_reported = True
+                    gap = {"e": STREAM_GAP_EVENT, "E": int(time() * 1000)}
+                    if self.recorder:
+                        self.recorder.write(dumps(gap).decode("utf-8"), time())
+                    await queue.put((monotonic(), gap))
+
+                # reconnects at once after a working connection, then backs off
+                if attempt:
+                    await sleep(self._backoff(attempt - 1))
+                attempt += 1
+        finally:
+            # a renewed connection left behind when the reader is cancelled
+            if handover:
+                await handover[0].close()
+
+    async def _replay(self, queue: ConflatingQueue) -> None:
+        """
+        Feeds the recorded messages to a conflating queue, as the websocket reader does.
+        """
+        async for message in self._replayer.stream():  # type: ignore
+            await queue.put((monotonic(), message))
+        await queue.put((monotonic(), None))
+
+    async def _stream(self, raw_stream: bool) -> AsyncIterator[dict]:
+        """
+        Provides a stream of messages received over a connected websocket.
+        When the connection is lost, yields a {"e": STREAM_GAP_EVENT} message and reconnects.
+        """
+        if self._replayer:
+            # recorded messages are subscribed by definition
+            self.subscribed.set()
+            async for message in self._replayer.stream():
+                yield message
+            return
+
+        # defines the kind of stream: raw or combined
+        url = f"{self._base_url}/ws" if raw_stream else f"{self._base_url}/stream"
+        queue = MessageQueue(self._queue_size)
+        reader = create_task(self._read(url, queue))
+        stats = self.queue_stats
+
+        try:
+            while True:
+                enqueued_at, message = await queue.get()
+                stats.depth = queue.qsize()
+                stats.record_lag(monotonic() - enqueued_at)
+                if message is None:
+                    return
+                yield message
+        finally:
+            reader.cancel()
+
+    async def _conflated_stream(self, raw_stream: bool) -> AsyncIterator[list[dict]]:
+        """
+        Provides batches with the latest message of each stream and symbol received since the previous batch.
+        Intermediate updates are discarded, so slow consumers always process fresh data.
+        """
+        stats = self.queue_stats
+        queue = ConflatingQueue(stats)
+        if self._replayer:
+            # recorded messages are subscribed by definition
+            self.subscribed.set()
+            reader = create_task(self._replay(queue))
+        else:
+            # defines the kind of stream: raw or combined
+            url = f"{self._base_url}/ws" if raw_stream else f"{self._base_url}/stream"
+            reader = create_task(self._read(url, queue))
+
+        try:
+            while True:
+                batch = await queue.get_batch()
+                stats.depth = 0
+                now = monotonic()
+                for enqueued_at, _ in batch:
+                    stats.record_lag(now - enqueued_at)
+                messages = [message for _, message in batch if message is not None]
+                if messages:
+                    yield messages
+                if len(messages) < len(batch):
+                    return
+        finally:
+            reader.cancel()
@@ -0,0 +1,47 @@
+from collections import deque
+from time import time
+
+
+class ClockSync:
+    """
+    Estimates the offset between the local clock and the server clock, NTP style.
+    The estimate comes from the sample with the lowest round trip time, which has the smallest error.
+    """
+
+    offset: float
+    rtt: float
+
+    _samples: deque[tuple[float, float]]
+
+    def __init__(self, max_samples: int = 16) -> None:
+        """
+        :param max_samples: number of recent samples kept for the estimate
+        """
+        self._samples = deque(maxlen=max_samples)
+        self.offset = 0.0
+        self.rtt = 0.0
+
+    @property
+    def synced(self) -> bool:
+        """
+        Checks if there is at least one sample.
+        """
+        return bool(self._samples)
+
+    def add_sample(self, sent_at: float, server_time: int, received_at: float) -> None:
+        """
+        Adds a sample of the server time. All times are milliseconds since epoch.
+        :param sent_at: local time when the request was sent
+        :param server_time: server time in the response
+        :param received_at: local time when the response was received
+        """
+        # the server time is assumed to be taken halfway through the round trip
+        rtt = received_at - sent_at
+        self._samples.append((rtt, server_time - (sent_at + received_at) / 2))
+        self.rtt, self.offset = min(self._samples)
+
+    def now(self) -> float:
+        """
+        Returns the estimated server time, in milliseconds since epoch.
+        """
+        return time() * 1000 + self.offset
@@ -0,0 +1,1617 @@
+from asyncio import (
+    AbstractServer,
+    IncompleteReadError,
+    Queue,
+    QueueFull,
+    StreamReader,
+    StreamWriter,
+    Task,
+    create_task,
+    sleep,
+    start_server,
+)
+from decimal import Decimal, InvalidOperation
+from hmac import compare_digest
+from itertools import count
+from logging import getLogger
+from random import Random
+from secrets import token_hex
+from time import monotonic, time
+from typing import Any, Callable, Iterable, Iterator, NoReturn, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+from zlib import crc32
+from orjson import dumps, loads
+from websockets.exceptions import ConnectionClosed
+from websockets.server import WebSocketServer, WebSocketServerProtocol, serve
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.signing import HmacSigner
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.enums import KlineInterval
+from binance_python.spot.klines import INTERVAL_MILLISECONDS
+
+
+logger = getLogger(__name__)
+
+# prices are kept as integer ticks of 0.01
+PRICE_DECIMALS = 2
+TICK_SIZE = 10**-PRICE_DECIMALS
+
+# security of the endpoints: public, api key required, or api key and signature required
+_PUBLIC = 0
+_API_KEY = 1
+_SIGNED = 2
+
+_STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+}
+
+_DEFAULT_SYMBOLS = {
+    "BTCUSDT": ("BTC", "USDT", 30000.0),
+    "ETHUSDT": ("ETH", "USDT", 2000.0),
+}
+
+
+def _format_price(ticks: int) -> str:
+    return f"{ticks * TICK_SIZE:.{PRICE_DECIMALS}f}"
+
+
+def _format_quantity(quantity: float) -> str:
+    return f"{quantity:.8f}"
+
+
+def _mandatory(params: dict[str, str], name: str) -> str:
+    """
+    Returns a parameter, failing as the server does when it is missing.
+    """
+    value = params.get(name)
+    if not value:
+        raise BinanceApiException(
+            -1102,
+            f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.",
+        )
+    return value
+
+
+def _decimal(params: dict[str, str], name: str) -> Decimal:
+    value = _mandatory(params, name)
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise BinanceApiException(
+            -1100, f"Illegal characters found in parameter '{name}'."
+        )
+
+
+class _FakeSymbol:
+    """
+    Market state of a symbol: last price, order book and running statistics.
+    """
+
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    price: int  # ticks
+    open_price: int
+    high: int
+    low: int
+    volume: float
+    quote_volume: float
+    bids: dict[int, float]  # quantity by price ticks
+    asks: dict[int, float]
+    update_id: int
+    trade_id: int
+    # current kline by interval, for the subscribed kline streams
+    klines: dict[str, dict]
+
+    def __init__(
+        self,
+        symbol: str,
+        base_asset: str,
+        quote_asset: str,
+        price: float,
+        depth_levels: int,
+        random: Random,
+    ) -> None:
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.price = self.open_price = self.high = self.low = round(price / TICK_SIZE)
+        self.volume = 0.0
+        self.quote_volume = 0.0
+        self.bids = {
+            self.price - level: round(random.uniform(0.1, 5.0), 5)
+            for level in range(1, depth_levels + 1)
+        }
+        self.asks = {
+            self.price + level: round(random.uniform(0.1, 5.0), 5)
+            for level in range(1, depth_levels + 1)
+        }
+        self.update_id = 1
+        self.trade_id = 0
+        self.klines = {}
+
+    def best_bid(self) -> int:
+        return self.price - 1
+
+    def best_ask(self) -> int:
+        return self.price + 1
+
+    @staticmethod
+    def levels(side: dict[int, float], descending: bool, limit: int) -> list[list[str]]:
+        prices = sorted(side, reverse=descending)[:limit]
+        return [
+            [_format_price(price), _format_quantity(side[price])] for price in prices
+        ]
+
+    def depth(self, limit: int) -> dict:
+        return {
+            "lastUpdateId": self.update_id,
+            "bids": self.levels(self.bids, True, limit),
+            "asks": self.levels(self.asks, False, limit),
+        }
+
+
+class _FakeConnection:
+    """
+    Websocket connection of the fake server, with its subscriptions and outgoing frames.
+    """
+
+    websocket: WebSocketServerProtocol
+    combined: bool
+    streams: set[str]
+    outgoing: Queue
+    _window_start: float
+    _window_messages: int
+
+    def __init__(
+        self, websocket: WebSocketServerProtocol, combined: bool, queue_size: int
+    ) -> None:
+        self.websocket = websocket
+        self.combined = combined
+        self.streams = set()
+        self.outgoing = Queue(queue_size)
+        self._window_start = monotonic()
+        self._window_messages = 0
+
+    def count_message(self) -> int:
+        """
+        Accounts an incoming message, returning the messages received in the current second.
+        """
+        now = monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_messages = 0
+        self._window_messages += 1
+        return self._window_messages
+
+
+class FakeBinanceServer:
+    """
+    In-process stand-in of the Binance spot REST and websocket APIs, for tests and benchmarks.
+
+    Implements the endpoints used by BinanceSpotClient with HMAC signature and api key checks,
+    receive windows, request weight and order count limits (with their response headers) and the
+    server error codes. Orders are matched against a synthetic market: LIMIT, LIMIT_MAKER and MARKET
+    orders only, filled in full at the best price, without commissions.
+
+    The websocket server handles the SUBSCRIBE, UNSUBSCRIBE and LIST_SUBSCRIPTIONS control messages.
+    Market streams (trade, aggTrade, bookTicker, depth, partial depth, kline, miniTicker) are generated
+    at "market_rate" ticks per second; user data events are sent to the connections subscribed to a listen key.
+    """
+
+    api_key: str
+    api_secret: str
+    weight_limit: int
+    orders_10s_limit: int
+    orders_1d_limit: int
+    market_rate: float
+    account_update_rate: float
+    time_offset: int
+
+    _host: str
+    _random: Random
+    _signer: HmacSigner
+    _symbols: dict[str, _FakeSymbol]
+    _balances: dict[str, list[float]]  # [free, locked] by asset
+    _orders: dict[int, dict]  # QueryOrderResponse by order id
+    _open_orders: dict[int, dict]
+    _trades: dict[str, list[dict]]  # TradesResponse by symbol
+    _listen_keys: set[str]
+    _account_update_time: int
+    _order_ids: Iterator[int]
+    _used_weight: int
+    _weight_window: int
+    _orders_10s: int
+    _orders_10s_window: int
+    _orders_1d: int
+    _orders_1d_window: int
+    _routes: dict[
+        tuple[str, str], tuple[Callable[[dict[str, str]], Any], Any, int, int]
+    ]
+    _connections: set[_FakeConnection]
+    _connection_queue_size: int
+    _http_server: Optional[AbstractServer] = None
+    _ws_server: Optional[WebSocketServer] = None
+    _tasks: list[Task]
+
+    def __init__(
+        self,
+        api_key: str = "fake-api-key",
+        api_secret: str = "fake-api-secret",
+        symbols: Optional[dict[str, tuple[str, str, float]]] = None,
+        balances: Optional[dict[str, float]] = None,
+        weight_limit: int = 6000,
+        orders_10s_limit: int = 100,
+        orders_1d_limit: int = 200000,
+        market_rate: float = 10.0,
+        account_update_rate: float = 0.0,
+        depth_levels: int = 100,
+        connection_queue_size: int = 10000,
+        host: str = "127.0.0.1",
+        seed: int = 0,
+    ) -> None:
+        """
+        :param symbols: base asset, quote asset and initial price by symbol. Default BTCUSDT and ETHUSDT
+        :param balances: initial free balance by asset. Default 100 of each base asset and 1000000 of each quote asset
+        :param weight_limit: request weight allowed per minute
+        :param orders_10s_limit: orders allowed per 10 seconds
+        :param orders_1d_limit: orders allowed per day
+        :param market_rate: market ticks per second and symbol. Each tick sends one message to every market stream
+        :param account_update_rate: outboundAccountPosition events per second sent to the user data streams
+        :param depth_levels: price levels of each side of the order books
+        :param connection_queue_size: frames buffered for a websocket connection before it is dropped as too slow
+        :param host: interface the servers listen on. Ports are picked by the system
+        :param seed: seed of the synthetic market
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.weight_limit = weight_limit
+        self.orders_10s_limit = orders_10s_limit
+        self.orders_1d_limit = orders_1d_limit
+        self.market_rate = market_rate
+        self.account_update_rate = account_update_rate
+        self.time_offset = 0  # milliseconds added to the server clock
+        self._host = host
+        self._random = Random(seed)
+        self._signer = HmacSigner(api_secret)
+        self._symbols = {
+            symbol: _FakeSymbol(
+                symbol, base_asset, quote_asset, price, depth_levels, self._random
+            )
+            for symbol, (base_asset, quote_asset, price) in (
+                symbols or _DEFAULT_SYMBOLS
+            ).items()
+        }
+        if balances is None:
+            balances = {}
+            for state in self._symbols.values():
+                balances.setdefault(state.base_asset, 100.0)
+                balances.setdefault(state.quote_asset, 1000000.0)
+        self._balances = {asset: [free, 0.0] for asset, free in balances.items()}
+        self._orders = {}
+        self._open_orders = {}
+        self._trades = {symbol: [] for symbol in self._symbols}
+        self._listen_keys = set()
+        self._account_update_time = self._now()
+        self._order_ids = count(1)
+        self._used_weight = 0
+        self._weight_window = 0
+        self._orders_10s = 0
+        self._orders_10s_window = 0
+        self._orders_1d = 0
+        self._orders_1d_window = 0
+        self._connections = set()
+        self._connection_queue_size = connection_queue_size
+        self._tasks = []
+
+        # handler, weight (or function of the parameters), security and orders counted by endpoint
+        self._routes = {
+            ("GET", "/api/v3/ping"): (lambda params: {}, 1, _PUBLIC, 0),
+            ("GET", "/api/v3/time"): (self._server_time, 1, _PUBLIC, 0),
+            ("GET", "/api/v3/exchangeInfo"): (self._exchange_info, 20, _PUBLIC, 0),
+            ("GET", "/api/v3/ticker/price"): (
+                self._ticker_price,
+                lambda params: 2 if "symbol" in params else 4,
+                _PUBLIC,
+                0,
+            ),
+            ("GET", "/api/v3/depth"): (self._depth, self._depth_weight, _PUBLIC, 0),
+            ("GET", "/api/v3/klines"): (self._klines, 2, _PUBLIC, 0),
+            ("GET", "/api/v3/account"): (self._account, 20, _SIGNED, 0),
+            ("GET", "/api/v3/myTrades"): (self._my_trades, 20, _SIGNED, 0),
+            ("POST", "/api/v3/order"): (self._place_order, 1, _SIGNED, 1),
+            ("GET", "/api/v3/order"): (self._query_order, 4, _SIGNED, 0),
+            ("DELETE", "/api/v3/order"): (self._cancel_order, 1, _SIGNED, 0),
+            ("POST", "/api/v3/order/cancelReplace"): (
+                self._cancel_replace,
+                1,
+                _SIGNED,
+                1,
+            ),
+            ("GET", "/api/v3/openOrders"): (
+                self._query_open_orders,
+                lambda params: 6 if "symbol" in params else 80,
+                _SIGNED,
+                0,
+            ),
+            ("DELETE", "/api/v3/openOrders"): (self._cancel_open_orders, 1, _SIGNED, 0),
+            ("GET", "/api/v3/allOrders"): (self._all_orders, 20, _SIGNED, 0),
+            ("POST", "/api/v3/userDataStream"): (
+                self._create_listen_key,
+                2,
+                _API_KEY,
+                0,
+            ),
+            ("PUT", "/api/v3/userDataStream"): (
+                self._keep_alive_listen_key,
+                2,
+                _API_KEY,
+                0,
+            ),
+            ("DELETE", "/api/v3/userDataStream"): (
+                self._close_listen_key,
+                2,
+                _API_KEY,
+                0,
+            ),
+        }
+
+    @property
+    def rest_url(self) -> str:
+        """
+        Base url of the REST API, for BaseApiClient.
+        """
+        assert self._http_server, "server not started"
+        port = self._http_server.sockets[0].getsockname()[1]
+        return f"http://{self._host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        """
+        Base url of the websocket streams, for BaseWebsocketClient.
+        """
+        assert self._ws_server, "server not started"
+        port = next(iter(self._ws_server.sockets)).getsockname()[1]
+        return f"ws://{self._host}:{port}"
+
+    def client(self, **kwargs: Any) -> BinanceSpotClient:
+        """
+        Creates a client of the server, authenticated with its api keys.
+        """
+        return BinanceSpotClient(
+            self.api_key, self.api_secret, base_url=self.rest_url, **kwargs
+        )
+
+    async def start(self) -> None:
+        """
+        Starts the REST and websocket servers and the event generators.
+        """
+        self._http_server = await start_server(self._serve_http, self._host, 0)
+        self._ws_server = await serve(self._serve_websocket, self._host, 0)
+        self._tasks = [
+            create_task(self._run_at_rate(lambda: self.market_rate, self._market_tick)),
+            create_task(
+                self._run_at_rate(
+                    lambda: self.account_update_rate, self._account_update_tick
+                )
+            ),
+        ]
+        logger.info(f"fake binance server started: {self.rest_url} {self.ws_url}")
+
+    async def stop(self) -> None:
+        """
+        Stops the servers, closing all connections.
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._ws_server:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+            self._ws_server = None
+        if self._http_server:
+            self._http_server.close()
+            await self._http_server.wait_closed()
+            self._http_server = None
+
+    async def __aenter__(self) -> "FakeBinanceServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def _now(self) -> int:
+        """
+        Returns the server time, in milliseconds.
+        """
+        return int(time() * 1000) + self.time_offset
+
+    async def _serve_http(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """
+        Serves the HTTP/1.1 requests of a keep-alive connection.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except IncompleteReadError:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, response_headers, content = self.handle_request(
+                    method, target, headers, body
+                )
+                response_headers["Content-Type"] = "application/json;charset=UTF-8"
+                response_headers["Content-Length"] = str(len(content))
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_STATUS_REASONS.get(status, '')}\r\n"
+                        + "".join(
+                            f"{name}: {value}\r\n"
+                            for name, value in response_headers.items()
+                        )
+                        + "\r\n"
+                    ).encode("latin-1")
+                    + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def handle_request(
+        self, method: str, target: str, headers: dict[str, str], body: bytes = b""
+    ) -> tuple[int, dict[str, str], bytes]:
+        """
+        Handles a REST request.
+        :param target: path and query string of the request
+        :param headers: request headers, with lowercase names
+        :return: status code, headers and body of the response
+        """
+        url = urlsplit(target)
+        route = self._routes.get((method, url.path))
+        if not route:
+            return (
+                404,
+                {},
+                dumps({"code": -1020, "msg": "This operation is not supported."}),
+            )
+
+        # the signed payload is the query string followed by the body
+        payload = url.query
+        if body:
+            payload = f"{payload}{body.decode('utf-8')}"
+        params = dict(parse_qsl(payload, keep_blank_values=True))
+        handler, weight, security, orders = route
+
+        # the request weight is counted even when the request fails
+        now = self._now()
+        used_weight = self._count_weight(
+            weight(params) if callable(weight) else weight, now
+        )
+        response_headers = {
+            "x-mbx-used-weight": str(used_weight),
+            "x-mbx-used-weight-1m": str(used_weight),
+        }
+        if used_weight > self.weight_limit:
+            response_headers["Retry-After"] = str(60 - now // 1000 % 60)
+            return (
+                429,
+                response_headers,
+                dumps(
+                    {
+                        "code": -1003,
+                        "msg": f"Too many requests; current limit is {self.weight_limit} request weight per 1 MINUTE.",
+                    }
+                ),
+            )
+
+        try:
+            if security >= _API_KEY:
+                self._check_api_key(headers.get("x-mbx-apikey"))
+            if security == _SIGNED:
+                self._check_signature(payload, params, now)
+            if orders:
+                self._count_orders(orders, now, response_headers)
+            data = handler(params)
+        except BinanceApiException as exc:
+            error = {"code": exc.error_code, "msg": exc.error_message}
+            if exc.data is not None:
+                error["data"] = exc.data
+            status = 429 if exc.error_code == -1015 else 400
+            if exc.error_code in (-2014, -2015):
+                status = 401
+            return status, response_headers, dumps(error)
+
+        return 200, response_headers, dumps(data)
+
+    def _count_weight(self, weight: int, now: int) -> int:
+        window = now // 60000
+        if window != self._weight_window:
+            self._weight_window = window
+            self._used_weight = 0
+        self._used_weight += weight
+        return self._used_weight
+
+    def _count_orders(
+        self, orders: int, now: int, response_headers: dict[str, str]
+    ) -> None:
+        window_10s = now // 10000
+        if window_10s != self._orders_10s_window:
+            self._orders_10s_window = window_10s
+            self._orders_10s = 0
+        window_1d = now // 86400000
+        if window_1d != self._orders_1d_window:
+            self._orders_1d_window = window_1d
+            self._orders_1d = 0
+        self._orders_10s += orders
+        self._orders_1d += orders
+        response_headers["x-mbx-order-count-10s"] = str(self._orders_10s)
+        response_headers["x-mbx-order-count-1d"] = str(self._orders_1d)
+
+        if self._orders_10s > self.orders_10s_limit:
+            raise BinanceApiException(
+                -1015,
+                f"Too many new orders; current limit is {self.orders_10s_limit} orders per 10 SECOND.",
+            )
+        if self._orders_1d > self.orders_1d_limit:
+            raise BinanceApiException(
+                -1015,
+                f"Too many new orders; current limit is {self.orders_1d_limit} orders per DAY.",
+            )
+
+    def _check_api_key(self, api_key: Optional[str]) -> None:
+        if not api_key:
+            raise BinanceApiException(-2014, "API-key format invalid.")
+        if not compare_digest(api_key, self.api_key):
+            raise BinanceApiException(
+                -2015, "Invalid API-key, IP, or permissions for action."
+            )
+
+    def _check_signature(self, payload: str, params: dict[str, str], now: int) -> None:
+        # the signature is the last parameter, computed over everything before it
+        signed, separator, signature = payload.rpartition("&signature=")
+        if not separator or not compare_digest(
+            signature, self._signer.sign(signed.encode("utf-8"))
+        ):
+            raise BinanceApiException(-1022, "Signature for this request is not valid.")
+
+        timestamp = int(_mandatory(params, "timestamp"))
+        recv_window = int(params.get("recvWindow", 5000))
+        if timestamp >= now + 1000 or now - timestamp > recv_window:
+            raise BinanceApiException(
+                -1021, "Timestamp for this request is outside of the recvWindow."
+            )
+
+    def _symbol(self, params: dict[str, str]) -> _FakeSymbol:
+        state = self._symbols.get(_mandatory(params, "symbol"))
+        if not state:
+            raise BinanceApiException(-1121, "Invalid symbol.")
+        return state
+
+    def _server_time(self, params: dict[str, str]) -> dict:
+        return {"serverTime": self._now()}
+
+    def _symbol_info(self, state: _FakeSymbol) -> dict:
+        return {
+            "symbol": state.symbol,
+            "status": "TRADING",
+            "baseAsset": state.base_asset,
+            "baseAssetPrecision": 8,
+            "quoteAsset": state.quote_asset,
+            "quotePrecision": 8,
+            "quoteAssetPrecision": 8,
+            "orderTypes": ["LIMIT", "LIMIT_MAKER", "MARKET"],
+            "icebergAllowed": False,
+            "ocoAllowed": False,
+            "quoteOrderQtyMarketAllowed": False,
+            "allowTrailingStop": False,
+            "cancelReplaceAllowed": True,
+            "isSpotTradingAllowed": True,
+            "isMarginTradingAllowed": False,
+            "filters": [
+                {
+                    "filterType": "PRICE_FILTER",
+                    "minPrice": _format_price(1),
+                    "maxPrice": "1000000.00",
+                    "tickSize": _format_price(1),
+                },
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": "0.00001000",
+                    "maxQty": "9000.00000000",
+                    "stepSize": "0.00001000",
+                },
+            ],
+            "permissions": ["SPOT"],
+        }
+
+    def _exchange_info(self, params: dict[str, str]) -> dict:
+        if "symbol" in params:
+            states = [self._symbol(params)]
+        elif "symbols" in params:
+            states = [
+                self._symbol(dict(symbol=symbol)) for symbol in loads(params["symbols"])
+            ]
+        else:
+            states = list(self._symbols.values())
+        return {
+            "timezone": "UTC",
+            "serverTime": self._now(),
+            "rateLimits": [
+                {
+                    "rateLimitType": "REQUEST_WEIGHT",
+                    "interval": "MINUTE",
+                    "intervalNum": 1,
+                    "limit": self.weight_limit,
+                },
+                {
+                    "rateLimitType": "ORDERS",
+                    "interval": "SECOND",
+                    "intervalNum": 10,
+                    "limit": self.orders_10s_limit,
+                },
+                {
+                    "rateLimitType": "ORDERS",
+                    "interval": "DAY",
+                    "intervalNum": 1,
+                    "limit": self.orders_1d_limit,
+                },
+            ],
+            "exchangeFilters": [],
+            "symbols": [self._symbol_info(state) for state in states],
+        }
+
+    def _ticker_price(self, params: dict[str, str]) -> Union[dict, list[dict]]:
+        if "symbol" in params:
+            state = self._symbol(params)
+            return {"symbol": state.symbol, "price": _format_price(state.price)}
+        return [
+            {"symbol": state.symbol, "price": _format_price(state.price)}
+            for state in self._symbols.values()
+        ]
+
+    @staticmethod
+    def _depth_weight(params: dict[str, str]) -> int:
+        limit = int(params.get("limit", 100))
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        if limit <= 1000:
+            return 50
+        return 250
+
+    def _depth(self, params: dict[str, str]) -> dict:
+        return self._symbol(params).depth(min(int(params.get("limit", 100)), 5000))
+
+    def _klines(self, params: dict[str, str]) -> list[list[Any]]:
+        state = self._symbol(params)
+        try:
+            interval = KlineInterval(_mandatory(params, "interval"))
+        except ValueError:
+            raise BinanceApiException(-1120, "Invalid interval.")
+        interval_ms = INTERVAL_MILLISECONDS[interval]
+        limit = min(int(params.get("limit", 500)), 1000)
+
+        # klines are aligned to their interval, up to the current open one
+        last = self._now() // interval_ms * interval_ms
+        if "endTime" in params:
+            last = min(last, int(params["endTime"]) // interval_ms * interval_ms)
+        if "startTime" in params:
+            first = -(-int(params["startTime"]) // interval_ms) * interval_ms
+            last = min(last, first + (limit - 1) * interval_ms)
+        else:
+            first = max(last - (limit - 1) * interval_ms, 0)
+
+        return [
+            self._synthetic_kline(state, open_time, interval_ms)
+            for open_time in range(first, last + 1, interval_ms)
+        ]
+
+    @staticmethod
+    def _synthetic_kline(
+        state: _FakeSymbol, open_time: int, interval_ms: int
+    ) -> list[Any]:
+        """
+        Generates a kline deterministically from the symbol and open time, so repeated downloads match.
+        """
+        random = Random(crc32(f"{state.symbol}{open_time}".encode("ascii")))
+        open_price = state.open_price * random.uniform(0.95, 1.05)
+        close_price = open_price * random.uniform(0.99, 1.01)
+        high = max(open_price, close_price) * random.uniform(1.0, 1.005)
+        low = min(open_price, close_price) * random.uniform(0.995, 1.0)
+        volume = random.uniform(0.0, 100.0)
+        taker_buy_volume = volume * random.uniform(0.0, 1.0)
+        average_price = (high + low) / 2 * TICK_SIZE
+        return [
+            open_time,
+            _format_price(round(open_price)),
+            _format_price(round(high)),
+            _format_price(round(low)),
+            _format_price(round(close_price)),
+            _format_quantity(volume),
+            open_time + interval_ms - 1,
+            _format_quantity(volume * average_price),
+            random.randint(0, 1000),
+            _format_quantity(taker_buy_volume),
+            _format_quantity(taker_buy_volume * average_price),
+            "0",
+        ]
+
+    def _account(self, params: dict[str, str]) -> dict:
+        return {
+            "makerCommission": 0,
+            "takerCommission": 0,
+            "buyerCommission": 0,
+            "sellerCommission": 0,
+            "canTrade": True,
+            "canWithdraw": True,
+            "canDeposit": True,
+            "brokered": False,
+            "updateTime": self._account_update_time,
+            "accountType": "SPOT",
+            "balances": [
+                {
+                    "asset": asset,
+                    "free": _format_quantity(free),
+                    "locked": _format_quantity(locked),
+                }
+                for asset, (free, locked) in self._balances.items()
+            ],
+            "permissions": ["SPOT"],
+        }
+
+    @staticmethod
+    def _page(
+        items: list[dict],
+        params: dict[str, str],
+        id_field: str,
+        from_id_param: str,
+        time_field: str,
+    ) -> list[dict]:
+        """
+        Filters and limits a history by id or time, as the history endpoints do.
+        """
+        limit = min(int(params.get("limit", 500)), 1000)
+        if params.get(from_id_param) and (
+            params.get("startTime") or params.get("endTime")
+        ):
+            raise BinanceApiException(
+                -1128, "Combination of optional parameters invalid."
+            )
+        if (
+            params.get("startTime")
+            and params.get("endTime")
+            and int(params["endTime"]) - int(params["startTime"]) > 86400000
+        ):
+            raise BinanceApiException(
+                -1127, "More than 24 hours between startTime and endTime."
+            )
+        if params.get(from_id_param):
+            from_id = int(params[from_id_param])
+            return [item for item in items if item[id_field] >= from_id][:limit]
+        if params.get("startTime"):
+            # a start time alone covers the next 24 hours
+            start_time = int(params["startTime"])
+            end_time = int(params.get("endTime", start_time + 86400000))
+            items = [
+                item for item in items if start_time <= item[time_field] <= end_time
+            ]
+            return items[:limit]
+        if params.get("endTime"):
+            items = [
+                item for item in items if item[time_field] <= int(params["endTime"])
+            ]
+        return items[-limit:]
+
+    def _my_trades(self, params: dict[str, str]) -> list[dict]:
+        state = self._symbol(params)
+        return self._page(self._trades[state.symbol], params, "id", "fromId", "time")
+
+    def _all_orders(self, params: dict[str, str]) -> list[dict]:
+        state = self._symbol(params)
+        orders = [
+            order for order in self._orders.values() if order["symbol"] == state.symbol
+        ]
+        return self._page(orders, params, "orderId", "orderId", "time")
+
+    def _query_open_orders(self, params: dict[str, str]) -> list[dict]:
+        symbol = self._symbol(params).symbol if "symbol" in params else None
+        return [
+            order
+            for order in self._open_orders.values()
+            if symbol is None or order["symbol"] == symbol
+        ]
+
+    def _find_order(
+        self, params: dict[str, str], id_param: str, client_id_param: str
+    ) -> Optional[dict]:
+        state = self._symbol(params)
+        if params.get(id_param):
+            order = self._orders.get(int(params[id_param]))
+        elif params.get(client_id_param):
+            order = next(
+                (
+                    order
+                    for order in reversed(self._orders.values())
+                    if order["clientOrderId"] == params[client_id_param]
+                ),
+                None,
+            )
+        else:
+            raise BinanceApiException(
+                -1102,
+                f"Param '{id_param}' or '{client_id_param}' must be sent, but both were empty/null!",
+            )
+        return order if order and order["symbol"] == state.symbol else None
+
+    def _query_order(self, params: dict[str, str]) -> dict:
+        order = self._find_order(params, "orderId", "origClientOrderId")
+        if not order:
+            raise BinanceApiException(-2013, "Order does not exist.")
+        return order
+
+    def _place_order(self, params: dict[str, str]) -> dict:
+        order, fills = self._new_order(params)
+        response = {
+            "symbol": order["symbol"],
+            "orderId": order["orderId"],
+            "orderListId": -1,
+            "clientOrderId": order["clientOrderId"],
+            "transactTime": order["updateTime"],
+        }
+        response_type = params.get("newOrderRespType", "ACK")
+        if response_type in ("RESULT", "FULL"):
+            for field in (
+                "price",
+                "origQty",
+                "executedQty",
+                "cummulativeQuoteQty",
+                "status",
+                "timeInForce",
+                "type",
+                "side",
+            ):
+                response[field] = order[field]
+        if response_type == "FULL":
+            response["fills"] = fills
+        return response
+
+    def _new_order(self, params: dict[str, str]) -> tuple[dict, list[dict]]:
+        """
+        Creates an order, filling it at once when it crosses the book, and locking its balance otherwise.
+        :return: the order and its fills
+        """
+        state = self._symbol(params)
+        side = _mandatory(params, "side")
+        if side not in ("BUY", "SELL"):
+            raise BinanceApiException(
+                -1102,
+                "Mandatory parameter 'side' was not sent, was empty/null, or malformed.",
+            )
+        order_type = _mandatory(params, "type")
+        if order_type not in ("LIMIT", "LIMIT_MAKER", "MARKET"):
+            raise BinanceApiException(-1116, "Invalid orderType.")
+        quantity = _decimal(params, "quantity")
+        if quantity <= 0 or quantity % Decimal("0.00001"):
+            raise BinanceApiException(-1013, "Filter failure: LOT_SIZE")
+
+        # limit orders rest at their price, market orders take the best price
+        if order_type == "MARKET":
+            price = 0
+            time_in_force = "GTC"
+        else:
+            limit_price = _decimal(params, "price") / Decimal(str(TICK_SIZE))
+            if limit_price <= 0 or limit_price % 1:
+                raise BinanceApiException(-1013, "Filter failure: PRICE_FILTER")
+            price = int(limit_price)
+            time_in_force = (
+                _mandatory(params, "timeInForce") if order_type == "LIMIT" else "GTC"
+            )
+
+        best = state.best_ask() if side == "BUY" else state.best_bid()
+        crosses = order_type == "MARKET" or (
+            price >= best if side == "BUY" else price <= best
+        )
+        if crosses and order_type == "LIMIT_MAKER":
+            raise BinanceApiException(-2010, "Order would immediately match and take.")
+
+        client_order_id = params.get("newClientOrderId") or token_hex(11)
+        if any(
+            order["clientOrderId"] == client_order_id
+            for order in self._open_orders.values()
+        ):
+            raise BinanceApiException(-2010, "Duplicate order sent.")
+
+        # checks the balance needed by the order
+        amount = float(quantity)
+        if side == "BUY":
+            asset = state.quote_asset
+            needed = amount * float(_format_price(best if crosses else price))
+        else:
+            asset = state.base_asset
+            needed = amount
+        if self._balances.setdefault(asset, [0.0, 0.0])[0] < needed:
+            raise BinanceApiException(
+                -2010, "Account has insufficient balance for requested action."
+            )
+
+        now = self._now()
+        order = {
+            "symbol": state.symbol,
+            "orderId": next(self._order_ids),
+            "orderListId": -1,
+            "clientOrderId": client_order_id,
+            "price": _format_price(price),
+            "origQty": _format_quantity(amount),
+            "executedQty": _format_quantity(0.0),
+            "cummulativeQuoteQty": _format_quantity(0.0),
+            "status": "NEW",
+            "timeInForce": time_in_force,
+            "type": order_type,
+            "side": side,
+            "stopPrice": _format_price(0),
+            "icebergQty": _format_quantity(0.0),
+            "time": now,
+            "updateTime": now,
+            "isWorking": True,
+            "origQuoteOrderQty": _format_quantity(0.0),
+        }
+        self._orders[order["orderId"]] = order
+        self._send_execution_report(order, "NEW")
+
+        if crosses:
+            fills = [self._fill(state, order, best, False)]
+        else:
+            fills = []
+            self._move_balance(asset, -needed, needed)
+            self._open_orders[order["orderId"]] = order
+            self._send_account_position((asset,))
+        return order, fills
+
+    def _fill(
+        self, state: _FakeSymbol, order: dict, price: int, is_maker: bool
+    ) -> dict:
+        """
+        Fills the remaining quantity of an order at a price, updating the balances and trades.
+        :return: the fill, as in the FULL order responses
+        """
+        quantity = float(order["origQty"])
+        quote_quantity = quantity * float(_format_price(price))
+        is_buyer = order["side"] == "BUY"
+
+        # resting orders release their locked balance first
+        if is_maker:
+            self._release(order)
+        if is_buyer:
+            self._move_balance(state.quote_asset, -quote_quantity, 0.0)
+            self._move_balance(state.base_asset, quantity, 0.0)
+        else:
+            self._move_balance(state.base_asset, -quantity, 0.0)
+            self._move_balance(state.quote_asset, quote_quantity, 0.0)
+
+        now = self._now()
+        state.trade_id += 1
+        trades = self._trades[state.symbol]
+        trades.append(
+            {
+                "symbol": state.symbol,
+                "id": state.trade_id,
+                "orderId": order["orderId"],
+                "orderListId": -1,
+                "price": _format_price(price),
+                "qty": _format_quantity(quantity),
+                "quoteQty": _format_quantity(quote_quantity),
+                "commission": _format_quantity(0.0),
+                "commissionAsset": state.base_asset if is_buyer else state.quote_asset,
+                "time": now,
+                "isBuyer": is_buyer,
+                "isMaker": is_maker,
+                "isBestMatch": True,
+            }
+        )
+        order.update(
+            executedQty=_format_quantity(quantity),
+            cummulativeQuoteQty=_format_quantity(quote_quantity),
+            status="FILLED",
+            updateTime=now,
+            isWorking=False,
+        )
+        self._send_execution_report(order, "TRADE", trades[-1])
+        self._send_account_position((state.base_asset, state.quote_asset))
+        return {
+            "price": _format_price(price),
+            "qty": _format_quantity(quantity),
+            "commission": _format_quantity(0.0),
+            "commissionAsset": state.base_asset if is_buyer else state.quote_asset,
+            "tradeId": state.trade_id,
+        }
+
+    def _move_balance(self, asset: str, free: float, locked: float) -> None:
+        """
+        Adds to the free and locked balances of an asset, rounded to the precision of the assets.
+        """
+        balance = self._balances.setdefault(asset, [0.0, 0.0])
+        balance[0] = round(balance[0] + free, 8)
+        balance[1] = round(balance[1] + locked, 8)
+
+    def _release(self, order: dict) -> str:
+        """
+        Removes an open order, unlocking the balance it was holding.
+        :return: the asset unlocked
+        """
+        state = self._symbols[order["symbol"]]
+        quantity = float(order["origQty"])
+        if order["side"] == "BUY":
+            asset = state.quote_asset
+            amount = quantity * float(order["price"])
+        else:
+            asset = state.base_asset
+            amount = quantity
+        self._move_balance(asset, amount, -amount)
+        del self._open_orders[order["orderId"]]
+        return asset
+
+    def _cancel(self, order: dict, params: dict[str, str]) -> dict:
+        """
+        Cancels an open order, releasing its locked balance.
+        :return: the cancel response
+        """
+        asset = self._release(order)
+
+        orig_client_order_id = order["clientOrderId"]
+        cancel_client_order_id = params.get("newClientOrderId") or token_hex(11)
+        order.update(status="CANCELED", updateTime=self._now(), isWorking=False)
+        self._send_execution_report(
+            order, "CANCELED", client_order_id=cancel_client_order_id
+        )
+        self._send_account_position((asset,))
+        return {
+            "symbol": order["symbol"],
+            "origClientOrderId": orig_client_order_id,
+            "orderId": order["orderId"],
+            "orderListId": -1,
+            "clientOrderId": cancel_client_order_id,
+            "transactTime": order["updateTime"],
+            "price": order["price"],
+            "origQty": order["origQty"],
+            "executedQty": order["executedQty"],
+            "cummulativeQuoteQty": order["cummulativeQuoteQty"],
+            "status": order["status"],
+            "timeInForce": order["timeInForce"],
+            "type": order["type"],
+            "side": order["side"],
+        }
+
+    def _cancel_order(self, params: dict[str, str]) -> dict:
+        order = self._find_order(params, "orderId", "origClientOrderId")
+        if not order or order["orderId"] not in self._open_orders:
+            raise BinanceApiException(-2011, "Unknown order sent.")
+        return self._cancel(order, params)
+
+    def _cancel_open_orders(self, params: dict[str, str]) -> list[dict]:
+        orders = self._query_open_orders(dict(symbol=_mandatory(params, "symbol")))
+        if not orders:
+            raise BinanceApiException(-2011, "Unknown order sent.")
+        return [self._cancel(order, {}) for order in orders]
+
+    def _cancel_replace(self, params: dict[str, str]) -> dict:
+        mode = _mandatory(params, "cancelReplaceMode")
+        result: dict[str, Any] = {
+            "cancelResult": "SUCCESS",
+            "newOrderResult": "SUCCESS",
+            "cancelResponse": None,
+            "newOrderResponse": None,
+        }
+
+        try:
+            order = self._find_order(params, "cancelOrderId", "cancelOrigClientOrderId")
+            if not order or order["orderId"] not in self._open_orders:
+                raise BinanceApiException(-2011, "Unknown order sent.")
+            result["cancelResponse"] = self._cancel(
+                order, dict(newClientOrderId=params.get("cancelNewClientOrderId", ""))
+            )
+        except BinanceApiException as exc:
+            result["cancelResult"] = "FAILURE"
+            result["cancelResponse"] = {
+                "code": exc.error_code,
+                "msg": exc.error_message,
+            }
+            if mode == "STOP_ON_FAILURE":
+                result["newOrderResult"] = "NOT_ATTEMPTED"
+                raise BinanceApiException(-2022, "Order cancel-replace failed.", result)
+
+        try:
+            result["newOrderResponse"] = self._place_order(params)
+        except BinanceApiException as exc:
+            result["newOrderResult"] = "FAILURE"
+            result["newOrderResponse"] = {
+                "code": exc.error_code,
+                "msg": exc.error_message,
+            }
+
+        if (
+            result["cancelResult"] == "FAILURE"
+            and result["newOrderResult"] == "FAILURE"
+        ):
+            raise BinanceApiException(-2022, "Order cancel-replace failed.", result)
+        if result["cancelResult"] == "FAILURE" or result["newOrderResult"] == "FAILURE":
+            raise BinanceApiException(
+                -2021, "Order cancel-replace partially failed.", result
+            )
+        return result
+
+    def _create_listen_key(self, params: dict[str, str]) -> dict:
+        # the active listen key is returned while it is valid
+        listen_key = next(iter(self._listen_keys), None) or token_hex(32)
+        self._listen_keys.add(listen_key)
+        return {"listenKey": listen_key}
+
+    def _check_listen_key(self, params: dict[str, str]) -> str:
+        listen_key = _mandatory(params, "listenKey")
+        if listen_key not in self._listen_keys:
+            raise BinanceApiException(-1125, "This listenKey does not exist.")
+        return listen_key
+
+    def _keep_alive_listen_key(self, params: dict[str, str]) -> dict:
+        self._check_listen_key(params)
+        return {}
+
+    def _close_listen_key(self, params: dict[str, str]) -> dict:
+        self._listen_keys.discard(self._check_listen_key(params))
+        return {}
+
+    def expire_listen_keys(self) -> None:
+        """
+        Expires the listen keys, sending "listenKeyExpired" to their streams.
+        """
+        for listen_key in self._listen_keys:
+            self._send_user_event(
+                {"e": "listenKeyExpired", "E": self._now(), "listenKey": listen_key}
+            )
+        self._listen_keys.clear()
+
+    def _send_execution_report(
+        self,
+        order: dict,
+        execution_type: str,
+        trade: Optional[dict] = None,
+        client_order_id: Optional[str] = None,
+    ) -> None:
+        state = self._symbols[order["symbol"]]
+        self._send_user_event(
+            {
+                "e": "executionReport",
+                "E": self._now(),
+                "s": order["symbol"],
+                "c": client_order_id or order["clientOrderId"],
+                "S": order["side"],
+                "o": order["type"],
+                "f": order["timeInForce"],
+                "q": order["origQty"],
+                "p": order["price"],
+                "P": order["stopPrice"],
+                "F": order["icebergQty"],
+                "g": -1,
+                "C": order["clientOrderId"] if client_order_id else "",
+                "x": execution_type,
+                "X": order["status"],
+                "r": "NONE",
+                "i": order["orderId"],
+                "l": trade["qty"] if trade else _format_quantity(0.0),
+                "z": order["executedQty"],
+                "L": trade["price"] if trade else _format_price(0),
+                "n": _format_quantity(0.0),
+                "N": trade["commissionAsset"] if trade else None,
+                "T": order["updateTime"],
+                "t": trade["id"] if trade else -1,
+                "I": state.update_id,
+                "w": order["orderId"] in self._open_orders,
+                "m": trade["isMaker"] if trade else False,
+                "M": False,
+                "O": order["time"],
+                "Z": order["cummulativeQuoteQty"],
+                "Y": trade["quoteQty"] if trade else _format_quantity(0.0),
+                "Q": order["origQuoteOrderQty"],
+            }
+        )
+
+    def _send_account_position(self, assets: Iterable[str]) -> None:
+        now = self._now()
+        self._account_update_time = now
+        self._send_user_event(
+            {
+                "e": "outboundAccountPosition",
+                "E": now,
+                "u": now,
+                "B": [
+                    {
+                        "a": asset,
+                        "f": _format_quantity(self._balances[asset][0]),
+                        "l": _format_quantity(self._balances[asset][1]),
+                    }
+                    for asset in assets
+                ],
+            }
+        )
+
+    def _send_user_event(self, event: dict) -> None:
+        data = dumps(event).decode("utf-8")
+        for connection in list(self._connections):
+            for listen_key in connection.streams & self._listen_keys:
+                self._send_frame(connection, listen_key, data)
+
+    async def _serve_websocket(self, websocket: WebSocketServerProtocol) -> None:
+        """
+        Serves a websocket connection: "/ws" for raw streams, "/stream" for combined streams.
+        Streams can also be given in the url, as "/ws/<stream>" or "/stream?streams=<stream>/<stream>".
+        """
+        url = urlsplit(websocket.path)
+        combined = url.path.startswith("/stream")
+        connection = _FakeConnection(websocket, combined, self._connection_queue_size)
+        if combined:
+            streams = dict(parse_qsl(url.query)).get("streams", "")
+        else:
+            streams = url.path[len("/ws/") :]
+        connection.streams.update(stream for stream in streams.split("/") if stream)
+
+        self._connections.add(connection)
+        writer_task = create_task(self._write_frames(connection))
+        try:
+            async for message in websocket:
+                # the server drops the connections sending more than 5 messages per second
+                if connection.count_message() > 5:
+                    logger.warning("closing websocket: too many messages")
+                    await websocket.close(1008, "Too many messages")
+                    break
+                self._handle_control_message(connection, message)
+        except ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer_task.cancel()
+
+    async def _write_frames(self, connection: _FakeConnection) -> None:
+        try:
+            while True:
+                await connection.websocket.send(await connection.outgoing.get())
+        except ConnectionClosed:
+            pass
+
+    def _handle_control_message(
+        self, connection: _FakeConnection, message: Union[str, bytes]
+    ) -> None:
+        try:
+            request = loads(message)
+            method = request["method"]
+            request_id = request["id"]
+            params = request.get("params", [])
+        except Exception:
+            self._send_control(
+                connection, {"error": {"code": 3, "msg": "Invalid JSON"}}
+            )
+            return
+
+        if method == "SUBSCRIBE":
+            connection.streams.update(params)
+            reply = {"result": None, "id": request_id}
+        elif method == "UNSUBSCRIBE":
+            connection.streams.difference_update(params)
+            reply = {"result": None, "id": request_id}
+        elif method == "LIST_SUBSCRIPTIONS":
+            reply = {"result": sorted(connection.streams), "id": request_id}
+        else:
+            reply = {
+                "error": {
+                    "code": 2,
+                    "msg": f"Invalid request: unknown method {method}",
+                },
+                "id": request_id,
+            }
+        self._send_control(connection, reply)
+
+    def _send_control(self, connection: _FakeConnection, reply: dict) -> None:
+        self._put_frame(connection, dumps(reply).decode("utf-8"))
+
+    def _send_frame(self, connection: _FakeConnection, stream: str, data: str) -> None:
+        """
+        Sends the data of a stream, wrapped in the combined stream envelope if needed.
+        """
+        if connection.combined:
+            data = f'{{"stream":"{stream}","data":{data}}}'
+        self._put_frame(connection, data)
+
+    def _put_frame(self, connection: _FakeConnection, frame: str) -> None:
+        try:
+            connection.outgoing.put_nowait(frame)
+        except QueueFull:
+            # slow consumers are disconnected, as the server does
+            logger.warning("closing websocket: client is too slow")
+            self._connections.discard(connection)
+            create_task(connection.websocket.close(1008, "Too slow"))
+
+    def publish(self, stream: str, message: Union[dict, list, str]) -> None:
+        """
+        Sends a message to the connections subscribed to a stream, e.g. to feed the clients
+        at rates the market generator does not reach.
+        :param message: message, or its json encoding
+        """
+        data = message if isinstance(message, str) else dumps(message).decode("utf-8")
+        for connection in list(self._connections):
+            if stream in connection.streams:
+                self._send_frame(connection, stream, data)
+
+    async def disconnect_all(self) -> None:
+        """
+        Closes all websocket connections, to exercise the reconnections of the clients.
+        """
+        for connection in list(self._connections):
+            await connection.websocket.close(1001, "Going away")
+
+    async def _run_at_rate(
+        self, rate: Callable[[], float], tick: Callable[[], None]
+    ) -> NoReturn:
+        """
+        Calls "tick" "rate()" times per second, catching up in bursts when sleeps are coarser than the rate.
+        """
+        started = monotonic()
+        ticks = 0
+        while True:
+            current_rate = rate()
+            if current_rate <= 0:
+                await sleep(0.1)
+                started = monotonic()
+                ticks = 0
+                continue
+            due = int((monotonic() - started) * current_rate) - ticks
+            for _ in range(due):
+                tick()
+            ticks += due
+            await sleep(max(1 / current_rate, 0.001))
+
+    def _account_update_tick(self) -> None:
+        self._send_account_position(list(self._balances))
+
+    def _market_tick(self) -> None:
+        """
+        Moves the market of every symbol by one step and sends the messages of the subscribed streams.
+        """
+        subscribed = set()
+        for connection in self._connections:
+            subscribed |= connection.streams
+        frames = {}
+        for state in self._symbols.values():
+            frames.update(self._move_market(state, subscribed))
+        if "!miniTicker@arr" in subscribed:
+            frames["!miniTicker@arr"] = dumps(
+                [self._mini_ticker(state) for state in self._symbols.values()]
+            ).decode("utf-8")
+
+        for connection in list(self._connections):
+            for stream in connection.streams:
+                frame = frames.get(stream)
+                if frame is not None:
+                    self._send_frame(connection, stream, frame)
+
+    def _mini_ticker(self, state: _FakeSymbol) -> dict:
+        return {
+            "e": "24hrMiniTicker",
+            "E": self._now(),
+            "s": state.symbol,
+            "c": _format_price(state.price),
+            "o": _format_price(state.open_price),
+            "h": _format_price(state.high),
+            "l": _format_price(state.low),
+            "v": _format_quantity(state.volume),
+            "q": _format_quantity(state.quote_volume),
+        }
+
+    def _move_market(self, state: _FakeSymbol, subscribed: set[str]) -> dict[str, str]:
+        """
+        Moves the price of a symbol by a random step, with a trade at the new price.
+        The order book follows the price: every change is a depth update.
+        :return: encoded messages of the subscribed streams of the symbol
+        """
+        random = self._random
+        now = self._now()
+        step = random.choice((-2, -1, 0, 0, 1, 2))
+        state.price = max(state.price + step, len(state.bids) + 1)
+        state.high = max(state.high, state.price)
+        state.low = min(state.low, state.price)
+
+        # levels crossed by the price are removed, and levels uncovered by it added
+        bid_changes: dict[int, float] = {}
+        ask_changes: dict[int, float] = {}
+        for book, changes, levels in (
+            (
+                state.bids,
+                bid_changes,
+                range(state.price - len(state.bids), state.price),
+            ),
+            (
+                state.asks,
+                ask_changes,
+                range(state.price + 1, state.price + len(state.asks) + 1),
+            ),
+        ):
+            wanted = set(levels)
+            for price in [price for price in book if price not in wanted]:
+                del book[price]
+                changes[price] = 0.0
+            for price in wanted.difference(book):
+                book[price] = changes[price] = round(random.uniform(0.1, 5.0), 5)
+            # some quantities change near the top of the book
+            price = (
+                state.price - random.randint(1, 10)
+                if changes is bid_changes
+                else state.price + random.randint(1, 10)
+            )
+            if price in book:
+                book[price] = changes[price] = round(random.uniform(0.1, 5.0), 5)
+        first_update_id = state.update_id + 1
+        state.update_id += 1
+
+        # trades at the new price, taking the side the price moved to
+        quantity = round(random.uniform(0.001, 1.0), 5)
+        state.trade_id += 1
+        state.volume += quantity
+        state.quote_volume += quantity * state.price * TICK_SIZE
+        is_buyer_maker = step < 0
+        self._update_klines(state, subscribed, quantity, now)
+
+        # resting orders crossed by the price are filled at their price
+        for order in [
+            order
+            for order in self._open_orders.values()
+            if order["symbol"] == state.symbol
+        ]:
+            price = int(round(float(order["price"]) / TICK_SIZE))
+            if (order["side"] == "BUY" and price >= state.price) or (
+                order["side"] == "SELL" and price <= state.price
+            ):
+                self._fill(state, order, price, True)
+
+        symbol = state.symbol.lower()
+        if not any(stream.startswith(symbol) for stream in subscribed):
+            return {}
+
+        price = _format_price(state.price)
+        messages: dict[str, Any] = {
+            f"{symbol}@trade": {
+                "e": "trade",
+                "E": now,
+                "s": state.symbol,
+                "t": state.trade_id,
+                "p": price,
+                "q": _format_quantity(quantity),
+                "b": 0,
+                "a": 0,
+                "T": now,
+                "m": is_buyer_maker,
+                "M": True,
+            },
+            f"{symbol}@aggTrade": {
+                "e": "aggTrade",
+                "E": now,
+                "s": state.symbol,
+                "a": state.trade_id,
+                "p": price,
+                "q": _format_quantity(quantity),
+                "f": state.trade_id,
+                "l": state.trade_id,
+                "T": now,
+                "m": is_buyer_maker,
+                "M": True,
+            },
+            f"{symbol}@bookTicker": {
+                "u": state.update_id,
+                "s": state.symbol,
+                "b": _format_price(state.best_bid()),
+                "B": _format_quantity(state.bids[state.best_bid()]),
+                "a": _format_price(state.best_ask()),
+                "A": _format_quantity(state.asks[state.best_ask()]),
+            },
+            f"{symbol}@miniTicker": self._mini_ticker(state),
+        }
+        depth_update = {
+            "e": "depthUpdate",
+            "E": now,
+            "s": state.symbol,
+            "U": first_update_id,
+            "u": state.update_id,
+            "b": [
+                [_format_price(p), _format_quantity(q)] for p, q in bid_changes.items()
+            ],
+            "a": [
+                [_format_price(p), _format_quantity(q)] for p, q in ask_changes.items()
+            ],
+        }
+        messages[f"{symbol}@depth"] = messages[f"{symbol}@depth@100ms"] = depth_update
+        for levels in (5, 10, 20):
+            stream = f"{symbol}@depth{levels}"
+            if stream in subscribed or f"{stream}@100ms" in subscribed:
+                messages[stream] = messages[f"{stream}@100ms"] = state.depth(levels)
+        for interval, kline in state.klines.items():
+            messages[f"{symbol}@kline_{interval}"] = {
+                "e": "kline",
+                "E": now,
+                "s": state.symbol,
+                "k": kline,
+            }
+
+        return {
+            stream: dumps(message).decode("utf-8")
+            for stream, message in messages.items()
+            if stream in subscribed
+        }
+
+    def _update_klines(
+        self, state: _FakeSymbol, subscribed: set[str], quantity: float, now: int
+    ) -> None:
+        """
+        Accounts a trade in the current klines of the subscribed kline streams.
+        """
+        prefix = f"{state.symbol.lower()}@kline_"
+        intervals = {
+            stream[len(prefix) :] for stream in subscribed if stream.startswith(prefix)
+        }
+        for interval in list(state.klines):
+            if interval not in intervals:
+                del state.klines[interval]
+
+        price = _format_price(state.price)
+        quote_quantity = quantity * state.price * TICK_SIZE
+        for interval in intervals:
+            try:
+                interval_ms = INTERVAL_MILLISECONDS[KlineInterval(interval)]
+            except ValueError:
+                continue
+            kline = state.klines.get(interval)
+            if kline is None or now > kline["T"]:
+                open_time = now // interval_ms * interval_ms
+                kline = state.klines[interval] = {
+                    "t": open_time,
+                    "T": open_time + interval_ms - 1,
+                    "s": state.symbol,
+                    "i": interval,
+                    "f": state.trade_id,
+                    "L": state.trade_id,
+                    "o": price,
+                    "c": price,
+                    "h": price,
+                    "l": price,
+                    "v": "0",
+                    "n": 0,
+                    "x": False,
+                    "q": "0",
+                    "V": "0",
+                    "Q": "0",
+                    "B": "0",
+                }
+            kline.update(
+                L=state.trade_id,
+                c=price,
+                h=max(kline["h"], price, key=float),
+                l=min(kline["l"], price, key=float),
+                v=_format_quantity(float(kline["v"]) + quantity),
+                n=kline["n"] + 1,
+                q=_format_quantity(float(kline["q"]) + quote_quantity),
+            )
@@ -0,0 +1,282 @@
+from asyncio import AbstractServer, StreamReader, StreamWriter, start_server
+from collections import defaultdict
+from logging import getLogger
+from time import time
+from typing import Optional
+
+
+logger = getLogger(__name__)
+
+# sub-buckets per power of two of the histograms: values are kept with a relative error below 1 / 64
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations, with log-linear buckets of bounded relative error.
+    Recording is a few integer operations; percentiles are computed when read.
+    """
+
+    count: int
+    total: float
+    max: float
+
+    _counts: list[int]
+    _unit: float
+
+    def __init__(self, max_value: float = 3600.0, unit: float = 1e-6) -> None:
+        """
+        :param max_value: largest duration tracked, in seconds. Longer durations are clamped to it
+        :param unit: resolution of the histogram, in seconds. Default 1 microsecond
+        """
+        self._unit = unit
+        self._counts = [0] * (self._index(int(max_value / unit)) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        return (
+            _SUB_BUCKETS
+            + (shift - 1) * _HALF_SUB_BUCKETS
+            + (value >> shift)
+            - _HALF_SUB_BUCKETS
+        )
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """
+        Returns the middle value of a bucket.
+        """
+        if index < _SUB_BUCKETS:
+            return float(index)
+        shift = (index - _SUB_BUCKETS) // _HALF_SUB_BUCKETS + 1
+        mantissa = (index - _SUB_BUCKETS) % _HALF_SUB_BUCKETS + _HALF_SUB_BUCKETS
+        return (mantissa << shift) + (1 << shift) / 2
+
+    def record(self, seconds: float) -> None:
+        """
+        Accounts a duration, in seconds. Negative durations are recorded as zero.
+        """
+        index = self._index(max(int(seconds / self._unit), 0))
+        self._counts[min(index, len(self._counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Returns the duration below which "percentile" percent of the recorded durations are, in seconds.
+        """
+        if not self.count:
+            return 0.0
+        threshold = self.count * percentile / 100.0
+        accumulated = 0
+        for index, count in enumerate(self._counts):
+            accumulated += count
+            if count and accumulated >= threshold:
+                return min(self._value(index) * self._unit, self.max)
+        return self.max
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class StreamMetrics:
+    """
+    Message rate and exchange to client lag of a websocket stream.
+    """
+
+    messages: int
+    messages_per_second: float
+    lag: LatencyHistogram
+
+    _window_start: float
+    _window_messages: int
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.messages_per_second = 0.0
+        self.lag = LatencyHistogram()
+        self._window_start = time()
+        self._window_messages = 0
+
+    def record(self, event_time: Optional[int], now: float) -> None:
+        """
+        Accounts a received message.
+        :param event_time: "E" field of the message, in milliseconds
+        :param now: arrival time, in seconds
+        """
+        self.messages += 1
+        self._window_messages += 1
+
+        # updates the rate once per second
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.messages_per_second = self._window_messages / elapsed
+            self._window_start = now
+            self._window_messages = 0
+
+        if event_time:
+            self.lag.record(now - event_time / 1000)
+
+    def __repr__(self) -> str:
+        return (
+            f"StreamMetrics(messages={self.messages}, messages_per_second={self.messages_per_second:.1f}, "
+            f"lag_p50={self.lag.percentile(50):.4f}, max_lag={self.lag.max:.4f})"
+        )
+
+
+class MetricsHooks:
+    """
+    Instrumentation hooks called by the clients. The default implementation does nothing:
+    subclass it to forward the measurements to another metrics system.
+    """
+
+    def record_request(
+        self,
+        endpoint: str,
+        seconds: float,
+        error_code: Optional[int],
+        used_weight: Optional[str],
+    ) -> None:
+        """
+        Called after each REST request.
+        :param endpoint: method and path of the request, e.g. "GET /api/v3/order"
+        :param error_code: BinanceApiException error code, if the request failed
+        :param used_weight: X-MBX-USED-WEIGHT-1M header of the response, if any
+        """
+
+    def record_message(
+        self, stream: str, event_time: Optional[int], now: float
+    ) -> None:
+        """
+        Called for each websocket message.
+        :param stream: stream name for combined streams, or event type for raw streams
+        :param event_time: "E" field of the message, in milliseconds
+        :param now: arrival time, in seconds
+        """
+
+
+class Metrics(MetricsHooks):
+    """
+    In-memory metrics: latency histograms by endpoint, error counters by error code, used weight,
+    and message rate and lag by stream. Exported in the Prometheus text format.
+    """
+
+    requests: dict[str, LatencyHistogram]
+    errors: dict[int, int]
+    used_weight: int
+    streams: dict[str, StreamMetrics]
+
+    def __init__(self) -> None:
+        self.requests = defaultdict(LatencyHistogram)
+        self.errors = defaultdict(int)
+        self.used_weight = 0
+        self.streams = defaultdict(StreamMetrics)
+
+    def record_request(
+        self,
+        endpoint: str,
+        seconds: float,
+        error_code: Optional[int],
+        used_weight: Optional[str],
+    ) -> None:
+        self.requests[endpoint].record(seconds)
+        if error_code is not None:
+            self.errors[error_code] += 1
+        if used_weight is not None:
+            self.used_weight = int(used_weight)
+
+    def record_message(
+        self, stream: str, event_time: Optional[int], now: float
+    ) -> None:
+        self.streams[stream].record(event_time, now)
+
+    def to_prometheus(self, prefix: str = "binance") -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = [f"# TYPE {prefix}_request_seconds summary"]
+        for endpoint, histogram in self.requests.items():
+            lines += _summary(
+                f"{prefix}_request_seconds", f'endpoint="{endpoint}"', histogram
+            )
+
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        for error_code, count in self.errors.items():
+            lines.append(f'{prefix}_errors_total{{code="{error_code}"}} {count}')
+
+        lines.append(f"# TYPE {prefix}_used_weight gauge")
+        lines.append(f"{prefix}_used_weight {self.used_weight}")
+
+        lines.append(f"# TYPE {prefix}_stream_messages_total counter")
+        for stream, metrics in self.streams.items():
+            lines.append(
+                f'{prefix}_stream_messages_total{{stream="{stream}"}} {metrics.messages}'
+            )
+
+        lines.append(f"# TYPE {prefix}_stream_messages_per_second gauge")
+        for stream, metrics in self.streams.items():
+            lines.append(
+                f'{prefix}_stream_messages_per_second{{stream="{stream}"}} {metrics.messages_per_second}'
+            )
+
+        lines.append(f"# TYPE {prefix}_stream_lag_seconds summary")
+        for stream, metrics in self.streams.items():
+            lines += _summary(
+                f"{prefix}_stream_lag_seconds", f'stream="{stream}"', metrics.lag
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _summary(name: str, labels: str, histogram: LatencyHistogram) -> list[str]:
+    """
+    Renders a histogram as the lines of a Prometheus summary.
+    """
+    lines = [
+        f'{name}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile * 100)}'
+        for quantile in (0.5, 0.99, 0.999)
+    ]
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+async def start_prometheus_server(
+    metrics: Metrics, host: str = "127.0.0.1", port: int = 9090
+) -> AbstractServer:
+    """
+    Serves the metrics to Prometheus scrapes over HTTP. Rendering happens only when scraped.
+    :param host: interface to listen on. Local only by default: use e.g. "0.0.0.0" to expose the metrics
+    """
+
+    async def handle(reader: StreamReader, writer: StreamWriter) -> None:
+        try:
+            # the request is not parsed: every path answers with the metrics
+            await reader.readuntil(b"\r\n\r\n")
+            body = metrics.to_prometheus().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except Exception as exc:
+            logger.warning(f"unable to serve metrics: {exc}")
+        finally:
+            writer.close()
+
+    return await start_server(handle, host, port)
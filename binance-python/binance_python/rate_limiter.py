@@ -0,0 +1,185 @@
+from asyncio import Lock, sleep
+from time import time
+from typing import Any, Mapping, Optional
+
+
+class _RateWindow:
+    """
+    Fixed time window counting the usage of a single Binance rate limit.
+    """
+
+    interval: float
+    limit: int
+    used: int
+    _window_id: int
+
+    def __init__(self, interval: float, limit: int) -> None:
+        self.interval = interval
+        self.limit = limit
+        self.used = 0
+        self._window_id = 0
+
+    def _roll(self, now: float) -> None:
+        """
+        Resets the usage when a new window starts. Windows are aligned to the epoch like the server ones.
+        """
+        window_id = int(now // self.interval)
+        if window_id != self._window_id:
+            self._window_id = window_id
+            self.used = 0
+
+    def remaining(self, now: float) -> int:
+        """
+        Returns the budget still available in the current window.
+        """
+        self._roll(now)
+        return max(self.limit - self.used, 0)
+
+    def wait_time(self, amount: int, now: float) -> float:
+        """
+        Returns how many seconds to wait before "amount" fits in the window.
+        """
+        self._roll(now)
+        # an empty window always accepts the request, even if it is larger than the limit
+        if amount <= 0 or self.used == 0 or self.used + amount <= self.limit:
+            return 0.0
+        return (self._window_id + 1) * self.interval - now
+
+    def reserve(self, amount: int, now: float) -> None:
+        """
+        Accounts "amount" in the current window.
+        """
+        self._roll(now)
+        self.used += amount
+
+    def sync(self, used: int, now: float) -> None:
+        """
+        Synchronizes the usage with the value reported by the server.
+        """
+        self._roll(now)
+        # keeps the highest value, since in-flight requests may not be counted by the server yet
+        self.used = max(self.used, used)
+
+
+class RateLimiter:
+    """
+    Keeps track of the request weight and order count limits of the Binance API.
+    Callers wait asynchronously for budget instead of being rejected by the server.
+    """
+
+    # maps the binance (rateLimitType, interval) pairs to the window attributes
+    _LIMIT_TYPES = {
+        ("REQUEST_WEIGHT", "MINUTE"): "_weight_1m",
+        ("ORDERS", "SECOND"): "_orders_10s",
+        ("ORDERS", "DAY"): "_orders_1d",
+    }
+
+    # response headers reporting the current usage of each window
+    _USAGE_HEADERS = {
+        "x-mbx-used-weight-1m": "_weight_1m",
+        "x-mbx-order-count-10s": "_orders_10s",
+        "x-mbx-order-count-1d": "_orders_1d",
+    }
+
+    _weight_1m: _RateWindow
+    _orders_10s: _RateWindow
+    _orders_1d: _RateWindow
+    _blocked_until: float
+    _lock: Lock
+
+    def __init__(
+        self,
+        weight_limit: int = 6000,
+        orders_10s_limit: int = 100,
+        orders_1d_limit: int = 200000,
+    ) -> None:
+        self._weight_1m = _RateWindow(60.0, weight_limit)
+        self._orders_10s = _RateWindow(10.0, orders_10s_limit)
+        self._orders_1d = _RateWindow(86400.0, orders_1d_limit)
+        self._blocked_until = 0.0
+        self._lock = Lock()
+
+    @property
+    def remaining_weight(self) -> int:
+        """
+        Request weight still available in the current minute.
+        """
+        return self._weight_1m.remaining(time())
+
+    @property
+    def remaining_orders_10s(self) -> int:
+        """
+        Orders still available in the current 10 seconds window.
+        """
+        return self._orders_10s.remaining(time())
+
+    @property
+    def remaining_orders_1d(self) -> int:
+        """
+        Orders still available in the current day.
+        """
+        return self._orders_1d.remaining(time())
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Seconds remaining until the server accepts requests again after a 429 / 418 response.
+        """
+        return max(self._blocked_until - time(), 0.0)
+
+    def update_limits(self, rate_limits: list[Any]) -> None:
+        """
+        Updates the limits using the "rateLimits" field of the exchange info.
+        """
+        for rate_limit in rate_limits:
+            attribute = self._LIMIT_TYPES.get(
+                (rate_limit["rateLimitType"], rate_limit["interval"])
+            )
+            if attribute:
+                window: _RateWindow = getattr(self, attribute)
+                unit = {"SECOND": 1.0, "MINUTE": 60.0, "DAY": 86400.0}[
+                    rate_limit["interval"]
+                ]
+                window.interval = unit * rate_limit["intervalNum"]
+                window.limit = rate_limit["limit"]
+
+    async def acquire(self, weight: int, orders: int = 0) -> None:
+        """
+        Waits until there is enough budget for a request and reserves it.
+        """
+        # the lock keeps waiting callers in order
+        async with self._lock:
+            while True:
+                now = time()
+                delay = max(
+                    self._blocked_until - now,
+                    self._weight_1m.wait_time(weight, now),
+                    self._orders_10s.wait_time(orders, now),
+                    self._orders_1d.wait_time(orders, now),
+                )
+                if delay <= 0:
+                    break
+                await sleep(delay)
+
+            self._weight_1m.reserve(weight, now)
+            if orders:
+                self._orders_10s.reserve(orders, now)
+                self._orders_1d.reserve(orders, now)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Synchronizes the usage with the headers of a server response.
+        """
+        now = time()
+        for header, attribute in self._USAGE_HEADERS.items():
+            value = headers.get(header)
+            if value is not None:
+                getattr(self, attribute).sync(int(value), now)
+
+    def block(self, retry_after: Optional[float]) -> None:
+        """
+        Blocks all requests for "retry_after" seconds, as requested by a 429 / 418 response.
+        """
+        # binance asks to back off even when no "Retry-After" header is sent
+        seconds = retry_after if retry_after is not None else 60.0
+        self._blocked_until = max(self._blocked_until, time() + seconds)
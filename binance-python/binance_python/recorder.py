@@ -0,0 +1,204 @@
+from asyncio import sleep
+from glob import glob
+from gzip import GzipFile
+from logging import getLogger
+from os import makedirs, path
+from queue import SimpleQueue
+from threading import Thread
+from time import monotonic
+from typing import IO, AsyncIterator, Iterator, Optional
+from orjson import loads
+
+
+logger = getLogger(__name__)
+
+
+class StreamRecorder:
+    """
+    Appends raw websocket frames and their receive times to gzip compressed segment files,
+    rotated by size and age. Segments are never rewritten.
+    Each line of a segment is "<receive time in seconds>\\t<frame>".
+    Frames are compressed and written by a background thread, so the websocket readers are never blocked by the disk.
+    """
+
+    _directory: str
+    _prefix: str
+    _max_segment_bytes: int
+    _max_segment_seconds: float
+    _compresslevel: int
+    _frames: SimpleQueue
+    _writer: Optional[Thread] = None
+    _file: Optional[IO[bytes]] = None
+    _segment_bytes: int = 0
+    _segment_start: float = 0.0
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "stream",
+        max_segment_bytes: int = 256 * 1024 * 1024,
+        max_segment_seconds: float = 3600.0,
+        compresslevel: int = 3,
+    ) -> None:
+        """
+        :param directory: directory of the segments, created if needed
+        :param prefix: name prefix of the segment files
+        :param max_segment_bytes: uncompressed bytes after which a new segment is started
+        :param max_segment_seconds: seconds after which a new segment is started
+        :param compresslevel: gzip compression level, from 1 (fastest) to 9 (smallest)
+        """
+        makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._prefix = prefix
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segment_seconds = max_segment_seconds
+        self._compresslevel = compresslevel
+        self._frames = SimpleQueue()
+
+    def _rotate(self, received_at: float) -> IO[bytes]:
+        """
+        Closes the current segment and starts a new one.
+        """
+        self._close_segment()
+        # receive time in microseconds keeps the segment names unique and sorted
+        file_name = path.join(
+            self._directory, f"{self._prefix}-{int(received_at * 1e6):016d}.log.gz"
+        )
+        logger.info(f"starting stream segment: {file_name}")
+        self._file = GzipFile(file_name, mode="xb", compresslevel=self._compresslevel)
+        self._segment_bytes = 0
+        self._segment_start = received_at
+        return self._file
+
+    def write(self, frame: str, received_at: float) -> None:
+        """
+        Appends a frame. It is queued for the writer thread, started by the first frame.
+        :param received_at: receive time, in seconds
+        """
+        if self._writer is None:
+            self._writer = Thread(
+                target=self._write_frames, name="stream-recorder", daemon=True
+            )
+            self._writer.start()
+        self._frames.put((frame, received_at))
+
+    def _write_frames(self) -> None:
+        """
+        Writes the queued frames until the recorder is closed.
+        """
+        while True:
+            item = self._frames.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except Exception as exc:
+                logger.error(f"unable to record frame: {exc}")
+        self._close_segment()
+
+    def _write(self, frame: str, received_at: float) -> None:
+        file = self._file
+        if (
+            file is None
+            or self._segment_bytes >= self._max_segment_bytes
+            or received_at - self._segment_start >= self._max_segment_seconds
+        ):
+            file = self._rotate(received_at)
+        line = f"{received_at:.6f}\t{frame}\n".encode("utf-8")
+        file.write(line)
+        self._segment_bytes += len(line)
+
+    def close(self) -> None:
+        """
+        Waits for the queued frames to be written and closes the current segment.
+        """
+        if self._writer:
+            self._frames.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _close_segment(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class StreamReplayer:
+    """
+    Plays back the frames of a StreamRecorder, with the async iterator interface of the websocket clients.
+    """
+
+    _directory: str
+    _prefix: str
+    _speed: Optional[float]
+    _start_time: Optional[float]
+    _end_time: Optional[float]
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "stream",
+        speed: Optional[float] = 1.0,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+    ) -> None:
+        """
+        :param directory: directory of the recorded segments
+        :param prefix: name prefix of the segment files
+        :param speed: playback speed: 1 is real time, 10 is ten times faster. None plays as fast as possible
+        :param start_time: receive time of the first frame played, in seconds
+        :param end_time: receive time of the last frame played, in seconds
+        """
+        self._directory = directory
+        self._prefix = prefix
+        self._speed = speed
+        self._start_time = start_time
+        self._end_time = end_time
+
+    def frames(self) -> Iterator[tuple[float, str]]:
+        """
+        Reads the recorded (receive time, frame) pairs in order.
+        """
+        segments = sorted(glob(path.join(self._directory, f"{self._prefix}-*.log.gz")))
+        for segment in segments:
+            try:
+                with GzipFile(segment, mode="rb") as file:
+                    for line in file:
+                        received_at, frame = (
+                            line.decode("utf-8").rstrip("\n").split("\t", 1)
+                        )
+                        yield float(received_at), frame
+            except EOFError:
+                # segments not closed properly end with a truncated block
+                logger.warning(f"stream segment is truncated: {segment}")
+
+    async def stream(self) -> AsyncIterator[dict]:
+        """
+        Provides the recorded messages, paced by their receive times.
+        """
+        first_received_at: Optional[float] = None
+        started = 0.0
+
+        for received_at, frame in self.frames():
+            if self._start_time is not None and received_at < self._start_time:
+                continue
+            if self._end_time is not None and received_at > self._end_time:
+                return
+
+            # waits until the frame is due
+            if first_received_at is None:
+                first_received_at = received_at
+                started = monotonic()
+            if self._speed:
+                delay = (received_at - first_received_at) / self._speed - (
+                    monotonic() - started
+                )
+                await sleep(max(delay, 0))
+            else:
+                # lets other tasks run, as the network would
+                await sleep(0)
+
+            yield loads(frame)
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self.stream()
@@ -0,0 +1,62 @@
+from base64 import b64encode
+from hashlib import sha256
+from hmac import new as hmac, HMAC
+from typing import Optional, Union
+from urllib.parse import quote
+
+
+class HmacSigner:
+    """
+    Signs requests with an HMAC SHA256 API secret.
+    The keyed HMAC state is computed once and copied for each request.
+    """
+
+    _hmac: HMAC
+
+    def __init__(self, api_secret: str) -> None:
+        self._hmac = hmac(api_secret.encode("utf-8"), digestmod=sha256)
+
+    def sign(self, payload: bytes) -> str:
+        """
+        Returns the signature of a query string.
+        """
+        signer = self._hmac.copy()
+        signer.update(payload)
+        return signer.hexdigest()
+
+
+class Ed25519Signer:
+    """
+    Signs requests with an Ed25519 private key. Requires the "cryptography" package.
+    """
+
+    def __init__(self, private_key: bytes, password: Optional[bytes] = None) -> None:
+        """
+        :param private_key: PEM encoded private key
+        :param password: password of the private key, if it is encrypted
+        """
+        try:
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+                Ed25519PrivateKey,
+            )
+            from cryptography.hazmat.primitives.serialization import (
+                load_pem_private_key,
+            )
+        except ImportError:
+            raise ImportError(
+                'Ed25519 API keys require the "cryptography" package: pip install cryptography'
+            )
+
+        key = load_pem_private_key(private_key, password=password)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise ValueError("private key is not an Ed25519 key")
+        self._key = key
+
+    def sign(self, payload: bytes) -> str:
+        """
+        Returns the signature of a query string, base64 and url encoded.
+        """
+        return quote(b64encode(self._key.sign(payload)), safe="")
+
+
+Signer = Union[HmacSigner, Ed25519Signer]
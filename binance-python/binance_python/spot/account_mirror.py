@@ -0,0 +1,331 @@
+from asyncio import Task, create_task, gather, sleep
+from logging import getLogger
+from typing import AsyncIterator, Optional, Union
+
+from binance_python.base_ws_client import STREAM_GAP_EVENT
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.enums import OrderStatus
+from binance_python.spot.events import (
+    BalanceUpdateEvent,
+    Event,
+    ExecutionReportEvent,
+    OutboundAccountPositionEvent,
+)
+from binance_python.spot.typings import AccountResponse, QueryOrderResponse
+from binance_python.spot.user_data_stream import BinanceUserDataStream
+
+
+logger = getLogger(__name__)
+
+# order statuses of the orders still in the book
+OPEN_ORDER_STATUSES = frozenset(
+    (
+        OrderStatus.NEW.value,
+        OrderStatus.PARTIALLY_FILLED.value,
+        OrderStatus.PENDING_CANCEL.value,
+    )
+)
+
+
+class Balance:
+    """
+    Free and locked amounts of an asset.
+    """
+
+    __slots__ = ("asset", "free", "locked", "update_time")
+
+    def __init__(
+        self, asset: str, free: float, locked: float, update_time: int
+    ) -> None:
+        self.asset = asset
+        self.free = free
+        self.locked = locked
+        self.update_time = update_time
+
+    def __repr__(self) -> str:
+        return f"Balance({self.asset}, free={self.free}, locked={self.locked})"
+
+
+class OpenOrder:
+    """
+    State of an order still in the book.
+    """
+
+    __slots__ = (
+        "symbol",
+        "order_id",
+        "client_order_id",
+        "side",
+        "order_type",
+        "status",
+        "price",
+        "quantity",
+        "executed_quantity",
+        "update_time",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        order_id: int,
+        client_order_id: str,
+        side: str,
+        order_type: str,
+        status: str,
+        price: float,
+        quantity: float,
+        executed_quantity: float,
+        update_time: int,
+    ) -> None:
+        self.symbol = symbol
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.side = side
+        self.order_type = order_type
+        self.status = status
+        self.price = price
+        self.quantity = quantity
+        self.executed_quantity = executed_quantity
+        self.update_time = update_time
+
+    @classmethod
+    def from_response(cls, order: QueryOrderResponse) -> "OpenOrder":
+        return cls(
+            order["symbol"],
+            order["orderId"],
+            order["clientOrderId"],
+            order["side"],
+            order["type"],
+            order["status"],
+            float(order["price"]),
+            float(order["origQty"]),
+            float(order["executedQty"]),
+            order["updateTime"],
+        )
+
+    @classmethod
+    def from_event(cls, event: ExecutionReportEvent) -> "OpenOrder":
+        return cls(
+            event.symbol,
+            event.order_id,
+            event.client_order_id,
+            event.side,
+            event.order_type,
+            event.order_status,
+            event.price,
+            event.quantity,
+            event.cumulative_filled_quantity,
+            event.transaction_time,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"OpenOrder({self.symbol} {self.order_id}, {self.side} {self.executed_quantity}/{self.quantity}"
+            f" @ {self.price}, {self.status})"
+        )
+
+
+class AccountMirror:
+    """
+    Balances and open orders of the account, seeded from REST once and kept up to date from the user data stream.
+    REST is called again only to reconcile after a reconnection gap.
+    """
+
+    synced: bool
+
+    _binance_client: BinanceSpotClient
+    _user_data_stream: BinanceUserDataStream
+    _balances: dict[str, Balance]
+    _orders: dict[str, dict[int, OpenOrder]]
+    _retry_seconds: float
+    _buffer: list[Union[Event, dict]]
+    _snapshot_task: Optional[Task] = None
+
+    def __init__(
+        self,
+        binance_client: BinanceSpotClient,
+        user_data_stream: Optional[BinanceUserDataStream] = None,
+        retry_seconds: float = 5.0,
+    ) -> None:
+        """
+        :param binance_client: client used to fetch the account snapshots
+        :param user_data_stream: stream of account events. Created from the client if not given
+        :param retry_seconds: seconds to wait before fetching a snapshot again after a failure
+        """
+        self._binance_client = binance_client
+        self._user_data_stream = user_data_stream or BinanceUserDataStream(
+            binance_client
+        )
+        self._balances = {}
+        self._orders = {}
+        self._retry_seconds = retry_seconds
+        self._buffer = []
+        self.synced = False
+
+    def balance(self, asset: str) -> Balance:
+        """
+        Returns the balance of an asset. Unknown assets have a zero balance.
+        """
+        return self._balances.get(asset) or Balance(asset, 0.0, 0.0, 0)
+
+    def free(self, asset: str) -> float:
+        balance = self._balances.get(asset)
+        return balance.free if balance else 0.0
+
+    def locked(self, asset: str) -> float:
+        balance = self._balances.get(asset)
+        return balance.locked if balance else 0.0
+
+    def balances(self) -> list[Balance]:
+        """
+        Returns the balances of all assets.
+        """
+        return list(self._balances.values())
+
+    def open_order(self, symbol: str, order_id: int) -> Optional[OpenOrder]:
+        """
+        Returns an open order, if it is still open.
+        """
+        return self._orders.get(symbol, {}).get(order_id)
+
+    def open_orders(self, symbol: Optional[str] = None) -> list[OpenOrder]:
+        """
+        Returns the open orders of a symbol, or of all symbols if not given.
+        """
+        if symbol:
+            return list(self._orders.get(symbol, {}).values())
+        return [order for orders in self._orders.values() for order in orders.values()]
+
+    def load(self, account: AccountResponse, orders: list[QueryOrderResponse]) -> None:
+        """
+        Replaces the state with a REST snapshot.
+        """
+        update_time = account["updateTime"]
+        self._balances = {
+            balance["asset"]: Balance(
+                balance["asset"],
+                float(balance["free"]),
+                float(balance["locked"]),
+                update_time,
+            )
+            for balance in account["balances"]
+        }
+        self._orders = {}
+        for order in orders:
+            self._orders.setdefault(order["symbol"], {})[
+                order["orderId"]
+            ] = OpenOrder.from_response(order)
+        self.synced = True
+
+    def apply(self, event: Union[Event, dict]) -> None:
+        """
+        Applies a user data event. Events older than the state are ignored, so they may be applied again.
+        """
+        if isinstance(event, ExecutionReportEvent):
+            self._apply_execution_report(event)
+        elif isinstance(event, OutboundAccountPositionEvent):
+            update_time = event.last_update_time
+            for item in event.balances:
+                balance = self._balances.get(item.asset)
+                if balance and balance.update_time > update_time:
+                    continue
+                self._balances[item.asset] = Balance(
+                    item.asset, item.free, item.locked, update_time
+                )
+        elif isinstance(event, BalanceUpdateEvent):
+            balance = self._balances.get(event.asset)
+            if not balance:
+                self._balances[event.asset] = Balance(
+                    event.asset, event.delta, 0.0, event.clear_time
+                )
+            elif balance.update_time < event.clear_time:
+                balance.free += event.delta
+                balance.update_time = event.clear_time
+
+    def _apply_execution_report(self, event: ExecutionReportEvent) -> None:
+        """
+        Adds, updates or removes an open order.
+        """
+        orders = self._orders.setdefault(event.symbol, {})
+        order = orders.get(event.order_id)
+        if order and order.update_time > event.transaction_time:
+            return
+
+        if event.order_status in OPEN_ORDER_STATUSES:
+            orders[event.order_id] = OpenOrder.from_event(event)
+        else:
+            orders.pop(event.order_id, None)
+            if not orders:
+                del self._orders[event.symbol]
+
+    async def _fetch_snapshot(
+        self,
+    ) -> tuple[AccountResponse, list[QueryOrderResponse]]:
+        """
+        Fetches the account and its open orders once the stream is subscribed, so no event is missed.
+        Retries until it succeeds.
+        """
+        while True:
+            await self._user_data_stream.subscribed.wait()
+            try:
+                logger.info("fetching account snapshot")
+                return await gather(
+                    self._binance_client.fetch_account_info(),
+                    self._binance_client.fetch_open_orders(),
+                )
+            except Exception as exc:
+                logger.error(f"unable to fetch account snapshot: {exc}")
+                await sleep(self._retry_seconds)
+
+    def _reconcile(self) -> None:
+        """
+        Starts fetching a new snapshot. Events are buffered meanwhile.
+        """
+        self.synced = False
+        self._buffer.clear()
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+        self._snapshot_task = create_task(self._fetch_snapshot())
+        self._snapshot_task.add_done_callback(self._on_snapshot)
+
+    def _on_snapshot(self, task: Task) -> None:
+        """
+        Loads a fetched snapshot and applies the events buffered meanwhile over it.
+        """
+        if task.cancelled() or task is not self._snapshot_task:
+            return
+        self._snapshot_task = None
+        self.load(*task.result())
+        for event in self._buffer:
+            self.apply(event)
+        self._buffer.clear()
+
+    async def events(self) -> AsyncIterator[Union[Event, dict]]:
+        """
+        Provides the user data events, keeping the mirror up to date with them.
+        """
+        self._reconcile()
+
+        try:
+            async for event in self._user_data_stream.events():
+                # events were missed while reconnecting: the state must be fetched again
+                if isinstance(event, dict) and event.get("e") == STREAM_GAP_EVENT:
+                    self._reconcile()
+                elif self._snapshot_task:
+                    self._buffer.append(event)
+                else:
+                    self.apply(event)
+                yield event
+
+        finally:
+            # handles the end of the stream
+            if self._snapshot_task:
+                self._snapshot_task.cancel()
+                self._snapshot_task = None
+
+    async def run(self) -> None:
+        """
+        Keeps the mirror up to date until cancelled.
+        """
+        async for _ in self.events():
+            pass
@@ -1,12 +1,27 @@
-from typing import Optional
+from asyncio import Semaphore, Task, create_task, gather
+from collections import deque
+from functools import partial
+from time import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Union
+from orjson import dumps
 
-from binance_python.base_api_client import BaseApiClient, Params
-from binance_python.spot.enums import OrderSide, OrderType, TimeInForce
+from binance_python.base_api_client import BaseApiClient, Number, Params, format_number
+from binance_python.spot.enums import (
+    CancelReplaceMode,
+    KlineInterval,
+    OrderResponseType,
+    OrderSide,
+    OrderType,
+    TimeInForce,
+)
 from binance_python.spot.typings import (
     AccountResponse,
     CancelOrderResponse,
+    CancelReplaceResponse,
     ExchangeInfoResponse,
+    KlineResponse,
     ListenKeyResponse,
+    NewOrderRequest,
     NewOrderResponse,
     OrderBookResponse,
     PriceTickerResponse,
@@ -16,23 +31,50 @@ from binance_python.spot.typings import (
 )
 
 
+# milliseconds between the start and end times of the history endpoints
+MAX_TIME_RANGE = 86400000
+
+
 class BinanceSpotClient(BaseApiClient):
     """
     Client to handle calls to the Binance API endpoints.
     """
 
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = False) -> None:
-        super().__init__(api_key, api_secret, testnet)
+    @staticmethod
+    def _order_book_weight(limit: Optional[int]) -> int:
+        """
+        Returns the request weight of the order book endpoint for a given limit.
+        """
+        if not limit or limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        if limit <= 1000:
+            return 50
+        return 250
 
     async def fetch_server_time(self) -> ServerTimeResponse:
         return await self._send_request("GET", "/api/v3/time")
 
     async def fetch_account_info(self) -> AccountResponse:
         params = dict(timestamp=self._get_timestamp())
-        return await self._send_request("GET", "/api/v3/account", params)
+        return await self._send_request("GET", "/api/v3/account", params, weight=20)
 
-    async def fetch_exchange_info(self) -> ExchangeInfoResponse:
-        return await self._send_request("GET", "/api/v3/exchangeInfo")
+    async def fetch_exchange_info(
+        self, symbols: Optional[list[str]] = None
+    ) -> ExchangeInfoResponse:
+        """
+        Current exchange trading rules and symbol information.
+        :param symbols: symbols to get information from. Otherwise all symbols are returned.
+        """
+        params: Optional[Params] = None
+        if symbols and len(symbols) == 1:
+            params = dict(symbol=symbols[0])
+        elif symbols:
+            params = dict(symbols=dumps(symbols).decode("utf-8"))
+        return await self._send_request(
+            "GET", "/api/v3/exchangeInfo", params, weight=20
+        )
 
     async def fetch_trades(
         self,
@@ -53,43 +95,96 @@ class BinanceSpotClient(BaseApiClient):
         params: Params = dict(
             timestamp=self._get_timestamp(), symbol=symbol, limit=str(limit)
         )
-        if from_id:
+        if from_id is not None:
             params["fromId"] = str(from_id)
         if start_time:
             params["startTime"] = str(start_time)
         if end_time:
             params["endTime"] = str(end_time)
-        return await self._send_request("GET", "/api/v3/myTrades", params)
+        return await self._send_request("GET", "/api/v3/myTrades", params, weight=20)
 
     async def place_order(
         self,
         symbol: str,
         order_side: OrderSide,
         order_type: OrderType,
-        amount: Optional[float] = None,
-        price: Optional[float] = None,
+        amount: Optional[Number] = None,
+        price: Optional[Number] = None,
         time_in_force: Optional[TimeInForce] = None,
-        stop_price: Optional[float] = None,
+        stop_price: Optional[Number] = None,
+        recv_window: Optional[int] = None,
+        response_type: OrderResponseType = OrderResponseType.ACK,
+        client_order_id: Optional[str] = None,
     ) -> NewOrderResponse:
         """
         Send in a new order.
+        :param recv_window: milliseconds the request stays valid. Otherwise the client default is used
+        :param response_type: ACK returns once the order is accepted. RESULT and FULL wait for the
+        order status, FULL including its fills
+        :param client_order_id: unique id of the order. Otherwise one is generated by the server
+        """
+        params: Params = dict(
+            timestamp=self._get_timestamp(),
+            symbol=symbol,
+            side=order_side.name,
+            type=order_type.name,
+            newOrderRespType=response_type.name,
+        )
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
+        if amount:
+            params["quantity"] = format_number(amount)
+        if price:
+            params["price"] = format_number(price)
+        if time_in_force:
+            params["timeInForce"] = time_in_force.name
+        if stop_price:
+            params["stopPrice"] = format_number(stop_price)
+        if recv_window:
+            params["recvWindow"] = str(recv_window)
+        return await self._send_request("POST", "/api/v3/order", params, orders=1)
+
+    async def cancel_replace_order(
+        self,
+        symbol: str,
+        cancel_order_id: int,
+        order_side: OrderSide,
+        order_type: OrderType,
+        amount: Optional[Number] = None,
+        price: Optional[Number] = None,
+        time_in_force: Optional[TimeInForce] = None,
+        stop_price: Optional[Number] = None,
+        mode: CancelReplaceMode = CancelReplaceMode.STOP_ON_FAILURE,
+        recv_window: Optional[int] = None,
+    ) -> CancelReplaceResponse:
+        """
+        Cancels an existing order and places a new order on the same symbol, in a single request.
+        :param cancel_order_id: OrderId of the order to cancel
+        :param mode: STOP_ON_FAILURE doesn't place the new order if the cancel fails. ALLOW_FAILURE places it anyway
+        :param recv_window: milliseconds the request stays valid. Otherwise the client default is used
         """
         params: Params = dict(
             timestamp=self._get_timestamp(),
             symbol=symbol,
+            cancelOrderId=str(cancel_order_id),
+            cancelReplaceMode=mode.name,
             side=order_side.name,
             type=order_type.name,
-            newOrderRespType="ACK",  # to standardize responses. Other options: RESULT and FULL
+            newOrderRespType="ACK",
         )
         if amount:
-            params["quantity"] = str(amount)
+            params["quantity"] = format_number(amount)
         if price:
-            params["price"] = str(price)
+            params["price"] = format_number(price)
         if time_in_force:
             params["timeInForce"] = time_in_force.name
         if stop_price:
-            params["stopPrice"] = str(stop_price)
-        return await self._send_request("POST", "/api/v3/order", params)
+            params["stopPrice"] = format_number(stop_price)
+        if recv_window:
+            params["recvWindow"] = str(recv_window)
+        return await self._send_request(
+            "POST", "/api/v3/order/cancelReplace", params, orders=1
+        )
 
     async def fetch_order_status(
         self, symbol: str, order_id: int
@@ -100,24 +195,76 @@ class BinanceSpotClient(BaseApiClient):
         params: Params = dict(
             timestamp=self._get_timestamp(), symbol=symbol, orderId=str(order_id)
         )
-        return await self._send_request("GET", "/api/v3/order", params)
+        return await self._send_request("GET", "/api/v3/order", params, weight=4)
 
-    async def cancel_order(self, symbol: str, order_id: int) -> CancelOrderResponse:
+    async def cancel_order(
+        self, symbol: str, order_id: int, recv_window: Optional[int] = None
+    ) -> CancelOrderResponse:
         """
         Cancel an active order.
+        :param recv_window: milliseconds the request stays valid. Otherwise the client default is used
         """
         params: Params = dict(
             timestamp=self._get_timestamp(), symbol=symbol, orderId=str(order_id)
         )
+        if recv_window:
+            params["recvWindow"] = str(recv_window)
         return await self._send_request("DELETE", "/api/v3/order", params)
 
-    async def cancel_all_orders(self, symbol: str) -> list[CancelOrderResponse]:
+    async def cancel_all_orders(
+        self, symbol: str, recv_window: Optional[int] = None
+    ) -> list[CancelOrderResponse]:
         """
         Cancel all active orders on a symbol. This includes OCO orders.
+        :param recv_window: milliseconds the request stays valid. Otherwise the client default is used
         """
         params: Params = dict(timestamp=self._get_timestamp(), symbol=symbol)
+        if recv_window:
+            params["recvWindow"] = str(recv_window)
         return await self._send_request("DELETE", "/api/v3/openOrders", params)
 
+    @staticmethod
+    async def _gather_bounded(
+        calls: list[Callable[[], Awaitable[Any]]], max_in_flight: int
+    ) -> list[Any]:
+        """
+        Runs calls concurrently with at most "max_in_flight" at once.
+        Returns their results in order, with exceptions in place of the failed ones.
+        """
+        semaphore = Semaphore(max_in_flight)
+
+        async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await call()
+
+        return await gather(*[run(call) for call in calls], return_exceptions=True)
+
+    async def place_orders(
+        self, orders: list[NewOrderRequest], max_in_flight: int = 10
+    ) -> list[Union[NewOrderResponse, Exception]]:
+        """
+        Sends in many new orders concurrently. Orders still wait for the order count limits.
+        :param orders: place_order arguments of each order
+        :param max_in_flight: maximum number of concurrent requests
+        :return: the response of each order, or the exception raised by it
+        """
+        calls = [partial(self.place_order, **order) for order in orders]
+        return await self._gather_bounded(calls, max_in_flight)
+
+    async def cancel_orders(
+        self, orders: list[tuple[str, int]], max_in_flight: int = 10
+    ) -> list[Union[CancelOrderResponse, Exception]]:
+        """
+        Cancels many active orders concurrently, across any symbols.
+        :param orders: (symbol, order_id) of each order
+        :param max_in_flight: maximum number of concurrent requests
+        :return: the response of each cancellation, or the exception raised by it
+        """
+        calls = [
+            partial(self.cancel_order, symbol, order_id) for symbol, order_id in orders
+        ]
+        return await self._gather_bounded(calls, max_in_flight)
+
     async def fetch_open_orders(
         self, symbol: Optional[str] = None
     ) -> list[QueryOrderResponse]:
@@ -127,7 +274,9 @@ class BinanceSpotClient(BaseApiClient):
         params: Params = dict(timestamp=self._get_timestamp())
         if symbol:
             params["symbol"] = symbol
-        return await self._send_request("GET", "/api/v3/openOrders", params)
+        return await self._send_request(
+            "GET", "/api/v3/openOrders", params, weight=6 if symbol else 80
+        )
 
     async def fetch_all_account_orders(
         self,
@@ -148,26 +297,198 @@ class BinanceSpotClient(BaseApiClient):
         params: Params = dict(
             timestamp=self._get_timestamp(), symbol=symbol, limit=str(limit)
         )
-        if from_id:
+        if from_id is not None:
             params["orderId"] = str(from_id)
         if start_time:
             params["startTime"] = str(start_time)
         if end_time:
             params["endTime"] = str(end_time)
-        return await self._send_request("GET", "/api/v3/allOrders", params)
+        return await self._send_request("GET", "/api/v3/allOrders", params, weight=20)
+
+    @staticmethod
+    async def _paginate(
+        fetch: Callable[..., Awaitable[list[Any]]],
+        id_key: str,
+        from_id: Optional[int],
+        start_time: Optional[int],
+        end_time: Optional[int],
+        limit: int,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Iterates over the pages of an id paginated endpoint, advancing the id cursor after each page.
+        """
+        # the server rejects the id cursor with a time range, and time ranges over 24 hours,
+        # and a start time alone only covers the next 24 hours
+        windowed = False
+        if from_id is not None or start_time is None:
+            page = await fetch(from_id, None, None, limit)
+        elif end_time is not None and end_time - start_time <= MAX_TIME_RANGE:
+            page = await fetch(None, start_time, end_time, limit)
+        else:
+            # walks 24 hours windows up to the first rows, then continues with the id cursor
+            windowed = True
+            last_time = end_time if end_time is not None else int(time() * 1000)
+            page = []
+            for window_start in range(start_time, last_time + 1, MAX_TIME_RANGE):
+                window_end = min(window_start + MAX_TIME_RANGE - 1, last_time)
+                page = await fetch(None, window_start, window_end, limit)
+                if page:
+                    break
+
+        while page:
+            if end_time is not None and page[-1]["time"] > end_time:
+                page = [row for row in page if row["time"] <= end_time]
+                if page:
+                    yield page
+                return
+            yield page
+
+            # the last page is not full. A time window may end before the range does
+            if len(page) < limit and not windowed:
+                return
+            windowed = False
+
+            page = await fetch(page[-1][id_key] + 1, None, None, limit)
+
+    @staticmethod
+    async def _paginate_windows(
+        fetch: Callable[..., Awaitable[list[Any]]],
+        id_key: str,
+        start_time: int,
+        end_time: int,
+        window: int,
+        concurrency: int,
+        limit: int,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Splits a time range in windows fetched concurrently, yielding their pages in order.
+        Only "concurrency" windows are held in memory at once.
+        """
+
+        async def fetch_window(window_start: int, window_end: int) -> list[list[Any]]:
+            return [
+                page
+                async for page in BinanceSpotClient._paginate(
+                    fetch, id_key, None, window_start, window_end, limit
+                )
+            ]
+
+        # time windows, with inclusive start and end times
+        windows = (
+            (window_start, min(window_start + window - 1, end_time))
+            for window_start in range(start_time, end_time + 1, window)
+        )
+        pending: deque[Task] = deque()
+        try:
+            for window_range in windows:
+                pending.append(create_task(fetch_window(*window_range)))
+                if len(pending) < concurrency:
+                    continue
+                for page in await pending.popleft():
+                    yield page
+            while pending:
+                for page in await pending.popleft():
+                    yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def iter_trades(
+        self,
+        symbol: str,
+        from_id: Optional[int] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1000,
+    ) -> AsyncIterator[list[TradesResponse]]:
+        """
+        Iterates over the pages of trades for a specific account and symbol, from the oldest to the newest.
+        :param symbol: symbol to get trades from
+        :param from_id: TradeId to iterate from. Use 0 to iterate over the whole history
+        :param start_time: start time to iterate from, if no from_id is given
+        :param end_time: end time of the trades
+        :param limit: page size. Default 1000; max 1000
+        """
+        fetch = partial(self.fetch_trades, symbol)
+        return self._paginate(fetch, "id", from_id, start_time, end_time, limit)
+
+    def iter_trades_parallel(
+        self,
+        symbol: str,
+        start_time: int,
+        end_time: int,
+        window: int = MAX_TIME_RANGE,
+        concurrency: int = 4,
+        limit: int = 1000,
+    ) -> AsyncIterator[list[TradesResponse]]:
+        """
+        Iterates over the pages of trades of a time range, fetching time windows concurrently.
+        :param symbol: symbol to get trades from
+        :param start_time: start time of the trades
+        :param end_time: end time of the trades
+        :param window: milliseconds per window. Default and max 24 hours
+        :param concurrency: number of windows fetched at once
+        :param limit: page size. Default 1000; max 1000
+        """
+        fetch = partial(self.fetch_trades, symbol)
+        return self._paginate_windows(
+            fetch, "id", start_time, end_time, window, concurrency, limit
+        )
+
+    def iter_all_account_orders(
+        self,
+        symbol: str,
+        from_id: Optional[int] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1000,
+    ) -> AsyncIterator[list[QueryOrderResponse]]:
+        """
+        Iterates over the pages of all account orders, from the oldest to the newest.
+        :param symbol: symbol to get orders from
+        :param from_id: OrderId to iterate from. Use 0 to iterate over the whole history
+        :param start_time: start time to iterate from, if no from_id is given
+        :param end_time: end time of the orders
+        :param limit: page size. Default 1000; max 1000
+        """
+        fetch = partial(self.fetch_all_account_orders, symbol)
+        return self._paginate(fetch, "orderId", from_id, start_time, end_time, limit)
+
+    def iter_all_account_orders_parallel(
+        self,
+        symbol: str,
+        start_time: int,
+        end_time: int,
+        window: int = MAX_TIME_RANGE,
+        concurrency: int = 4,
+        limit: int = 1000,
+    ) -> AsyncIterator[list[QueryOrderResponse]]:
+        """
+        Iterates over the pages of account orders of a time range, fetching time windows concurrently.
+        :param symbol: symbol to get orders from
+        :param start_time: start time of the orders
+        :param end_time: end time of the orders
+        :param window: milliseconds per window. Default and max 24 hours
+        :param concurrency: number of windows fetched at once
+        :param limit: page size. Default 1000; max 1000
+        """
+        fetch = partial(self.fetch_all_account_orders, symbol)
+        return self._paginate_windows(
+            fetch, "orderId", start_time, end_time, window, concurrency, limit
+        )
 
     async def fetch_latest_price(self, symbol: str) -> PriceTickerResponse:
         """
         Latest price for a symbol.
         """
         params: Params = dict(symbol=symbol)
-        return await self._send_request("GET", "/api/v3/ticker/price", params)
+        return await self._send_request("GET", "/api/v3/ticker/price", params, weight=2)
 
     async def fetch_latest_prices(self) -> list[PriceTickerResponse]:
         """
         Latest price for a symbol or symbols.
         """
-        return await self._send_request("GET", "/api/v3/ticker/price")
+        return await self._send_request("GET", "/api/v3/ticker/price", weight=4)
 
     async def fetch_order_book(
         self, symbol: str, limit: Optional[int] = None
@@ -178,7 +499,30 @@ class BinanceSpotClient(BaseApiClient):
         params: Params = dict(symbol=symbol)
         if limit:
             params["limit"] = str(limit)
-        return await self._send_request("GET", "/api/v3/depth", params)
+        return await self._send_request(
+            "GET", "/api/v3/depth", params, weight=self._order_book_weight(limit)
+        )
+
+    async def fetch_klines(
+        self,
+        symbol: str,
+        interval: KlineInterval,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500,
+    ) -> list[KlineResponse]:
+        """
+        Klines (candlesticks) of a symbol, identified by their open time.
+        :param start_time: open time of the first kline. Otherwise the most recent klines are returned
+        :param end_time: open time of the last kline
+        :param limit: Default 500; max 1000
+        """
+        params: Params = dict(symbol=symbol, interval=interval.value, limit=str(limit))
+        if start_time is not None:
+            params["startTime"] = str(start_time)
+        if end_time is not None:
+            params["endTime"] = str(end_time)
+        return await self._send_request("GET", "/api/v3/klines", params, weight=2)
 
     async def create_listen_key(self) -> str:
         """
@@ -0,0 +1,314 @@
+from typing import Any, Callable, Optional, Union
+
+
+class _Field:
+    """
+    Reads a raw field of an event, optionally nested in a "parent" object.
+    """
+
+    __slots__ = ("_key", "_parent")
+
+    def __init__(self, key: str, parent: Optional[str] = None) -> None:
+        self._key = key
+        self._parent = parent
+
+    def __get__(self, instance: Optional["Event"], owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        if self._parent:
+            return instance._data[self._parent][self._key]
+        return instance._data[self._key]
+
+
+class _NumberField:
+    """
+    Reads a numeric field of an event, converting it on first access and caching it in a slot.
+    """
+
+    __slots__ = ("_key", "_convert", "_parent", "_cache")
+
+    def __init__(
+        self,
+        key: str,
+        convert: Callable[[Any], Any] = float,
+        parent: Optional[str] = None,
+    ) -> None:
+        self._key = key
+        self._convert = convert
+        self._parent = parent
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # the slot "_<name>" of the owner class holds the converted value
+        self._cache = owner.__dict__[f"_{name}"]
+
+    def __get__(self, instance: Optional["Event"], owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return self._cache.__get__(instance)
+        except AttributeError:
+            data = instance._data[self._parent] if self._parent else instance._data
+            value = self._convert(data[self._key])
+            self._cache.__set__(instance, value)
+            return value
+
+
+class Event:
+    """
+    Base class of the typed websocket events. Wraps the decoded message and parses numbers lazily.
+    """
+
+    __slots__ = ("_data",)
+
+    event_type: str = ""
+
+    def __init__(self, data: dict) -> None:
+        self._data = data
+
+    @property
+    def raw(self) -> dict:
+        """
+        The message as decoded from json.
+        """
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data})"
+
+
+class ExecutionReportEvent(Event):
+    __slots__ = (
+        "_quantity",
+        "_price",
+        "_stop_price",
+        "_last_executed_quantity",
+        "_cumulative_filled_quantity",
+        "_last_executed_price",
+        "_commission",
+        "_cumulative_quote_quantity",
+    )
+
+    event_type = "executionReport"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    client_order_id = _Field("c")
+    orig_client_order_id = _Field("C")
+    side = _Field("S")
+    order_type = _Field("o")
+    time_in_force = _Field("f")
+    execution_type = _Field("x")
+    order_status = _Field("X")
+    reject_reason = _Field("r")
+    order_id = _Field("i")
+    commission_asset = _Field("N")
+    transaction_time = _Field("T")
+    trade_id = _Field("t")
+    is_maker = _Field("m")
+    quantity = _NumberField("q")
+    price = _NumberField("p")
+    stop_price = _NumberField("P")
+    last_executed_quantity = _NumberField("l")
+    cumulative_filled_quantity = _NumberField("z")
+    last_executed_price = _NumberField("L")
+    commission = _NumberField("n")
+    cumulative_quote_quantity = _NumberField("Z")
+
+
+class AccountBalance:
+    """
+    Balance of an asset in an outboundAccountPosition event.
+    """
+
+    __slots__ = ("asset", "_free", "_locked")
+
+    def __init__(self, asset: str, free: str, locked: str) -> None:
+        self.asset = asset
+        self._free = free
+        self._locked = locked
+
+    @property
+    def free(self) -> float:
+        return float(self._free)
+
+    @property
+    def locked(self) -> float:
+        return float(self._locked)
+
+    def __repr__(self) -> str:
+        return f"AccountBalance({self.asset}, free={self._free}, locked={self._locked})"
+
+
+class OutboundAccountPositionEvent(Event):
+    __slots__ = ("_balances",)
+
+    event_type = "outboundAccountPosition"
+
+    event_time = _Field("E")
+    last_update_time = _Field("u")
+    balances = _NumberField(
+        "B",
+        lambda balances: [
+            AccountBalance(balance["a"], balance["f"], balance["l"])
+            for balance in balances
+        ],
+    )
+
+
+class BalanceUpdateEvent(Event):
+    __slots__ = ("_delta",)
+
+    event_type = "balanceUpdate"
+
+    event_time = _Field("E")
+    asset = _Field("a")
+    clear_time = _Field("T")
+    delta = _NumberField("d")
+
+
+class TradeEvent(Event):
+    __slots__ = ("_price", "_quantity")
+
+    event_type = "trade"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    trade_id = _Field("t")
+    trade_time = _Field("T")
+    is_buyer_maker = _Field("m")
+    price = _NumberField("p")
+    quantity = _NumberField("q")
+
+
+class AggTradeEvent(Event):
+    __slots__ = ("_price", "_quantity")
+
+    event_type = "aggTrade"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    agg_trade_id = _Field("a")
+    first_trade_id = _Field("f")
+    last_trade_id = _Field("l")
+    trade_time = _Field("T")
+    is_buyer_maker = _Field("m")
+    price = _NumberField("p")
+    quantity = _NumberField("q")
+
+
+class KlineEvent(Event):
+    __slots__ = (
+        "_open",
+        "_high",
+        "_low",
+        "_close",
+        "_volume",
+        "_quote_volume",
+        "_taker_buy_volume",
+        "_taker_buy_quote_volume",
+    )
+
+    event_type = "kline"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    start_time = _Field("t", parent="k")
+    close_time = _Field("T", parent="k")
+    interval = _Field("i", parent="k")
+    first_trade_id = _Field("f", parent="k")
+    last_trade_id = _Field("L", parent="k")
+    trades = _Field("n", parent="k")
+    is_closed = _Field("x", parent="k")
+    open = _NumberField("o", parent="k")
+    high = _NumberField("h", parent="k")
+    low = _NumberField("l", parent="k")
+    close = _NumberField("c", parent="k")
+    volume = _NumberField("v", parent="k")
+    quote_volume = _NumberField("q", parent="k")
+    taker_buy_volume = _NumberField("V", parent="k")
+    taker_buy_quote_volume = _NumberField("Q", parent="k")
+
+
+class MiniTickerEvent(Event):
+    __slots__ = ("_open", "_high", "_low", "_close", "_volume", "_quote_volume")
+
+    event_type = "24hrMiniTicker"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    open = _NumberField("o")
+    high = _NumberField("h")
+    low = _NumberField("l")
+    close = _NumberField("c")
+    volume = _NumberField("v")
+    quote_volume = _NumberField("q")
+
+
+class DepthUpdateEvent(Event):
+    __slots__ = ()
+
+    event_type = "depthUpdate"
+
+    event_time = _Field("E")
+    symbol = _Field("s")
+    first_update_id = _Field("U")
+    final_update_id = _Field("u")
+    bids = _Field("b")  # [price, quantity] levels, kept as strings
+    asks = _Field("a")
+
+
+class PartialDepthEvent(Event):
+    __slots__ = ()
+
+    event_type = "partialDepth"  # not sent by the server: partial depth messages have no event type
+
+    last_update_id = _Field("lastUpdateId")
+    bids = _Field("bids")  # [price, quantity] levels, kept as strings
+    asks = _Field("asks")
+
+
+class BookTickerEvent(Event):
+    __slots__ = ("_bid_price", "_bid_quantity", "_ask_price", "_ask_quantity")
+
+    event_type = "bookTicker"
+
+    update_id = _Field("u")
+    symbol = _Field("s")
+    bid_price = _NumberField("b")
+    bid_quantity = _NumberField("B")
+    ask_price = _NumberField("a")
+    ask_quantity = _NumberField("A")
+
+
+# event classes by the "e" field of the messages
+EVENT_TYPES: dict[str, type[Event]] = {
+    event_class.event_type: event_class
+    for event_class in (
+        ExecutionReportEvent,
+        OutboundAccountPositionEvent,
+        BalanceUpdateEvent,
+        TradeEvent,
+        AggTradeEvent,
+        KlineEvent,
+        MiniTickerEvent,
+        DepthUpdateEvent,
+    )
+}
+
+
+def decode_event(message: dict) -> Union[Event, dict]:
+    """
+    Wraps a websocket message in its typed event class. Unknown messages are returned as they are.
+    Combined stream envelopes ({"stream": ..., "data": ...}) are unwrapped.
+    """
+    data = message["data"] if "stream" in message else message
+    event_class = EVENT_TYPES.get(data.get("e"))  # type: ignore
+    if event_class:
+        return event_class(data)
+
+    # book ticker and partial depth messages have no event type
+    if "A" in data and "u" in data:
+        return BookTickerEvent(data)
+    if "lastUpdateId" in data:
+        return PartialDepthEvent(data)
+    return message
@@ -0,0 +1,276 @@
+from asyncio import CancelledError, Lock, Task, create_task, get_running_loop, sleep
+from logging import getLogger
+from os import replace
+from pathlib import Path
+from time import time
+from typing import Any, Optional, Union
+from orjson import dumps, loads
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.order_validator import SymbolOrderValidator
+from binance_python.spot.typings import (
+    ExchangeInfoResponse,
+    PriceFilters,
+    SymbolInfoResponse,
+)
+
+
+logger = getLogger(__name__)
+
+# error code of the requests with an unknown symbol
+INVALID_SYMBOL_ERROR_CODE = -1121
+
+
+class ExchangeInfoCache:
+    """
+    Symbol indexed cache of the exchange information, refreshed in background and persisted to disk.
+    """
+
+    # maximum number of symbols requested at once, to keep the query string short
+    _BATCH_SIZE = 100
+
+    rate_limits: list[Any]
+
+    _binance_client: BinanceSpotClient
+    _ttl: float
+    _cache_path: Optional[Path]
+    _symbols: dict[str, SymbolInfoResponse]
+    _filters: dict[str, dict[str, PriceFilters]]
+    _updated_at: dict[str, float]
+    _validators: dict[str, SymbolOrderValidator]
+    _dirty: bool  # changes not persisted yet
+    _save_lock: Lock
+    _refresh_task: Optional[Task] = None
+
+    def __init__(
+        self,
+        binance_client: BinanceSpotClient,
+        ttl: float = 3600.0,
+        cache_path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        :param binance_client: client used to fetch the exchange information
+        :param ttl: seconds after which a symbol is refreshed
+        :param cache_path: file where the cache is persisted. Otherwise it is kept in memory only
+        """
+        self._binance_client = binance_client
+        self._ttl = ttl
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._symbols = {}
+        self._filters = {}
+        self._updated_at = {}
+        self._validators = {}
+        self._dirty = False
+        self._save_lock = Lock()
+        self.rate_limits = []
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    @property
+    def symbols(self) -> list[str]:
+        """
+        Symbols currently in the cache.
+        """
+        return list(self._symbols)
+
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfoResponse]:
+        """
+        Returns the cached information of a symbol, if any.
+        """
+        return self._symbols.get(symbol)
+
+    def symbol_filter(self, symbol: str, filter_type: str) -> Optional[PriceFilters]:
+        """
+        Returns a cached filter of a symbol by its "filterType", if any.
+        """
+        filters = self._filters.get(symbol)
+        return filters.get(filter_type) if filters else None
+
+    def order_validator(self, symbol: str) -> Optional[SymbolOrderValidator]:
+        """
+        Returns the order validator compiled from the cached filters of a symbol, if any.
+        """
+        validator = self._validators.get(symbol)
+        if not validator and symbol in self._symbols:
+            validator = self._validators[symbol] = SymbolOrderValidator(
+                self._symbols[symbol]
+            )
+        return validator
+
+    def is_stale(self, symbol: str) -> bool:
+        """
+        Checks if a symbol is missing or older than the ttl.
+        """
+        return time() - self._updated_at.get(symbol, 0.0) >= self._ttl
+
+    def _store(self, symbol_info: SymbolInfoResponse, updated_at: float) -> None:
+        """
+        Indexes the information of a symbol.
+        """
+        symbol = symbol_info["symbol"]
+        self._symbols[symbol] = symbol_info
+        self._filters[symbol] = {
+            symbol_filter["filterType"]: symbol_filter
+            for symbol_filter in symbol_info["filters"]
+        }
+        self._updated_at[symbol] = updated_at
+        self._validators.pop(symbol, None)
+        self._dirty = True
+
+    def _drop(self, symbol: str) -> None:
+        """
+        Removes a symbol from the cache.
+        """
+        self._symbols.pop(symbol, None)
+        self._filters.pop(symbol, None)
+        self._updated_at.pop(symbol, None)
+        self._validators.pop(symbol, None)
+        self._dirty = True
+
+    def _store_response(self, data: ExchangeInfoResponse) -> None:
+        """
+        Indexes all symbols of an exchange info response.
+        """
+        now = time()
+        for symbol_info in data["symbols"]:
+            self._store(symbol_info, now)
+        if data["rateLimits"]:
+            self.rate_limits = data["rateLimits"]
+            self._binance_client.rate_limiter.update_limits(self.rate_limits)
+
+    async def fetch(self, symbols: Optional[list[str]] = None) -> None:
+        """
+        Fetches and caches the information of some symbols, or of all symbols if none is given.
+        Only fetches of all symbols are persisted at once: others wait for the next refresh.
+        """
+        if symbols is None:
+            self._store_response(await self._binance_client.fetch_exchange_info())
+            await self.save()
+        else:
+            for index in range(0, len(symbols), self._BATCH_SIZE):
+                await self._fetch_batch(symbols[index : index + self._BATCH_SIZE])
+
+    async def _fetch_batch(self, symbols: list[str]) -> None:
+        """
+        Fetches and caches a batch of symbols. The server fails the whole batch when a symbol is invalid,
+        e.g. delisted, so the batch is split until the invalid symbols are found and dropped from the cache.
+        """
+        try:
+            self._store_response(
+                await self._binance_client.fetch_exchange_info(symbols)
+            )
+        except BinanceApiException as exc:
+            if exc.error_code != INVALID_SYMBOL_ERROR_CODE:
+                raise
+            if len(symbols) == 1:
+                logger.warning(f"dropping invalid symbol {symbols[0]} from the cache")
+                self._drop(symbols[0])
+                return
+            middle = len(symbols) // 2
+            await self._fetch_batch(symbols[:middle])
+            await self._fetch_batch(symbols[middle:])
+
+    async def get_symbol_info(self, symbol: str) -> SymbolInfoResponse:
+        """
+        Returns the information of a symbol, fetching it when it is missing or stale.
+        Raises BinanceApiException if the symbol is invalid.
+        """
+        if self.is_stale(symbol):
+            await self.fetch([symbol])
+        symbol_info = self._symbols.get(symbol)
+        if not symbol_info:
+            raise BinanceApiException(INVALID_SYMBOL_ERROR_CODE, "Invalid symbol.")
+        return symbol_info
+
+    async def refresh(self) -> None:
+        """
+        Fetches the cached symbols that are stale, and persists the changes of the cache.
+        """
+        stale = [symbol for symbol in self._symbols if self.is_stale(symbol)]
+        if stale:
+            logger.info(f"refreshing exchange info of {len(stale)} symbols")
+            await self.fetch(stale)
+        if self._dirty:
+            await self.save()
+
+    async def _refresh_loop(self, interval: float) -> None:
+        """
+        Periodically refreshes the stale symbols.
+        """
+        while True:
+            await sleep(interval)
+            try:
+                await self.refresh()
+            except CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"unable to refresh exchange info: {exc}")
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """
+        Starts refreshing the cache in background. By default, checks for stale symbols every ttl / 10 seconds.
+        """
+        if not self._refresh_task:
+            self._refresh_task = create_task(
+                self._refresh_loop(interval if interval else self._ttl / 10)
+            )
+
+    def stop(self) -> None:
+        """
+        Stops the background refresh.
+        """
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def load(self) -> bool:
+        """
+        Loads the cache persisted to disk. Returns True if it was loaded.
+        """
+        if not self._cache_path or not self._cache_path.exists():
+            return False
+        try:
+            data = loads(self._cache_path.read_bytes())
+            for entry in data["symbols"].values():
+                self._store(entry["info"], entry["updatedAt"])
+            self.rate_limits = data["rateLimits"]
+            if self.rate_limits:
+                self._binance_client.rate_limiter.update_limits(self.rate_limits)
+            self._dirty = False
+            return True
+        except Exception as exc:
+            logger.warning(f"unable to load exchange info cache: {exc}")
+            return False
+
+    async def save(self) -> None:
+        """
+        Persists the cache to disk, if a cache path was given. The file is written by an executor thread.
+        """
+        cache_path = self._cache_path
+        if not cache_path:
+            return
+        async with self._save_lock:
+            data = {
+                "rateLimits": self.rate_limits,
+                "symbols": {
+                    symbol: {"updatedAt": self._updated_at[symbol], "info": symbol_info}
+                    for symbol, symbol_info in self._symbols.items()
+                },
+            }
+            self._dirty = False
+            try:
+                await get_running_loop().run_in_executor(
+                    None, self._write, cache_path, dumps(data)
+                )
+            except Exception:
+                self._dirty = True
+                raise
+
+    @staticmethod
+    def _write(cache_path: Path, content: bytes) -> None:
+        # writes to a temporary file first, so a crash never leaves a partial cache
+        temp_path = cache_path.with_suffix(".tmp")
+        temp_path.write_bytes(content)
+        replace(temp_path, cache_path)
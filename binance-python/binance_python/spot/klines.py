@@ -0,0 +1,256 @@
+from asyncio import Semaphore, gather
+from logging import getLogger
+from os import makedirs, path
+from time import time
+from typing import Optional
+import numpy as np
+
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.enums import KlineInterval
+from binance_python.spot.typings import KlineResponse
+
+
+logger = getLogger(__name__)
+
+# milliseconds of each kline interval. Months are taken as 31 days: only used to split the downloads
+INTERVAL_MILLISECONDS: dict[KlineInterval, int] = {
+    KlineInterval.SECOND_1: 1000,
+    KlineInterval.MINUTE_1: 60_000,
+    KlineInterval.MINUTE_3: 3 * 60_000,
+    KlineInterval.MINUTE_5: 5 * 60_000,
+    KlineInterval.MINUTE_15: 15 * 60_000,
+    KlineInterval.MINUTE_30: 30 * 60_000,
+    KlineInterval.HOUR_1: 3_600_000,
+    KlineInterval.HOUR_2: 2 * 3_600_000,
+    KlineInterval.HOUR_4: 4 * 3_600_000,
+    KlineInterval.HOUR_6: 6 * 3_600_000,
+    KlineInterval.HOUR_8: 8 * 3_600_000,
+    KlineInterval.HOUR_12: 12 * 3_600_000,
+    KlineInterval.DAY_1: 86_400_000,
+    KlineInterval.DAY_3: 3 * 86_400_000,
+    KlineInterval.WEEK_1: 7 * 86_400_000,
+    KlineInterval.MONTH_1: 31 * 86_400_000,
+}
+
+# stored fields of the klines, by their position in the responses
+KLINE_FIELDS: dict[str, tuple[int, type]] = {
+    "open_time": (0, np.int64),
+    "open": (1, np.float64),
+    "high": (2, np.float64),
+    "low": (3, np.float64),
+    "close": (4, np.float64),
+    "volume": (5, np.float64),
+    "close_time": (6, np.int64),
+    "quote_volume": (7, np.float64),
+    "trades": (8, np.int64),
+    "taker_buy_volume": (9, np.float64),
+    "taker_buy_quote_volume": (10, np.float64),
+}
+
+# klines returned by each request
+MAX_KLINES_PER_REQUEST = 1000
+
+
+class KlineStore:
+    """
+    Columnar on-disk store of klines: one raw binary file per field, per symbol and interval,
+    appended in open time order and read back as memory-mapped NumPy arrays.
+    """
+
+    _path: str
+
+    def __init__(self, store_path: str) -> None:
+        """
+        :param store_path: directory of the store, created if needed
+        """
+        self._path = store_path
+
+    def _directory(self, symbol: str, interval: KlineInterval) -> str:
+        return path.join(self._path, symbol, interval.value)
+
+    def _file(self, symbol: str, interval: KlineInterval, field: str) -> str:
+        return path.join(self._directory(symbol, interval), f"{field}.bin")
+
+    def count(self, symbol: str, interval: KlineInterval) -> int:
+        """
+        Returns the number of stored klines. Fields left longer by an interrupted append are ignored.
+        """
+        counts = []
+        for field, (_, dtype) in KLINE_FIELDS.items():
+            file = self._file(symbol, interval, field)
+            size = path.getsize(file) if path.exists(file) else 0
+            counts.append(size // np.dtype(dtype).itemsize)
+        return min(counts)
+
+    def read(
+        self,
+        symbol: str,
+        interval: KlineInterval,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Returns the klines opened between start_time and end_time (inclusive) as memory-mapped arrays by field.
+        """
+        count = self.count(symbol, interval)
+        if not count:
+            return {
+                field: np.empty(0, dtype) for field, (_, dtype) in KLINE_FIELDS.items()
+            }
+
+        columns = {
+            field: np.memmap(
+                self._file(symbol, interval, field), dtype, mode="r", shape=(count,)
+            )
+            for field, (_, dtype) in KLINE_FIELDS.items()
+        }
+
+        # open times are sorted: the range is found by binary search
+        open_times = columns["open_time"]
+        first = 0 if start_time is None else open_times.searchsorted(start_time)
+        last = (
+            count
+            if end_time is None
+            else open_times.searchsorted(end_time, side="right")
+        )
+        return {field: column[first:last] for field, column in columns.items()}
+
+    def last_open_time(self, symbol: str, interval: KlineInterval) -> Optional[int]:
+        """
+        Returns the open time of the last stored kline, if any.
+        """
+        count = self.count(symbol, interval)
+        if not count:
+            return None
+        open_times = np.memmap(
+            self._file(symbol, interval, "open_time"),
+            np.int64,
+            mode="r",
+            shape=(count,),
+        )
+        return int(open_times[-1])
+
+    def append(
+        self, symbol: str, interval: KlineInterval, klines: list[KlineResponse]
+    ) -> int:
+        """
+        Appends klines sorted by open time. Klines not newer than the last stored one are skipped.
+        :return: number of klines appended
+        """
+        last_open_time = self.last_open_time(symbol, interval)
+        if last_open_time is not None:
+            klines = [kline for kline in klines if kline[0] > last_open_time]
+        if not klines:
+            return 0
+
+        makedirs(self._directory(symbol, interval), exist_ok=True)
+        count = self.count(symbol, interval)
+        for field, (index, dtype) in KLINE_FIELDS.items():
+            column = np.array([kline[index] for kline in klines], dtype=dtype)
+            with open(self._file(symbol, interval, field), "ab") as file:
+                # drops the leftovers of an interrupted append
+                file.truncate(count * column.itemsize)
+                column.tofile(file)
+        return len(klines)
+
+
+class KlineDownloader:
+    """
+    Downloads the kline history of many symbols concurrently into a KlineStore,
+    resuming from the last stored kline of each symbol.
+    """
+
+    _binance_client: BinanceSpotClient
+    _store: KlineStore
+    _max_in_flight: int
+    _semaphore: Semaphore
+
+    def __init__(
+        self,
+        binance_client: BinanceSpotClient,
+        store: KlineStore,
+        max_in_flight: int = 10,
+    ) -> None:
+        """
+        :param binance_client: client used to fetch the klines. Its rate limiter keeps the requests within the weight budget
+        :param store: store of the klines
+        :param max_in_flight: maximum number of concurrent requests, across all symbols
+        """
+        self._binance_client = binance_client
+        self._store = store
+        self._max_in_flight = max_in_flight
+        self._semaphore = Semaphore(max_in_flight)
+
+    async def _fetch_chunk(
+        self, symbol: str, interval: KlineInterval, start_time: int, end_time: int
+    ) -> list[KlineResponse]:
+        async with self._semaphore:
+            return await self._binance_client.fetch_klines(
+                symbol, interval, start_time, end_time, MAX_KLINES_PER_REQUEST
+            )
+
+    async def download_symbol(
+        self,
+        symbol: str,
+        interval: KlineInterval,
+        start_time: int,
+        end_time: Optional[int] = None,
+    ) -> int:
+        """
+        Downloads the klines of a symbol opened from start_time, or from the last stored kline, to end_time.
+        Only closed klines are stored.
+        :param end_time: open time of the last kline. Default: now
+        :return: number of klines stored
+        """
+        interval_ms = INTERVAL_MILLISECONDS[interval]
+        now = int(time() * 1000)
+        end_time = min(end_time if end_time is not None else now, now - interval_ms)
+        last_open_time = self._store.last_open_time(symbol, interval)
+        if last_open_time is not None:
+            start_time = max(start_time, last_open_time + 1)
+
+        # splits the range in chunks of one request each
+        chunk_ms = interval_ms * MAX_KLINES_PER_REQUEST
+        chunks = [
+            (chunk_start, min(chunk_start + chunk_ms - 1, end_time))
+            for chunk_start in range(start_time, end_time + 1, chunk_ms)
+        ]
+
+        # fetches the chunks concurrently, appending them in order
+        stored = 0
+        for index in range(0, len(chunks), self._max_in_flight):
+            results = await gather(
+                *[
+                    self._fetch_chunk(symbol, interval, chunk_start, chunk_end)
+                    for chunk_start, chunk_end in chunks[
+                        index : index + self._max_in_flight
+                    ]
+                ]
+            )
+            for klines in results:
+                # the last kline may still be open
+                stored += self._store.append(
+                    symbol, interval, [kline for kline in klines if kline[6] < now]
+                )
+
+        logger.info(f"stored {stored} {symbol} {interval.value} klines")
+        return stored
+
+    async def download(
+        self,
+        symbols: list[str],
+        interval: KlineInterval,
+        start_time: int,
+        end_time: Optional[int] = None,
+    ) -> dict[str, int]:
+        """
+        Downloads the klines of many symbols concurrently.
+        :return: number of klines stored by symbol
+        """
+        stored = await gather(
+            *[
+                self.download_symbol(symbol, interval, start_time, end_time)
+                for symbol in symbols
+            ]
+        )
+        return dict(zip(symbols, stored))
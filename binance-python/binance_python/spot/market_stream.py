@@ -0,0 +1,180 @@
+from logging import getLogger
+from typing import AsyncIterator, Callable, Optional, Union
+
+from binance_python.base_ws_client import BaseWebsocketClient, STREAM_GAP_EVENT
+from binance_python.metrics import MetricsHooks
+from binance_python.spot.enums import KlineInterval
+from binance_python.spot.events import Event, decode_event
+
+
+logger = getLogger(__name__)
+
+# decoded payload of a market stream: an event, a list of events for "!...@arr" streams, or an unknown dict
+MarketEvent = Union[Event, list, dict]
+
+# handlers receive the stream name and the decoded payload, shared by all handlers of the stream
+Handler = Callable[[str, MarketEvent], None]
+
+
+class BinanceMarketStream(BaseWebsocketClient):
+    """
+    Market data streams over a combined stream connection, dispatching each message to the handlers of its stream.
+    """
+
+    _handlers: dict[str, tuple[Handler, ...]]
+
+    def __init__(
+        self,
+        testnet: bool = False,
+        metrics: Optional[MetricsHooks] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param metrics: receives the stream and event time of each message
+        :param base_url: url of the websocket server, e.g. a FakeBinanceServer. Overrides "testnet"
+        """
+        super().__init__(logger, testnet, metrics=metrics, base_url=base_url)
+        self._handlers = {}
+
+    def add_handler(self, stream: str, handler: Handler) -> None:
+        """
+        Registers a handler for the messages of a stream. Use STREAM_GAP_EVENT to be told about disconnections.
+        """
+        self._handlers[stream] = self._handlers.get(stream, ()) + (handler,)
+
+    def remove_handler(self, stream: str, handler: Handler) -> None:
+        """
+        Unregisters a handler of a stream.
+        """
+        handlers = tuple(
+            item for item in self._handlers.get(stream, ()) if item is not handler
+        )
+        if handlers:
+            self._handlers[stream] = handlers
+        else:
+            self._handlers.pop(stream, None)
+
+    def _subscribe_stream(self, stream: str, handler: Optional[Handler]) -> str:
+        """
+        Subscribes to a stream, registering its handler. Returns the stream name.
+        """
+        if handler:
+            self.add_handler(stream, handler)
+        self.subscribe([stream])
+        return stream
+
+    def subscribe_trades(self, symbol: str, handler: Optional[Handler] = None) -> str:
+        """
+        Subscribes to the trades of a symbol.
+        """
+        return self._subscribe_stream(f"{symbol.lower()}@trade", handler)
+
+    def subscribe_agg_trades(
+        self, symbol: str, handler: Optional[Handler] = None
+    ) -> str:
+        """
+        Subscribes to the aggregated trades of a symbol.
+        """
+        return self._subscribe_stream(f"{symbol.lower()}@aggTrade", handler)
+
+    def subscribe_klines(
+        self, symbol: str, interval: KlineInterval, handler: Optional[Handler] = None
+    ) -> str:
+        """
+        Subscribes to the klines of a symbol.
+        """
+        return self._subscribe_stream(
+            f"{symbol.lower()}@kline_{interval.value}", handler
+        )
+
+    def subscribe_depth(
+        self,
+        symbol: str,
+        levels: Optional[int] = None,
+        update_speed: int = 1000,
+        handler: Optional[Handler] = None,
+    ) -> str:
+        """
+        Subscribes to the order book of a symbol.
+        :param levels: 5, 10 or 20 for partial book snapshots. Default: diff. depth updates
+        :param update_speed: update interval in milliseconds: 1000 or 100
+        """
+        stream = f"{symbol.lower()}@depth{levels or ''}"
+        if update_speed != 1000:
+            stream += f"@{update_speed}ms"
+        return self._subscribe_stream(stream, handler)
+
+    def subscribe_book_ticker(
+        self, symbol: str, handler: Optional[Handler] = None
+    ) -> str:
+        """
+        Subscribes to the best bid and ask of a symbol.
+        """
+        return self._subscribe_stream(f"{symbol.lower()}@bookTicker", handler)
+
+    def subscribe_mini_ticker(
+        self, symbol: Optional[str] = None, handler: Optional[Handler] = None
+    ) -> str:
+        """
+        Subscribes to the 24h mini ticker of a symbol, or of all symbols as a list of events when not given.
+        """
+        stream = f"{symbol.lower()}@miniTicker" if symbol else "!miniTicker@arr"
+        return self._subscribe_stream(stream, handler)
+
+    def unsubscribe_stream(self, stream: str) -> None:
+        """
+        Unsubscribes from a stream, removing its handlers.
+        """
+        self._handlers.pop(stream, None)
+        self.unsubscribe([stream])
+
+    @staticmethod
+    def _decode(message: dict) -> tuple[str, MarketEvent]:
+        """
+        Unwraps a combined stream message into its stream name and decoded payload.
+        """
+        # messages without envelope are stream gaps
+        if "stream" not in message:
+            return STREAM_GAP_EVENT, message
+
+        data = message["data"]
+        if isinstance(data, list):
+            return message["stream"], [decode_event(item) for item in data]
+        return message["stream"], decode_event(data)
+
+    def _dispatch(self, stream: str, event: MarketEvent) -> None:
+        """
+        Calls the handlers of a stream. A failing handler does not prevent the others from running.
+        """
+        for handler in self._handlers.get(stream, ()):
+            try:
+                handler(stream, event)
+            except Exception as exc:
+                logger.error(f"{stream} handler failed: {exc}")
+
+    async def stream(self) -> AsyncIterator[tuple[str, MarketEvent]]:
+        """
+        Provides (stream name, event) pairs, after dispatching them to the registered handlers.
+        """
+        async for message in self._stream(raw_stream=False):
+            stream, event = self._decode(message)
+            self._dispatch(stream, event)
+            yield stream, event
+
+    async def conflated_stream(self) -> AsyncIterator[dict[str, MarketEvent]]:
+        """
+        Provides batches with the latest event of each stream, after dispatching them to the registered handlers.
+        Intermediate events are discarded when the consumer is slower than the streams.
+        """
+        async for messages in self._conflated_stream(raw_stream=False):
+            batch = dict(map(self._decode, messages))
+            for stream, event in batch.items():
+                self._dispatch(stream, event)
+            yield batch
+
+    async def run(self) -> None:
+        """
+        Dispatches the messages to the registered handlers until cancelled.
+        """
+        async for _ in self.stream():
+            pass
@@ -0,0 +1,300 @@
+from asyncio import Task, create_task
+from bisect import bisect_left, bisect_right
+from collections import deque
+from logging import getLogger
+from time import monotonic
+from typing import AsyncIterator, Optional, Sequence
+
+from binance_python.base_ws_client import BaseWebsocketClient, STREAM_GAP_EVENT
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.typings import OrderBookResponse
+
+
+logger = getLogger(__name__)
+
+
+class OrderBookSide:
+    """
+    Price levels of one side of the order book, kept sorted in arrays from the best price to the worst.
+    Cumulative quantities are cached from the best price, and recomputed lazily from the first changed level:
+    updates near the top of the book only invalidate the few levels above them.
+    """
+
+    _descending: bool
+    _keys: list[float]
+    _quantities: list[float]
+    _cumulative: list[float]
+
+    def __init__(self, descending: bool) -> None:
+        self._descending = descending
+        self._keys = []  # ascending sort keys: negated prices for the descending side
+        self._quantities = []
+        self._cumulative = (
+            []
+        )  # cumulative quantities of the first levels, valid up to its length
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, price: float) -> float:
+        return -price if self._descending else price
+
+    def _price(self, key: float) -> float:
+        return -key if self._descending else key
+
+    def clear(self) -> None:
+        """
+        Removes all price levels.
+        """
+        self._keys.clear()
+        self._quantities.clear()
+        self._cumulative.clear()
+
+    def load(self, levels: list[list[str]]) -> None:
+        """
+        Replaces all price levels with the [price, quantity] levels of a snapshot.
+        """
+        pairs = sorted(
+            (self._key(float(price)), float(quantity))
+            for price, quantity in levels
+            if float(quantity)
+        )
+        self._keys = [key for key, _ in pairs]
+        self._quantities = [quantity for _, quantity in pairs]
+        self._cumulative = []
+
+    def update(self, price: str, quantity: str) -> None:
+        """
+        Sets the quantity of a price level. A zero quantity removes the level.
+        """
+        key = self._key(float(price))
+        amount = float(quantity)
+        index = bisect_left(self._keys, key)
+        exists = index < len(self._keys) and self._keys[index] == key
+        if exists or amount:
+            del self._cumulative[index:]
+
+        if amount:
+            if exists:
+                self._quantities[index] = amount
+            else:
+                self._keys.insert(index, key)
+                self._quantities.insert(index, amount)
+        elif exists:
+            del self._keys[index]
+            del self._quantities[index]
+
+    def best(self) -> Optional[tuple[float, float]]:
+        """
+        Returns the best (price, quantity) level, if any.
+        """
+        if not self._keys:
+            return None
+        return self._price(self._keys[0]), self._quantities[0]
+
+    def top(self, count: int) -> list[tuple[float, float]]:
+        """
+        Returns the "count" best (price, quantity) levels.
+        """
+        return [
+            (self._price(key), quantity)
+            for key, quantity in zip(self._keys[:count], self._quantities[:count])
+        ]
+
+    def quantity_at(self, price: float) -> float:
+        """
+        Returns the quantity at a given price level.
+        """
+        key = self._key(price)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._quantities[index]
+        return 0.0
+
+    def depth_to_price(self, price: float) -> float:
+        """
+        Returns the cumulative quantity of all levels from the best price up to "price" (inclusive).
+        Costs O(log n) when the levels up to "price" did not change since the previous query.
+        """
+        count = bisect_right(self._keys, self._key(price))
+        cumulative = self._cumulative
+        # extends the cached sums from the first level changed since they were computed
+        total = cumulative[-1] if cumulative else 0.0
+        for quantity in self._quantities[len(cumulative) : count]:
+            total += quantity
+            cumulative.append(total)
+        return cumulative[count - 1] if count else 0.0
+
+
+class LocalOrderBook(BaseWebsocketClient):
+    """
+    Order book of a symbol kept up to date from the diff. depth stream.
+    """
+
+    symbol: str
+    bids: OrderBookSide
+    asks: OrderBookSide
+    last_update_id: int
+    synced: bool
+
+    _binance_client: BinanceSpotClient
+    _snapshot_limit: int
+    _max_buffered_events: int
+
+    def __init__(
+        self,
+        binance_client: BinanceSpotClient,
+        symbol: str,
+        snapshot_limit: int = 1000,
+        base_url: Optional[str] = None,
+        max_buffered_events: int = 10000,
+    ) -> None:
+        """
+        :param binance_client: client used to fetch the order book snapshots
+        :param symbol: symbol of the order book
+        :param snapshot_limit: depth of the snapshots. Default 1000; max 5000
+        :param base_url: url of the websocket server. Overrides the testnet setting of the client
+        :param max_buffered_events: events kept while waiting for a snapshot. The oldest ones are dropped first
+        """
+        super().__init__(
+            logger,
+            binance_client.testnet,
+            metrics=binance_client.metrics,
+            base_url=base_url,
+        )
+        self._binance_client = binance_client
+        self._snapshot_limit = snapshot_limit
+        self._max_buffered_events = max_buffered_events
+        self._subscriptions = {f"{symbol.lower()}@depth@100ms"}
+        self.symbol = symbol
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide(descending=False)
+        self.last_update_id = 0
+        self.synced = False
+
+    def best_bid(self) -> Optional[tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[tuple[float, float]]:
+        return self.asks.best()
+
+    def _reset(self) -> None:
+        """
+        Drops the local book state until a new snapshot is loaded.
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+        self.synced = False
+
+    def _load_snapshot(self, snapshot: OrderBookResponse) -> None:
+        """
+        Seeds the book from a REST snapshot.
+        """
+        self.bids.load(snapshot["bids"])
+        self.asks.load(snapshot["asks"])
+        self.last_update_id = snapshot["lastUpdateId"]
+        self.synced = True
+
+    def _apply_event(self, event: dict) -> bool:
+        """
+        Applies a depth update event. Returns True if the book changed.
+        When a gap in the update ids is detected the book is reset and needs a new snapshot.
+        """
+        # ignores events already contained in the book
+        if event["u"] <= self.last_update_id:
+            return False
+
+        # there are missing events between the book and this event
+        if event["U"] > self.last_update_id + 1:
+            logger.warning(
+                f"{self.symbol} order book gap: expected update {self.last_update_id + 1}, got {event['U']}"
+            )
+            self._reset()
+            return False
+
+        for price, quantity in event["b"]:
+            self.bids.update(price, quantity)
+        for price, quantity in event["a"]:
+            self.asks.update(price, quantity)
+        self.last_update_id = event["u"]
+        return True
+
+    def _apply_buffer(self, buffer: Sequence[dict]) -> bool:
+        """
+        Applies buffered events over a freshly loaded snapshot. Returns False if the snapshot is too old.
+        """
+        if buffer and buffer[0]["U"] > self.last_update_id + 1:
+            self._reset()
+            return False
+        for event in buffer:
+            self._apply_event(event)
+        return self.synced
+
+    async def stream(self) -> AsyncIterator["LocalOrderBook"]:
+        """
+        Provides the order book as a stream, yielding it every time it is updated.
+        """
+        # the oldest events are the first ones covered by the next snapshot
+        buffer: deque[dict] = deque(maxlen=self._max_buffered_events)
+        snapshot_task: Optional[Task] = None
+        # failed snapshots are retried with backoff
+        attempt = 0
+        retry_at = 0.0
+
+        try:
+            # handles incoming data
+            async for event in self._stream(raw_stream=True):
+                event_type = event.get("e")
+
+                # events were missed while reconnecting: the book must be synced again
+                if event_type == STREAM_GAP_EVENT:
+                    self._reset()
+                    buffer.clear()
+                    if snapshot_task:
+                        snapshot_task.cancel()
+                        snapshot_task = None
+                    continue
+
+                if event_type != "depthUpdate":
+                    continue
+
+                # applies live events over a synced book
+                if self.synced:
+                    if self._apply_event(event):
+                        yield self
+                    continue
+
+                # buffers the events while the snapshot is being fetched
+                buffer.append(event)
+                if snapshot_task is None:
+                    if monotonic() < retry_at:
+                        continue
+                    logger.info(f"fetching {self.symbol} order book snapshot")
+                    snapshot_task = create_task(
+                        self._binance_client.fetch_order_book(
+                            self.symbol, self._snapshot_limit
+                        )
+                    )
+                if not snapshot_task.done():
+                    continue
+
+                # loads the snapshot and the buffered events
+                try:
+                    self._load_snapshot(snapshot_task.result())
+                    synced = self._apply_buffer(buffer)
+                    attempt = 0
+                except Exception as exc:
+                    logger.error(f"unable to fetch {self.symbol} order book: {exc}")
+                    synced = False
+                    retry_at = monotonic() + self._backoff(attempt)
+                    attempt += 1
+                snapshot_task = None
+                if synced:
+                    buffer.clear()
+                    yield self
+
+        finally:
+            # handles the end of the stream
+            if snapshot_task:
+                snapshot_task.cancel()
@@ -0,0 +1,227 @@
+from asyncio import Future, TimeoutError, get_running_loop, shield, wait_for
+from logging import getLogger
+from typing import Optional, Union
+from uuid import uuid4
+
+from binance_python.base_api_client import BinanceApiException, Number
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.enums import (
+    OrderResponseType,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    TimeInForce,
+)
+from binance_python.spot.events import Event, ExecutionReportEvent
+from binance_python.spot.typings import NewOrderResponse, QueryOrderResponse
+
+
+logger = getLogger(__name__)
+
+# order statuses after which the order does not change anymore
+FINAL_ORDER_STATUSES = frozenset(
+    (
+        OrderStatus.FILLED.value,
+        OrderStatus.CANCELED.value,
+        OrderStatus.REJECTED.value,
+        OrderStatus.EXPIRED.value,
+    )
+)
+
+# error code of the orders rejected by the exchange
+NEW_ORDER_REJECTED_ERROR_CODE = -2010
+
+
+class OrderHandle:
+    """
+    Lifecycle of a placed order, resolved from the execution reports of the user data stream.
+    """
+
+    symbol: str
+    client_order_id: str
+    order_id: Optional[int]
+    status: Optional[str]
+    executed_quantity: float
+
+    # resolved with the order id when the order is accepted by the exchange, failed when it is rejected
+    accepted: Future
+    # resolved with True when the order is fully filled, False when it ends otherwise
+    filled: Future
+    # resolved with the final order status
+    done: Future
+
+    def __init__(self, symbol: str, client_order_id: str) -> None:
+        loop = get_running_loop()
+        self.symbol = symbol
+        self.client_order_id = client_order_id
+        self.order_id = None
+        self.status = None
+        self.executed_quantity = 0.0
+        self.accepted = loop.create_future()
+        # rejections are also reported by "done": callers may ignore "accepted"
+        self.accepted.add_done_callback(
+            lambda done: done.cancelled() or done.exception()
+        )
+        self.filled = loop.create_future()
+        self.done = loop.create_future()
+
+    def update(
+        self,
+        order_id: int,
+        status: str,
+        executed_quantity: float,
+        reject_reason: Optional[str] = None,
+    ) -> None:
+        """
+        Updates the order state, resolving the futures reached by it. Final states are never changed.
+        """
+        if self.done.done():
+            return
+        self.order_id = order_id
+        self.status = status
+        self.executed_quantity = max(self.executed_quantity, executed_quantity)
+
+        if not self.accepted.done():
+            if status == OrderStatus.REJECTED.value:
+                self.accepted.set_exception(
+                    BinanceApiException(
+                        NEW_ORDER_REJECTED_ERROR_CODE,
+                        f"order {self.client_order_id} rejected: {reject_reason}",
+                    )
+                )
+            else:
+                self.accepted.set_result(order_id)
+
+        if status in FINAL_ORDER_STATUSES:
+            self.filled.set_result(status == OrderStatus.FILLED.value)
+            self.done.set_result(status)
+
+    def __repr__(self) -> str:
+        return f"OrderHandle({self.symbol} {self.client_order_id}, {self.status}, executed={self.executed_quantity})"
+
+
+class OrderTracker:
+    """
+    Places orders and tracks them through the execution reports of the user data stream,
+    instead of polling their status. REST is only queried when no report arrives in time.
+    """
+
+    _binance_client: BinanceSpotClient
+    _handles: dict[str, OrderHandle]
+
+    def __init__(self, binance_client: BinanceSpotClient) -> None:
+        """
+        :param binance_client: client used to place the orders and to query them on timeouts
+        """
+        self._binance_client = binance_client
+        self._handles = {}
+
+    def apply(self, event: Union[Event, dict]) -> None:
+        """
+        Updates the handle of an execution report. Feed it with the events of the user data stream.
+        """
+        if not isinstance(event, ExecutionReportEvent):
+            return
+
+        # cancellations report the id of the cancel request, and the original one apart
+        handle = self._handles.get(event.orig_client_order_id or event.client_order_id)
+        if handle:
+            self._update(
+                handle,
+                event.order_id,
+                event.order_status,
+                event.cumulative_filled_quantity,
+                event.reject_reason,
+            )
+
+    def _update(
+        self,
+        handle: OrderHandle,
+        order_id: int,
+        status: str,
+        executed_quantity: float,
+        reject_reason: Optional[str] = None,
+    ) -> None:
+        handle.update(order_id, status, executed_quantity, reject_reason)
+        if handle.done.done():
+            self._handles.pop(handle.client_order_id, None)
+
+    async def place_order(
+        self,
+        symbol: str,
+        order_side: OrderSide,
+        order_type: OrderType,
+        amount: Optional[Number] = None,
+        price: Optional[Number] = None,
+        time_in_force: Optional[TimeInForce] = None,
+        stop_price: Optional[Number] = None,
+        recv_window: Optional[int] = None,
+        response_type: OrderResponseType = OrderResponseType.ACK,
+    ) -> OrderHandle:
+        """
+        Sends in a new order, returning its handle once the order is accepted.
+        :param response_type: RESULT or FULL resolve the handle from the response when the order is done at once
+        """
+        # registers the handle first: the execution report may arrive before the response
+        handle = OrderHandle(symbol, uuid4().hex)
+        self._handles[handle.client_order_id] = handle
+
+        try:
+            response: NewOrderResponse = await self._binance_client.place_order(
+                symbol,
+                order_side,
+                order_type,
+                amount,
+                price,
+                time_in_force,
+                stop_price,
+                recv_window=recv_window,
+                response_type=response_type,
+                client_order_id=handle.client_order_id,
+            )
+        except Exception:
+            del self._handles[handle.client_order_id]
+            raise
+
+        if "status" in response:
+            self._update(
+                handle,
+                response["orderId"],
+                response["status"],  # type: ignore
+                float(response["executedQty"]),  # type: ignore
+            )
+        elif not handle.accepted.done():
+            handle.order_id = response["orderId"]
+            handle.accepted.set_result(response["orderId"])
+        return handle
+
+    async def wait(self, handle: OrderHandle, timeout: float = 10.0) -> str:
+        """
+        Waits until an order is done, querying its status over REST whenever no report arrives in time.
+        Failed queries are retried at the next timeout.
+        :param timeout: seconds to wait for execution reports before querying the order status
+        :return: the final order status
+        """
+        while True:
+            try:
+                return await wait_for(shield(handle.done), timeout)
+            except TimeoutError:
+                logger.warning(
+                    f"no execution report for order {handle.client_order_id} in {timeout}s, querying its status"
+                )
+
+            try:
+                order: QueryOrderResponse = await self._binance_client.fetch_order_status(
+                    handle.symbol, handle.order_id  # type: ignore
+                )
+            except Exception as exc:
+                logger.warning(
+                    f"unable to query the status of order {handle.client_order_id}: {exc}"
+                )
+            else:
+                self._update(
+                    handle,
+                    order["orderId"],
+                    order["status"],
+                    float(order["executedQty"]),
+                )
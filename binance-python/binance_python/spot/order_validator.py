@@ -0,0 +1,322 @@
+from decimal import Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_EVEN
+from typing import Optional, Sequence
+import numpy as np
+
+from binance_python.base_api_client import BinanceApiException, Number, to_decimal
+from binance_python.spot.enums import OrderSide, OrderType
+from binance_python.spot.typings import SymbolInfoResponse
+
+
+FILTER_FAILURE_ERROR_CODE = -1013
+
+
+class OrderValidationError(BinanceApiException):
+    """
+    Raised when an order violates a symbol filter. Mirrors the server "Filter failure" error.
+    """
+
+    def __init__(self, filter_type: str, detail: str) -> None:
+        self.filter_type = filter_type
+        super().__init__(
+            FILTER_FAILURE_ERROR_CODE, f"Filter failure: {filter_type} ({detail})"
+        )
+
+
+class _Grid:
+    """
+    Range and increment of a price or quantity, compiled from a filter.
+    """
+
+    minimum: Decimal
+    maximum: Decimal
+    step: Decimal
+
+    def __init__(self, minimum: str, maximum: str, step: str) -> None:
+        # zero values mean the check is disabled
+        self.minimum = Decimal(minimum)
+        self.maximum = Decimal(maximum)
+        self.step = Decimal(step)
+
+    def quantize(self, value: Decimal, rounding: str) -> Decimal:
+        """
+        Rounds a value to a multiple of the step.
+        """
+        if not self.step:
+            return value
+        return (value / self.step).to_integral_value(rounding) * self.step
+
+    def check(self, filter_type: str, value: Decimal) -> None:
+        """
+        Checks that a value is in range and on the step grid.
+        """
+        if value < self.minimum:
+            raise OrderValidationError(filter_type, f"{value} < {self.minimum}")
+        if self.maximum and value > self.maximum:
+            raise OrderValidationError(filter_type, f"{value} > {self.maximum}")
+        if self.step and (value - self.minimum) % self.step:
+            raise OrderValidationError(
+                filter_type, f"{value} is not a multiple of {self.step}"
+            )
+
+
+class OrderBatch:
+    """
+    Result of the validation of a batch of orders, with prices and quantities as integer tick / step counts.
+    """
+
+    price_ticks: np.ndarray
+    quantity_steps: np.ndarray
+    valid: np.ndarray
+    failed_filter: np.ndarray
+
+    _validator: "SymbolOrderValidator"
+
+    def __init__(
+        self,
+        validator: "SymbolOrderValidator",
+        price_ticks: np.ndarray,
+        quantity_steps: np.ndarray,
+        failed_filter: np.ndarray,
+    ) -> None:
+        self._validator = validator
+        self.price_ticks = price_ticks
+        self.quantity_steps = quantity_steps
+        self.failed_filter = failed_filter
+        self.valid = failed_filter == ""
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def price(self, index: int) -> Decimal:
+        """
+        Returns the exact quantized price of an order.
+        """
+        return int(self.price_ticks[index]) * self._validator.price_step
+
+    def quantity(self, index: int) -> Decimal:
+        """
+        Returns the exact quantized quantity of an order.
+        """
+        return int(self.quantity_steps[index]) * self._validator.quantity_step
+
+
+class SymbolOrderValidator:
+    """
+    Pre-trade validator compiled from the filters of a symbol. Quantizes and checks orders locally,
+    saving the round trip and order count of orders the server would reject.
+    """
+
+    symbol: str
+    price_step: Decimal
+    quantity_step: Decimal
+
+    _price: Optional[_Grid] = None
+    _lot_size: Optional[_Grid] = None
+    _market_lot_size: Optional[_Grid] = None
+    _min_notional: Optional[Decimal] = None
+    _min_notional_market: bool = False
+    _bid_multipliers: Optional[tuple[Decimal, Decimal]] = None
+    _ask_multipliers: Optional[tuple[Decimal, Decimal]] = None
+
+    def __init__(self, symbol_info: SymbolInfoResponse) -> None:
+        self.symbol = symbol_info["symbol"]
+        for symbol_filter in symbol_info["filters"]:
+            data: dict = symbol_filter  # type: ignore
+            match data["filterType"]:
+                case "PRICE_FILTER":
+                    self._price = _Grid(
+                        data["minPrice"], data["maxPrice"], data["tickSize"]
+                    )
+                case "LOT_SIZE":
+                    self._lot_size = _Grid(
+                        data["minQty"], data["maxQty"], data["stepSize"]
+                    )
+                case "MARKET_LOT_SIZE":
+                    self._market_lot_size = _Grid(
+                        data["minQty"], data["maxQty"], data["stepSize"]
+                    )
+                case "MIN_NOTIONAL":
+                    self._min_notional = Decimal(data["minNotional"])
+                    self._min_notional_market = data["applyToMarket"]
+                case "PERCENT_PRICE_BY_SIDE":
+                    self._bid_multipliers = (
+                        Decimal(data["bidMultiplierDown"]),
+                        Decimal(data["bidMultiplierUp"]),
+                    )
+                    self._ask_multipliers = (
+                        Decimal(data["askMultiplierDown"]),
+                        Decimal(data["askMultiplierUp"]),
+                    )
+
+        # steps used by the integer representation of the batches
+        self.price_step = self._price.step if self._price else Decimal(0)
+        self.quantity_step = self._lot_size.step if self._lot_size else Decimal(0)
+
+    def quantize_price(self, price: Number, rounding: str = ROUND_HALF_EVEN) -> Decimal:
+        """
+        Rounds a price to the tick size.
+        """
+        value = to_decimal(price)
+        return self._price.quantize(value, rounding) if self._price else value
+
+    def quantize_quantity(
+        self, quantity: Number, market: bool = False, rounding: str = ROUND_DOWN
+    ) -> Decimal:
+        """
+        Rounds a quantity to the step size. Rounds down by default, so the order is never larger than requested.
+        """
+        value = to_decimal(quantity)
+        grid = self._market_lot_size if market else self._lot_size
+        if market and (not grid or not grid.step):
+            grid = self._lot_size
+        return grid.quantize(value, rounding) if grid else value
+
+    def validate(
+        self,
+        order_side: OrderSide,
+        order_type: OrderType,
+        quantity: Number,
+        price: Optional[Number] = None,
+        avg_price: Optional[Number] = None,
+    ) -> None:
+        """
+        Checks an order against the symbol filters, raising OrderValidationError on the first violation.
+        :param avg_price: average price of the symbol, needed by MIN_NOTIONAL on market orders and PERCENT_PRICE_BY_SIDE
+        """
+        market = order_type == OrderType.MARKET
+        amount = to_decimal(quantity)
+        value = to_decimal(price) if price is not None else None
+        reference = to_decimal(avg_price) if avg_price is not None else None
+
+        # price checks
+        if value is not None and self._price:
+            self._price.check("PRICE_FILTER", value)
+
+        # quantity checks
+        if self._lot_size:
+            self._lot_size.check("LOT_SIZE", amount)
+        if market and self._market_lot_size:
+            self._market_lot_size.check("MARKET_LOT_SIZE", amount)
+
+        # notional checks
+        notional_price = reference if market else value
+        if (
+            self._min_notional
+            and notional_price is not None
+            and (not market or self._min_notional_market)
+            and amount * notional_price < self._min_notional
+        ):
+            raise OrderValidationError(
+                "MIN_NOTIONAL", f"{amount * notional_price} < {self._min_notional}"
+            )
+
+        # percent price checks
+        multipliers = (
+            self._bid_multipliers
+            if order_side == OrderSide.BUY
+            else self._ask_multipliers
+        )
+        if multipliers and value is not None and reference is not None:
+            lower, upper = reference * multipliers[0], reference * multipliers[1]
+            if not lower <= value <= upper:
+                raise OrderValidationError(
+                    "PERCENT_PRICE_BY_SIDE", f"{value} not in [{lower}, {upper}]"
+                )
+
+    def _ticks(self, value: Decimal, step: Decimal, rounding: str) -> int:
+        """
+        Converts a filter bound to an integer number of steps.
+        """
+        return int((value / step).to_integral_value(rounding))
+
+    @staticmethod
+    def _floor_steps(values: np.ndarray, step: Decimal) -> np.ndarray:
+        """
+        Rounds values down to integer step counts. The values are first scaled to integers at the decimals of the step,
+        snapping the ones within float error of an integer, so values on the grid never lose a step.
+        """
+        scale = 10 ** max(-int(step.normalize().as_tuple().exponent), 0)
+        step_units = int(step * scale)
+        scaled = values * scale
+        nearest = np.rint(scaled)
+        units = np.where(
+            np.abs(scaled - nearest) <= np.abs(scaled) * 1e-12,
+            nearest,
+            np.floor(scaled),
+        )
+        return units.astype(np.int64) // step_units
+
+    def validate_batch(
+        self,
+        order_side: OrderSide,
+        prices: Sequence[float],
+        quantities: Sequence[float],
+        avg_price: Optional[Number] = None,
+    ) -> OrderBatch:
+        """
+        Quantizes and checks a batch of limit orders at once, using vectorized integer math.
+        Prices are rounded to the nearest tick and quantities down to the step size.
+        """
+        if not self.price_step or not self.quantity_step:
+            raise ValueError(f"{self.symbol} has no PRICE_FILTER or LOT_SIZE step")
+
+        # converts the orders to integer tick / step counts
+        tick = float(self.price_step)
+        price_ticks = np.rint(np.asarray(prices, dtype=np.float64) / tick).astype(
+            np.int64
+        )
+        quantity_steps = self._floor_steps(
+            np.asarray(quantities, dtype=np.float64), self.quantity_step
+        )
+        failed_filter = np.full(len(price_ticks), "", dtype=object)
+
+        def fail(mask: np.ndarray, filter_type: str) -> None:
+            # keeps the first failure of each order
+            failed_filter[mask & (failed_filter == "")] = filter_type
+
+        # price checks
+        grid = self._price
+        if grid:
+            invalid = price_ticks < self._ticks(grid.minimum, grid.step, ROUND_CEILING)
+            if grid.maximum:
+                invalid |= price_ticks > self._ticks(
+                    grid.maximum, grid.step, ROUND_FLOOR
+                )
+            fail(invalid, "PRICE_FILTER")
+
+        # quantity checks
+        grid = self._lot_size
+        if grid:
+            invalid = quantity_steps < self._ticks(
+                grid.minimum, grid.step, ROUND_CEILING
+            )
+            if grid.maximum:
+                invalid |= quantity_steps > self._ticks(
+                    grid.maximum, grid.step, ROUND_FLOOR
+                )
+            fail(invalid, "LOT_SIZE")
+
+        # notional checks: price * quantity is compared in units of tick * step
+        if self._min_notional:
+            min_units = self._ticks(
+                self._min_notional, self.price_step * self.quantity_step, ROUND_CEILING
+            )
+            fail(price_ticks * quantity_steps < min_units, "MIN_NOTIONAL")
+
+        # percent price checks
+        multipliers = (
+            self._bid_multipliers
+            if order_side == OrderSide.BUY
+            else self._ask_multipliers
+        )
+        if multipliers and avg_price is not None:
+            reference = to_decimal(avg_price)
+            lower = self._ticks(
+                reference * multipliers[0], self.price_step, ROUND_CEILING
+            )
+            upper = self._ticks(
+                reference * multipliers[1], self.price_step, ROUND_FLOOR
+            )
+            fail((price_ticks < lower) | (price_ticks > upper), "PERCENT_PRICE_BY_SIDE")
+
+        return OrderBatch(self, price_ticks, quantity_steps, failed_filter)
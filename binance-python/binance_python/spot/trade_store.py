@@ -0,0 +1,244 @@
+from asyncio import Semaphore, gather
+from logging import getLogger
+from sqlite3 import Connection, Row, connect
+from typing import Optional, Union
+
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import Event, ExecutionReportEvent
+from binance_python.spot.typings import TradesResponse
+
+
+logger = getLogger(__name__)
+
+# columns are named as the fields of the trades responses
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    symbol TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    orderId INTEGER NOT NULL,
+    orderListId INTEGER NOT NULL,
+    price TEXT NOT NULL,
+    qty TEXT NOT NULL,
+    quoteQty TEXT NOT NULL,
+    commission TEXT NOT NULL,
+    commissionAsset TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    isBuyer INTEGER NOT NULL,
+    isMaker INTEGER NOT NULL,
+    isBestMatch INTEGER NOT NULL,
+    PRIMARY KEY (symbol, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trades_by_time ON trades (symbol, time);
+CREATE INDEX IF NOT EXISTS trades_by_order ON trades (symbol, orderId);
+CREATE INDEX IF NOT EXISTS trades_by_time_all_symbols ON trades (time);
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    symbol TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "symbol",
+    "id",
+    "orderId",
+    "orderListId",
+    "price",
+    "qty",
+    "quoteQty",
+    "commission",
+    "commissionAsset",
+    "time",
+    "isBuyer",
+    "isMaker",
+    "isBestMatch",
+)
+_BOOLEAN_COLUMNS = ("isBuyer", "isMaker", "isBestMatch")
+_INSERT = (
+    f"INSERT OR {{}} INTO trades ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + column for column in _COLUMNS)})"
+)
+
+
+class TradeStore:
+    """
+    SQLite store of the account trades, indexed by symbol, time and order id.
+    Trades come from the trades history, through a TradeSynchronizer, and from the execution reports
+    of the user data stream. Amounts are kept as the strings sent by the server.
+    """
+
+    _connection: Connection
+
+    def __init__(self, database_path: str) -> None:
+        """
+        :param database_path: file of the database, created if needed. ":memory:" keeps it in memory
+        """
+        self._connection = connect(database_path)
+        self._connection.row_factory = Row
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def sync_cursor(self, symbol: str) -> Optional[int]:
+        """
+        Returns the id of the last trade stored from the trades history of a symbol.
+        Trades from execution reports don't advance it, since older trades may still be missing.
+        """
+        row = self._connection.execute(
+            "SELECT last_id FROM sync_cursors WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        return row["last_id"] if row else None
+
+    def insert_history(self, symbol: str, trades: list[TradesResponse]) -> None:
+        """
+        Stores a page of the trades history, sorted by id, advancing the sync cursor in the same transaction.
+        History trades replace the ones stored from execution reports.
+        """
+        if not trades:
+            return
+        with self._connection:
+            self._connection.executemany(_INSERT.format("REPLACE"), trades)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_cursors (symbol, last_id) VALUES (?, ?)",
+                (symbol, trades[-1]["id"]),
+            )
+
+    def apply(self, event: Union[Event, dict]) -> bool:
+        """
+        Stores the fill of an execution report. Feed it with the events of the user data stream.
+        :return: True if a new trade was stored
+        """
+        if (
+            not isinstance(event, ExecutionReportEvent)
+            or event.execution_type != "TRADE"
+        ):
+            return False
+
+        data = event.raw
+        with self._connection:
+            cursor = self._connection.execute(
+                _INSERT.format("IGNORE"),
+                {
+                    "symbol": data["s"],
+                    "id": data["t"],
+                    "orderId": data["i"],
+                    "orderListId": data.get("g", -1),
+                    "price": data["L"],
+                    "qty": data["l"],
+                    "quoteQty": data["Y"],
+                    "commission": data["n"],
+                    "commissionAsset": data["N"] or "",
+                    "time": data["T"],
+                    "isBuyer": data["S"] == "BUY",
+                    "isMaker": data["m"],
+                    "isBestMatch": True,
+                },
+            )
+        return cursor.rowcount > 0
+
+    def trades(
+        self,
+        symbol: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        order_id: Optional[int] = None,
+    ) -> list[TradesResponse]:
+        """
+        Returns the stored trades sorted by time, as returned by the trades endpoint.
+        :param symbol: symbol of the trades. Otherwise trades of all symbols are returned
+        :param start_time: time of the first trade (inclusive)
+        :param end_time: time of the last trade (inclusive)
+        :param order_id: order of the trades. Requires a symbol
+        """
+        conditions = []
+        params: list = []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if order_id is not None:
+            if symbol is None:
+                raise ValueError("order ids are only unique by symbol")
+            conditions.append("orderId = ?")
+            params.append(order_id)
+        if start_time is not None:
+            conditions.append("time >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            conditions.append("time <= ?")
+            params.append(end_time)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection.execute(
+            f"SELECT * FROM trades {where} ORDER BY time, symbol, id", params
+        )
+        trades = []
+        for row in rows:
+            trade = dict(row)
+            for column in _BOOLEAN_COLUMNS:
+                trade[column] = bool(trade[column])
+            trades.append(trade)
+        return trades  # type: ignore
+
+    def count(self, symbol: Optional[str] = None) -> int:
+        """
+        Returns the number of stored trades of a symbol, or of all symbols if not given.
+        """
+        if symbol is None:
+            row = self._connection.execute("SELECT COUNT(*) FROM trades").fetchone()
+        else:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM trades WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return row[0]
+
+
+class TradeSynchronizer:
+    """
+    Brings a TradeStore up to date with the trades history, fetching only the trades
+    after the sync cursor of each symbol.
+    """
+
+    _binance_client: BinanceSpotClient
+    _store: TradeStore
+    _semaphore: Semaphore
+
+    def __init__(
+        self,
+        binance_client: BinanceSpotClient,
+        store: TradeStore,
+        max_in_flight: int = 4,
+    ) -> None:
+        """
+        :param binance_client: client used to fetch the trades. Its rate limiter keeps the requests within the weight budget
+        :param store: store of the trades
+        :param max_in_flight: maximum number of symbols synced concurrently
+        """
+        self._binance_client = binance_client
+        self._store = store
+        self._semaphore = Semaphore(max_in_flight)
+
+    async def sync_symbol(self, symbol: str) -> int:
+        """
+        Fetches the trades of a symbol newer than its sync cursor, or the whole history on the first sync.
+        Each page is stored as soon as it arrives, so an interrupted sync resumes where it stopped.
+        :return: number of trades fetched
+        """
+        async with self._semaphore:
+            cursor = self._store.sync_cursor(symbol)
+            fetched = 0
+            async for page in self._binance_client.iter_trades(
+                symbol, from_id=0 if cursor is None else cursor + 1
+            ):
+                self._store.insert_history(symbol, page)
+                fetched += len(page)
+
+        logger.info(f"synced {fetched} {symbol} trades")
+        return fetched
+
+    async def sync(self, symbols: list[str]) -> dict[str, int]:
+        """
+        Syncs the trades of many symbols concurrently.
+        :return: number of trades fetched by symbol
+        """
+        fetched = await gather(*[self.sync_symbol(symbol) for symbol in symbols])
+        return dict(zip(symbols, fetched))
@@ -1,5 +1,13 @@
+from decimal import Decimal
 from typing import TypedDict, Any, Union
 
+from binance_python.spot.enums import (
+    OrderResponseType,
+    OrderSide,
+    OrderType,
+    TimeInForce,
+)
+
 
 class ServerTimeResponse(TypedDict):
     serverTime: int
@@ -49,6 +57,29 @@ class NewOrderResponse(TypedDict):
     transactTime: int
 
 
+class NewOrderResultResponse(NewOrderResponse):
+    price: str
+    origQty: str
+    executedQty: str
+    cummulativeQuoteQty: str
+    status: str
+    timeInForce: str
+    type: str
+    side: str
+
+
+class OrderFillResponse(TypedDict):
+    price: str
+    qty: str
+    commission: str
+    commissionAsset: str
+    tradeId: int
+
+
+class NewOrderFullResponse(NewOrderResultResponse):
+    fills: list[OrderFillResponse]
+
+
 class QueryOrderResponse(TypedDict):
     symbol: str
     orderId: int
@@ -86,6 +117,13 @@ class CancelOrderResponse(TypedDict):
     side: str
 
 
+class CancelReplaceResponse(TypedDict):
+    cancelResult: str
+    newOrderResult: str
+    cancelResponse: CancelOrderResponse
+    newOrderResponse: NewOrderResponse
+
+
 class PriceTickerResponse(TypedDict):
     symbol: str
     price: str
@@ -97,6 +135,11 @@ class OrderBookResponse(TypedDict):
     asks: list[list[str]]
 
 
+# [open time, open, high, low, close, volume, close time, quote volume, trades,
+#  taker buy volume, taker buy quote volume, unused]
+KlineResponse = list[Any]
+
+
 class PriceFilterResponse(TypedDict):
     filterType: str
     minPrice: str
@@ -142,8 +185,8 @@ class IcebergPartsFilterResponse(TypedDict):
 class MarketLotSizeFilterResponse(TypedDict):
     filterType: str
     minQty: str
-    maxQty: bool
-    stepSize: int
+    maxQty: str
+    stepSize: str
 
 
 class MaxNumOrdersFilterResponse(TypedDict):
@@ -219,3 +262,18 @@ class ExchangeInfoResponse(TypedDict):
 
 class ListenKeyResponse(TypedDict):
     listenKey: str
+
+
+class _NewOrderRequiredRequest(TypedDict):
+    symbol: str
+    order_side: OrderSide
+    order_type: OrderType
+
+
+class NewOrderRequest(_NewOrderRequiredRequest, total=False):
+    amount: Union[Decimal, float, int, str]
+    price: Union[Decimal, float, int, str]
+    time_in_force: TimeInForce
+    stop_price: Union[Decimal, float, int, str]
+    response_type: OrderResponseType
+    client_order_id: str
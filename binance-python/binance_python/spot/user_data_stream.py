@@ -1,21 +1,38 @@
 from logging import getLogger
-from typing import Optional, NoReturn, AsyncIterator
+from typing import Optional, NoReturn, AsyncIterator, Union
 from asyncio import sleep, Task, create_task
 
-from binance_python.base_ws_client import BaseWebsocketClient
+from binance_python.base_api_client import BinanceApiException
+from binance_python.base_ws_client import BaseWebsocketClient, STREAM_GAP_EVENT
 from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import Event, decode_event
 
 
 logger = getLogger(__name__)
 
+# error code of the listen keys that do not exist anymore
+INVALID_LISTEN_KEY_ERROR_CODE = -1125
+
 
 class BinanceUserDataStream(BaseWebsocketClient):
 
     _binance_client: BinanceSpotClient
+    _listen_key: Optional[str] = None
     _renew_task: Optional[Task] = None
+    _check_task: Optional[Task] = None
 
-    def __init__(self, binance_client: BinanceSpotClient):
-        super().__init__(logger, binance_client.testnet)
+    def __init__(
+        self, binance_client: BinanceSpotClient, base_url: Optional[str] = None
+    ):
+        """
+        :param base_url: url of the websocket server. Overrides the testnet setting of the client
+        """
+        super().__init__(
+            logger,
+            binance_client.testnet,
+            metrics=binance_client.metrics,
+            base_url=base_url,
+        )
         self._binance_client = binance_client
 
     async def _renew_listen_key(self, listen_key: str) -> NoReturn:
@@ -40,22 +57,91 @@ class BinanceUserDataStream(BaseWebsocketClient):
                     logger.error(f"unable to renew listen key: {exc}")
                     await sleep(retry_seconds)
 
+    def _replace_listen_key(self, listen_key: str) -> None:
+        """
+        Subscribes to a new listen key in place of the current one, renewing it from now on.
+        """
+        if listen_key == self._listen_key:
+            return
+        if self._listen_key:
+            logger.info(f"replacing listen key: {self._listen_key}")
+            self.unsubscribe([self._listen_key])
+        self.subscribe([listen_key])
+        if self._renew_task:
+            self._renew_task.cancel()
+        self._renew_task = create_task(self._renew_listen_key(listen_key))
+        self._listen_key = listen_key
+
+    async def _check_listen_key(self, expired: bool) -> None:
+        """
+        Makes sure the listen key is still valid after a disconnection, once the connection is back.
+        Failed requests are retried with backoff: only an expired or unknown key is replaced.
+        :param expired: the server reported the expiration of the listen key
+        """
+        attempt = 0
+        while True:
+            try:
+                if not expired:
+                    await self.subscribed.wait()
+                    try:
+                        await self._binance_client.keep_alive_listen_key(
+                            self._listen_key  # type: ignore
+                        )
+                        return
+                    except BinanceApiException as exc:
+                        if exc.error_code != INVALID_LISTEN_KEY_ERROR_CODE:
+                            raise
+                        logger.warning(f"listen key is no longer valid: {exc}")
+                        expired = True
+                self._replace_listen_key(await self._binance_client.create_listen_key())
+                return
+            except Exception as exc:
+                logger.warning(f"unable to check listen key: {exc}")
+                await sleep(self._backoff(attempt))
+                attempt += 1
+
     async def stream(self) -> AsyncIterator[dict]:
         """
         Provides user data as a stream.
         """
-        # handles websocket disconnection
-        while True:
+        # recorded messages need no listen key
+        if self._replayer:
+            async for message in self._stream(raw_stream=True):
+                yield message
+            return
 
-            # creates the subscription
-            listen_key = await self._binance_client.create_listen_key()
-            renew_task = create_task(self._renew_listen_key(listen_key))
-            self._subscriptions.add(listen_key)
+        # creates the subscription
+        self._replace_listen_key(await self._binance_client.create_listen_key())
 
+        try:
             # handles incoming data
             async for message in self._stream(raw_stream=True):
                 yield message
 
-            # handles disconnection
-            self._subscriptions.remove(listen_key)
-            renew_task.cancel()
+                # handles expiration and disconnection: the new key is used when resubscribing
+                event_type = message.get("e")
+                checking = self._check_task and not self._check_task.done()
+                if event_type == "listenKeyExpired":
+                    if checking:
+                        self._check_task.cancel()  # type: ignore
+                    self._check_task = create_task(self._check_listen_key(expired=True))
+                elif event_type == STREAM_GAP_EVENT and not checking:
+                    self._check_task = create_task(
+                        self._check_listen_key(expired=False)
+                    )
+        finally:
+            # handles the end of the stream
+            for task in (self._check_task, self._renew_task):
+                if task:
+                    task.cancel()
+            self._check_task = self._renew_task = None
+            if self._listen_key:
+                self._subscriptions.discard(self._listen_key)
+                self._listen_key = None
+
+    async def events(self) -> AsyncIterator[Union[Event, dict]]:
+        """
+        Provides user data as a stream of typed events. Unknown messages are passed as dict.
+        """
+        async for message in self.stream():
+            yield decode_event(message)
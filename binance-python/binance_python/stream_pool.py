@@ -0,0 +1,231 @@
+from asyncio import Future, Queue, Task, create_task, gather
+from logging import Logger, getLogger
+from time import time
+from typing import AsyncIterator, Awaitable, Optional
+from orjson import dumps
+
+from binance_python.base_ws_client import BaseWebsocketClient, STREAM_GAP_EVENT
+from binance_python.metrics import StreamMetrics
+
+
+class _PoolConnection(BaseWebsocketClient):
+    """
+    Websocket connection of a stream pool.
+    """
+
+    index: int
+    stats: StreamMetrics
+
+    def __init__(
+        self, index: int, logger: Logger, testnet: bool, base_url: Optional[str]
+    ) -> None:
+        super().__init__(logger, testnet, base_url=base_url)
+        self.index = index
+        self.stats = StreamMetrics()
+
+    @property
+    def streams(self) -> set[str]:
+        return self._subscriptions
+
+
+class StreamPool:
+    """
+    Spreads stream subscriptions across several websocket connections and merges their messages
+    into a single stream of combined stream messages ({"stream": ..., "data": ...}).
+    """
+
+    _connections: list[_PoolConnection]
+    _assignments: dict[str, _PoolConnection]
+    _max_streams: int
+    _queue: Queue
+    _tasks: list[Task]
+    # messages received once of the streams being moved, which both connections may deliver
+    _overlaps: dict[str, set[bytes]]
+
+    def __init__(
+        self,
+        connections: int = 2,
+        max_streams_per_connection: int = 1024,
+        queue_size: int = 10000,
+        logger: Optional[Logger] = None,
+        testnet: bool = False,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param connections: number of websocket connections
+        :param max_streams_per_connection: streams allowed per connection. Server max 1024
+        :param queue_size: merged messages buffered before the connections wait for the consumer
+        :param base_url: url of the websocket server. Overrides "testnet"
+        """
+        logger = logger if logger else getLogger(__name__)
+        self._connections = [
+            _PoolConnection(index, logger, testnet, base_url)
+            for index in range(connections)
+        ]
+        self._assignments = {}
+        self._max_streams = max_streams_per_connection
+        self._queue = Queue(queue_size)
+        self._tasks = []
+        self._overlaps = {}
+
+    @property
+    def streams(self) -> list[str]:
+        """
+        Subscribed streams.
+        """
+        return list(self._assignments)
+
+    def stats(self) -> list[StreamMetrics]:
+        """
+        Statistics of each connection.
+        """
+        return [connection.stats for connection in self._connections]
+
+    def connection_streams(self) -> list[set[str]]:
+        """
+        Streams assigned to each connection.
+        """
+        return [set(connection.streams) for connection in self._connections]
+
+    @staticmethod
+    def _gather(*futures: Awaitable) -> Future:
+        """
+        Returns a future resolved when all futures are, failed by the first failure.
+        """
+        gathered = gather(*futures)
+        # failures are logged already: callers may ignore the future
+        gathered.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return gathered
+
+    def subscribe(self, streams: list[str]) -> Future:
+        """
+        Subscribes to streams, assigning each one to the least loaded connection.
+        :return: future resolved when the connections acknowledge the subscriptions, once the pool is streaming
+        """
+        new_streams = [stream for stream in streams if stream not in self._assignments]
+        if len(self._assignments) + len(new_streams) > self._max_streams * len(
+            self._connections
+        ):
+            raise ValueError("stream pool has no capacity left for the subscriptions")
+
+        # groups the new streams by connection
+        changes: dict[_PoolConnection, list[str]] = {}
+        loads = {
+            connection: len(connection.streams) for connection in self._connections
+        }
+        for stream in new_streams:
+            connection = min(self._connections, key=loads.__getitem__)
+            loads[connection] += 1
+            self._assignments[stream] = connection
+            changes.setdefault(connection, []).append(stream)
+
+        return self._gather(
+            *[
+                connection.subscribe(connection_streams)
+                for connection, connection_streams in changes.items()
+            ]
+        )
+
+    def unsubscribe(self, streams: list[str]) -> Future:
+        """
+        Unsubscribes from streams and rebalances the remaining ones.
+        :return: future resolved when the unsubscriptions and the rebalance are acknowledged, once the pool is streaming
+        """
+        changes: dict[_PoolConnection, list[str]] = {}
+        for stream in streams:
+            connection = self._assignments.pop(stream, None)
+            if connection:
+                changes.setdefault(connection, []).append(stream)
+
+        return self._gather(
+            *[
+                connection.unsubscribe(connection_streams)
+                for connection, connection_streams in changes.items()
+            ],
+            self.rebalance(),
+        )
+
+    def rebalance(self) -> Future:
+        """
+        Moves streams from the most loaded connections to the least loaded ones,
+        until their loads differ by one stream at most.
+        :return: future resolved when the moves are acknowledged, once the pool is streaming
+        """
+        loads = {
+            connection: len(connection.streams) for connection in self._connections
+        }
+        moves: dict[tuple[_PoolConnection, _PoolConnection], list[str]] = {}
+        remaining = {
+            connection: sorted(connection.streams) for connection in self._connections
+        }
+        while True:
+            source = max(self._connections, key=loads.__getitem__)
+            target = min(self._connections, key=loads.__getitem__)
+            if loads[source] - loads[target] <= 1:
+                break
+            stream = remaining[source].pop()
+            loads[source] -= 1
+            loads[target] += 1
+            self._assignments[stream] = target
+            moves.setdefault((source, target), []).append(stream)
+
+        # the old connection keeps the streams until the new one is subscribed, so no messages are missed
+        acknowledgements = []
+        for (source, target), streams in moves.items():
+            source.streams.difference_update(streams)
+            for stream in streams:
+                self._overlaps[stream] = set()
+            acknowledgements.append(
+                self._unsubscribe_after(source, streams, target.subscribe(streams))
+            )
+        return self._gather(*acknowledgements)
+
+    async def _unsubscribe_after(
+        self, connection: _PoolConnection, streams: list[str], subscribed: Future
+    ) -> None:
+        """
+        Unsubscribes a connection from streams once another connection is subscribed to them.
+        """
+        try:
+            await subscribed
+            await connection.unsubscribe(streams)
+        finally:
+            for stream in streams:
+                self._overlaps.pop(stream, None)
+
+    async def _read(self, connection: _PoolConnection) -> None:
+        """
+        Forwards the messages of a connection to the merged queue.
+        """
+        stats = connection.stats
+        async for message in connection._stream(raw_stream=False):
+            data = message.get("data", message)
+            if data.get("e") == STREAM_GAP_EVENT:
+                message["connection"] = connection.index
+
+            # streams being moved are delivered by both connections: forwards each message once
+            overlap = self._overlaps.get(message.get("stream"))  # type: ignore
+            if overlap is not None:
+                key = dumps(data)
+                if key in overlap:
+                    overlap.discard(key)
+                    continue
+                overlap.add(key)
+
+            stats.record(data.get("E"), time())
+            await self._queue.put(message)
+
+    async def stream(self) -> AsyncIterator[dict]:
+        """
+        Provides the merged messages of all connections.
+        """
+        self._tasks = [
+            create_task(self._read(connection)) for connection in self._connections
+        ]
+        try:
+            while True:
+                yield await self._queue.get()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
@@ -2,6 +2,11 @@ from logging import getLogger
 from typing import NoReturn
 
 from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import (
+    BalanceUpdateEvent,
+    ExecutionReportEvent,
+    OutboundAccountPositionEvent,
+)
 from binance_python.spot.user_data_stream import BinanceUserDataStream
 
 
@@ -22,18 +27,25 @@ async def monitor_account(api_key: str, api_secret: str, testnet: bool) -> NoRet
     while True:
 
         # handles incoming messages
-        async for message in user_data_stream.stream():
-            match message["e"]:
-                case "outboundAccountPosition":
-                    logger.info(message)
-                case "balanceUpdate":
-                    logger.info(message)
-                case "executionReport":
-                    logger.info(message)
-                case "listStatus":
-                    logger.info(message)
+        async for event in user_data_stream.events():
+            match event:
+                case OutboundAccountPositionEvent():
+                    logger.info(event.balances)
+                case BalanceUpdateEvent():
+                    logger.info(f"{event.asset}: {event.delta}")
+                case ExecutionReportEvent():
+                    logger.info(
+                        f"{event.symbol} {event.order_id}: {event.order_status}"
+                        f" {event.cumulative_filled_quantity}/{event.quantity}"
+                    )
+                case {"e": "listStatus"}:
+                    logger.info(event)
+                case {"e": "streamGap"}:
+                    logger.warning(
+                        "user data stream reconnecting, events may be missing"
+                    )
                 case _:
-                    logger.error(f"unknown message data: {message}")
+                    logger.error(f"unknown message data: {event}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+from logging import getLogger
+
+from binance_python.base_ws_client import STREAM_GAP_EVENT
+from binance_python.spot.events import BookTickerEvent, TradeEvent
+from binance_python.spot.market_stream import BinanceMarketStream, MarketEvent
+
+
+logger = getLogger(__name__)
+
+
+def on_trade(stream: str, event: MarketEvent) -> None:
+    if isinstance(event, TradeEvent):
+        logger.info(f"{event.symbol} trade: {event.quantity} @ {event.price}")
+
+
+def on_book_ticker(stream: str, event: MarketEvent) -> None:
+    if isinstance(event, BookTickerEvent):
+        logger.info(f"{event.symbol} bid: {event.bid_price} ask: {event.ask_price}")
+
+
+def on_gap(stream: str, event: MarketEvent) -> None:
+    logger.warning("market stream reconnecting, events may be missing")
+
+
+async def monitor_market(symbols: list[str], testnet: bool) -> None:
+    """
+    Executes a main asyncio application.
+    """
+    # creates a market stream and routes each stream to its handler
+    market_stream = BinanceMarketStream(testnet)
+    market_stream.add_handler(STREAM_GAP_EVENT, on_gap)
+    for symbol in symbols:
+        market_stream.subscribe_trades(symbol, handler=on_trade)
+        market_stream.subscribe_book_ticker(symbol, handler=on_book_ticker)
+
+    # dispatches the messages forever
+    await market_stream.run()
+
+
+if __name__ == "__main__":
+
+    import logging
+    from os import environ
+    from asyncio import get_event_loop
+
+    # configures the logger
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s %(name)s | %(message)s",
+        level=logging.INFO,
+    )
+
+    # executes the application
+    try:
+        loop = get_event_loop()
+        loop.run_until_complete(
+            monitor_market(
+                symbols=environ.get("BINANCE_SYMBOLS", "BTCUSDT").split(","),
+                testnet=bool(environ.get("BINANCE_TESTNET")),
+            )
+        )
+    except KeyboardInterrupt:
+        print("Shutting down...")
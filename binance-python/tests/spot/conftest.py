@@ -1,5 +1,6 @@
 import pytest
 
+from binance_python.fake_server import FakeBinanceServer
 from binance_python.spot.client import BinanceSpotClient
 
 
@@ -7,15 +8,22 @@ from binance_python.spot.client import BinanceSpotClient
 def client(event_loop, api_keys):
     """
     Provides the binance client to be used in the tests.
+    Uses the testnet when the api keys are set, and a FakeBinanceServer otherwise.
     """
-    # extract api keys
-    api_key, api_secret = api_keys
-
-    # creates the client
-    binance = BinanceSpotClient(api_key, api_secret, testnet=True)
+    if api_keys:
+        # creates the testnet client
+        server = None
+        binance = BinanceSpotClient(*api_keys, testnet=True)
+    else:
+        # creates the fake server client
+        server = FakeBinanceServer()
+        event_loop.run_until_complete(server.start())
+        binance = server.client()
 
     # return the client to be used in tests
     yield binance
 
     # disposes the client
     event_loop.run_until_complete(binance.dispose())
+    if server:
+        event_loop.run_until_complete(server.stop())
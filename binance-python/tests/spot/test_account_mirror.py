@@ -0,0 +1,93 @@
+import pytest
+from asyncio import wait_for
+from orjson import dumps
+
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.recorder import StreamRecorder, StreamReplayer
+from binance_python.spot.account_mirror import AccountMirror
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import decode_event
+from binance_python.spot.user_data_stream import BinanceUserDataStream
+
+
+def test_events_update_snapshot():
+    """
+    Test that user data events update the snapshot and older events are ignored.
+    """
+    mirror = AccountMirror(BinanceSpotClient("", ""))
+    account = {
+        "updateTime": 1000,
+        "balances": [{"asset": "USDT", "free": "100.0", "locked": "0.0"}],
+    }
+    order = {
+        "symbol": "BTCUSDT",
+        "orderId": 1,
+        "clientOrderId": "a",
+        "side": "BUY",
+        "type": "LIMIT",
+        "status": "NEW",
+        "price": "10.0",
+        "origQty": "2.0",
+        "executedQty": "0.0",
+        "updateTime": 1000,
+    }
+    mirror.load(account, [order])  # type: ignore
+
+    report = {
+        "e": "executionReport",
+        "s": "BTCUSDT",
+        "i": 1,
+        "c": "a",
+        "S": "BUY",
+        "o": "LIMIT",
+        "p": "10.0",
+        "q": "2.0",
+    }
+    mirror.apply(
+        decode_event({**report, "X": "PARTIALLY_FILLED", "z": "1.0", "T": 2000})
+    )
+    mirror.apply(decode_event({**report, "X": "NEW", "z": "0.0", "T": 900}))
+    mirror.apply(
+        decode_event(
+            {
+                "e": "outboundAccountPosition",
+                "u": 2000,
+                "B": [{"a": "USDT", "f": "80.0", "l": "10.0"}],
+            }
+        )
+    )
+    assert mirror.open_order("BTCUSDT", 1).executed_quantity == 1.0  # type: ignore
+    assert (mirror.free("USDT"), mirror.locked("USDT")) == (80.0, 10.0)
+
+    mirror.apply(decode_event({**report, "X": "FILLED", "z": "2.0", "T": 3000}))
+    assert not mirror.open_orders()
+
+
+@pytest.mark.asyncio
+async def test_replayed_events_update_the_mirror(tmp_path):
+    """
+    Test that recorded user data events are applied over the snapshot when replayed.
+    """
+    recorder = StreamRecorder(str(tmp_path))
+    for received_at, asset in [(1000.0, "USDT"), (1000.2, "BTC")]:
+        event = {
+            "e": "outboundAccountPosition",
+            "E": 9999999999999,
+            "u": 9999999999999,
+            "B": [{"a": asset, "f": "123.0", "l": "0.0"}],
+        }
+        recorder.write(dumps(event).decode("utf-8"), received_at)
+    recorder.close()
+
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        user_data_stream = BinanceUserDataStream(client)
+        user_data_stream.replay(StreamReplayer(str(tmp_path)))
+        mirror = AccountMirror(client, user_data_stream)
+
+        await wait_for(mirror.run(), 5.0)
+
+        assert mirror.synced
+        assert mirror.free("USDT") == 123.0
+        assert mirror.free("BTC") == 123.0
+        await client.dispose()
@@ -0,0 +1,72 @@
+import pytest
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.fake_server import FakeBinanceServer, TICK_SIZE
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.enums import OrderSide, OrderType, TimeInForce
+
+
+def _track_in_flight(client: BinanceSpotClient) -> list[int]:
+    """
+    Records the requests in flight whenever a request is sent.
+    """
+    in_flight: list[int] = []
+    request = client._http.request
+
+    async def tracked_request(*args, **kwargs):
+        in_flight.append(client.pool_stats.in_flight)
+        return await request(*args, **kwargs)
+
+    client._http.request = tracked_request  # type: ignore
+    return in_flight
+
+
+@pytest.mark.asyncio
+async def test_place_and_cancel_orders_return_results_in_order():
+    """
+    Test that batch orders return the result of each item in order, with the failed items as exceptions.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        in_flight = _track_in_flight(client)
+        price = round(server._symbols["BTCUSDT"].best_bid() * TICK_SIZE * 0.9, 2)
+        order = dict(
+            order_side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            amount=0.01,
+            price=price,
+            time_in_force=TimeInForce.GTC,
+        )
+
+        placed = await client.place_orders(
+            [
+                dict(symbol="BTCUSDT", **order),
+                dict(symbol="NOTASYMBOL", **order),
+                dict(symbol="BTCUSDT", **order),
+                dict(symbol="BTCUSDT", **order),
+            ],
+            max_in_flight=2,
+        )
+        assert isinstance(placed[1], BinanceApiException)
+        assert placed[1].error_code == -1121
+        order_ids = [placed[0]["orderId"], placed[2]["orderId"], placed[3]["orderId"]]
+        assert len(set(order_ids)) == 3
+        assert max(in_flight) == 2
+
+        in_flight.clear()
+        canceled = await client.cancel_orders(
+            [("BTCUSDT", order_ids[0]), ("BTCUSDT", -1), ("BTCUSDT", order_ids[2])],
+            max_in_flight=1,
+        )
+        assert [canceled[0]["orderId"], canceled[2]["orderId"]] == [
+            order_ids[0],
+            order_ids[2],
+        ]
+        assert canceled[0]["status"] == "CANCELED"
+        assert isinstance(canceled[1], BinanceApiException)
+        assert canceled[1].error_code == -2011
+        assert max(in_flight) == 1
+
+        open_orders = await client.fetch_open_orders("BTCUSDT")
+        assert [open_order["orderId"] for open_order in open_orders] == [order_ids[1]]
+        await client.dispose()
@@ -0,0 +1,61 @@
+from orjson import loads
+
+from binance_python.spot.events import (
+    BookTickerEvent,
+    ExecutionReportEvent,
+    OutboundAccountPositionEvent,
+    decode_event,
+)
+
+
+def test_decode_execution_report():
+    """
+    Test that execution reports are decoded with lazily parsed numbers.
+    """
+    event = decode_event(
+        loads(
+            b'{"e":"executionReport","E":1499405658658,"s":"ETHBTC","c":"mUvoqJxFIILMdfAW5iGSOW",'
+            b'"S":"BUY","o":"LIMIT","f":"GTC","q":"1.00000000","p":"0.10264410","X":"NEW","i":4293153}'
+        )
+    )
+
+    assert isinstance(event, ExecutionReportEvent)
+    assert event.symbol == "ETHBTC"
+    assert event.order_id == 4293153
+    assert event.price == 0.1026441
+    assert event.price is event.price  # parsed once
+
+
+def test_decode_combined_stream_messages():
+    """
+    Test that combined stream envelopes and events without type are decoded.
+    """
+    event = decode_event(
+        {
+            "stream": "bnbusdt@bookTicker",
+            "data": {
+                "u": 400900217,
+                "s": "BNBUSDT",
+                "b": "25.35190000",
+                "B": "31.21000000",
+                "a": "25.36520000",
+                "A": "40.66000000",
+            },
+        }
+    )
+
+    assert isinstance(event, BookTickerEvent)
+    assert event.ask_price == 25.3652
+
+    event = decode_event(
+        {
+            "e": "outboundAccountPosition",
+            "E": 1564034571105,
+            "u": 1564034571073,
+            "B": [{"a": "ETH", "f": "10000.000000", "l": "0.000000"}],
+        }
+    )
+
+    assert isinstance(event, OutboundAccountPositionEvent)
+    assert event.balances[0].free == 10000.0
+    assert decode_event({"e": "listStatus"}) == {"e": "listStatus"}
@@ -0,0 +1,92 @@
+import pytest
+from asyncio import sleep
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.exchange_info import ExchangeInfoCache
+
+
+@pytest.mark.asyncio
+async def test_fetches_symbols_on_demand():
+    """
+    Test that missing symbols are fetched when needed and their filters are indexed by type.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        cache = ExchangeInfoCache(client)
+
+        symbol_info = await cache.get_symbol_info("BTCUSDT")
+
+        assert symbol_info["symbol"] == "BTCUSDT"
+        assert cache.symbols == ["BTCUSDT"]
+        lot_size = cache.symbol_filter("BTCUSDT", "LOT_SIZE")
+        assert lot_size and lot_size["filterType"] == "LOT_SIZE"
+        assert cache.symbol_filter("BTCUSDT", "ICEBERG_PARTS") is None
+        assert cache.order_validator("BTCUSDT") is cache.order_validator("BTCUSDT")
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_refresh_drops_invalid_symbols():
+    """
+    Test that stale symbols are refreshed, and a delisted symbol does not fail the others of its batch.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        cache = ExchangeInfoCache(client, ttl=0.05)
+        await cache.fetch(["BTCUSDT", "ETHUSDT"])
+        assert not cache.is_stale("BTCUSDT")
+
+        await sleep(0.05)
+        assert cache.is_stale("BTCUSDT")
+        del server._symbols["ETHUSDT"]
+        await cache.refresh()
+
+        assert cache.symbols == ["BTCUSDT"]
+        assert not cache.is_stale("BTCUSDT")
+        with pytest.raises(BinanceApiException) as error:
+            await cache.get_symbol_info("ETHUSDT")
+        assert error.value.error_code == -1121
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_save_and_load(tmp_path):
+    """
+    Test that the cache persisted to disk is loaded back with its update times.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        cache_path = tmp_path / "exchange_info.json"
+        cache = ExchangeInfoCache(client, cache_path=cache_path)
+        await cache.fetch()
+
+        loaded = ExchangeInfoCache(client, cache_path=cache_path)
+
+        assert loaded.load()
+        assert loaded.symbols == cache.symbols
+        assert loaded.symbol_info("ETHUSDT") == cache.symbol_info("ETHUSDT")
+        assert loaded.rate_limits == cache.rate_limits
+        assert not loaded.is_stale("ETHUSDT")
+        assert not ExchangeInfoCache(client, cache_path=tmp_path / "missing").load()
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_symbols_fetched_on_demand_are_saved_by_the_refresh(tmp_path):
+    """
+    Test that fetching a symbol on demand does not write the cache file, and the next refresh does.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        cache_path = tmp_path / "exchange_info.json"
+        cache = ExchangeInfoCache(client, cache_path=cache_path)
+
+        await cache.get_symbol_info("BTCUSDT")
+        assert not cache_path.exists()
+
+        await cache.refresh()
+        loaded = ExchangeInfoCache(client, cache_path=cache_path)
+        assert loaded.load()
+        assert loaded.symbols == ["BTCUSDT"]
+        await client.dispose()
@@ -0,0 +1,94 @@
+import pytest
+from time import time
+
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.enums import KlineInterval
+from binance_python.spot.klines import KlineDownloader, KlineStore
+
+
+def _kline(open_time: int) -> list:
+    return [
+        open_time,
+        "1.0",
+        "2.0",
+        "0.5",
+        "1.5",
+        "10",
+        open_time + 59999,
+        "15",
+        3,
+        "4",
+        "6",
+        "0",
+    ]
+
+
+def test_store_appends_and_slices_klines(tmp_path):
+    """
+    Test that the store skips already stored klines and reads ranges by open time.
+    """
+    store = KlineStore(str(tmp_path))
+    interval = KlineInterval.MINUTE_1
+
+    assert store.append("BTCUSDT", interval, [_kline(t * 60000) for t in range(5)]) == 5
+    assert (
+        store.append("BTCUSDT", interval, [_kline(t * 60000) for t in range(3, 8)]) == 3
+    )
+
+    klines = store.read("BTCUSDT", interval, start_time=120000, end_time=240000)
+    assert list(klines["open_time"]) == [120000, 180000, 240000]
+    assert list(klines["close"]) == [1.5, 1.5, 1.5]
+    assert store.last_open_time("BTCUSDT", interval) == 7 * 60000
+    assert store.last_open_time("ETHUSDT", interval) is None
+
+
+@pytest.mark.asyncio
+async def test_downloader_resumes_from_the_last_stored_kline(tmp_path):
+    """
+    Test that downloads are split in concurrent requests of 1000 klines, store closed klines only,
+    and fetch only the new klines when run again.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        store = KlineStore(str(tmp_path))
+        downloader = KlineDownloader(client, store, max_in_flight=2)
+        interval = KlineInterval.SECOND_1
+        fetch_klines = client.fetch_klines
+        requests = []
+        in_flight = [0]
+
+        async def tracked_fetch_klines(symbol, interval, start_time, end_time, limit):
+            requests.append((start_time, end_time, limit))
+            in_flight.append(in_flight[-1] + 1)
+            try:
+                return await fetch_klines(symbol, interval, start_time, end_time, limit)
+            finally:
+                in_flight.append(in_flight[-1] - 1)
+
+        client.fetch_klines = tracked_fetch_klines  # type: ignore
+        start_time = (int(time()) - 2500) * 1000
+
+        # the first run stops before the current time
+        end_time = start_time + 1999 * 1000
+        assert (
+            await downloader.download_symbol("BTCUSDT", interval, start_time, end_time)
+            == 2000
+        )
+        assert requests == [
+            (start_time, start_time + 999999, 1000),
+            (start_time + 1000000, end_time, 1000),
+        ]
+        assert max(in_flight) == 2
+
+        # the second run fetches only the new klines, up to the last closed one
+        requests.clear()
+        stored = await downloader.download_symbol("BTCUSDT", interval, start_time)
+        downloaded_at = time() * 1000
+        assert requests[0][0] == end_time + 1
+        assert 490 <= stored <= 510
+
+        klines = store.read("BTCUSDT", interval)
+        assert len(klines["open_time"]) == 2000 + stored
+        assert set(klines["open_time"][1:] - klines["open_time"][:-1]) == {1000}
+        assert klines["close_time"][-1] < downloaded_at
+        await client.dispose()
@@ -0,0 +1,49 @@
+import pytest
+
+from binance_python.spot.enums import KlineInterval
+from binance_python.spot.events import KlineEvent, MiniTickerEvent
+from binance_python.spot.market_stream import BinanceMarketStream
+
+
+@pytest.mark.asyncio
+async def test_messages_are_routed_to_stream_handlers():
+    """
+    Test that a decoded message is shared by all the handlers of its stream.
+    """
+    market_stream = BinanceMarketStream()
+    received: list = []
+    kline_stream = market_stream.subscribe_klines(
+        "BTCUSDT",
+        KlineInterval.MINUTE_1,
+        handler=lambda stream, event: received.append(event),
+    )
+    market_stream.add_handler(
+        kline_stream, lambda stream, event: received.append(event)
+    )
+    ticker_stream = market_stream.subscribe_mini_ticker()
+
+    stream, event = market_stream._decode(
+        {
+            "stream": "btcusdt@kline_1m",
+            "data": {
+                "e": "kline",
+                "E": 1,
+                "s": "BTCUSDT",
+                "k": {"t": 0, "i": "1m", "o": "100.5", "c": "101.0", "x": False},
+            },
+        }
+    )
+    market_stream._dispatch(stream, event)
+    _, tickers = market_stream._decode(
+        {
+            "stream": "!miniTicker@arr",
+            "data": [{"e": "24hrMiniTicker", "E": 1, "s": "BTCUSDT", "c": "101.0"}],
+        }
+    )
+
+    assert kline_stream == "btcusdt@kline_1m"
+    assert ticker_stream == "!miniTicker@arr"
+    assert market_stream.subscriptions == {kline_stream, ticker_stream}
+    assert len(received) == 2 and received[0] is received[1]
+    assert isinstance(event, KlineEvent) and event.open == 100.5
+    assert isinstance(tickers[0], MiniTickerEvent) and tickers[0].close == 101.0
@@ -0,0 +1,165 @@
+from asyncio import create_task, wait
+from time import monotonic
+
+import pytest
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.order_book import LocalOrderBook, OrderBookSide
+
+
+def depth_event(first_id: int, final_id: int, bids=(), asks=()) -> dict:
+    """
+    Builds a depth update event.
+    """
+    return {
+        "e": "depthUpdate",
+        "s": "BTCUSDT",
+        "U": first_id,
+        "u": final_id,
+        "b": [list(level) for level in bids],
+        "a": [list(level) for level in asks],
+    }
+
+
+def test_order_book_side_sorting():
+    """
+    Test that levels are kept sorted from the best price to the worst.
+    """
+    bids = OrderBookSide(descending=True)
+    bids.load([["100.0", "1"], ["102.0", "2"], ["101.0", "3"]])
+    bids.update("103.0", "4")
+    bids.update("101.0", "0")
+
+    assert bids.best() == (103.0, 4.0)
+    assert bids.top(3) == [(103.0, 4.0), (102.0, 2.0), (100.0, 1.0)]
+    assert bids.quantity_at(101.0) == 0.0
+    assert bids.depth_to_price(102.0) == 6.0
+
+    # cached sums are recomputed from the changed levels
+    bids.update("102.5", "5")
+    assert bids.depth_to_price(102.0) == 11.0
+    assert bids.depth_to_price(99.0) == 12.0
+    bids.update("103.0", "0")
+    assert bids.depth_to_price(104.0) == 0.0
+    assert bids.depth_to_price(100.0) == 8.0
+
+
+def test_order_book_sequencing():
+    """
+    Test that events are applied following the update ids of the snapshot.
+    """
+    book = LocalOrderBook(BinanceSpotClient("", "", testnet=True), "BTCUSDT")
+    book._load_snapshot(
+        {"lastUpdateId": 10, "bids": [["99.0", "1"]], "asks": [["101.0", "1"]]}
+    )
+
+    # the buffer starts before the snapshot and overlaps it
+    assert book._apply_buffer(
+        [
+            depth_event(5, 9, bids=[("98.0", "1")]),
+            depth_event(9, 12, asks=[("100.5", "2")]),
+        ]
+    )
+    assert book.last_update_id == 12
+    assert book.best_ask() == (100.5, 2.0)
+    assert book.bids.quantity_at(98.0) == 0.0
+
+    # a missing update resets the book
+    assert not book._apply_event(depth_event(14, 15))
+    assert not book.synced
+    assert len(book.bids) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_syncs_and_resyncs_after_a_gap():
+    """
+    Test that the streamed book matches the server after the snapshot and after a reconnection.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        book = LocalOrderBook(client, "BTCUSDT", base_url=server.ws_url)
+        state = server._symbols["BTCUSDT"]
+        updates = book.stream()
+        update = create_task(updates.__anext__())
+
+        async def next_synced() -> None:
+            # moves the market until the book yields a synced update
+            nonlocal update
+            while True:
+                server._market_tick()
+                done, _ = await wait({update}, timeout=0.05)
+                if done:
+                    update.result()
+                    update = create_task(updates.__anext__())
+                    if book.synced:
+                        return
+
+        def assert_matches_server() -> None:
+            assert book.last_update_id == state.update_id
+            assert book.bids.top(10) == [
+                (float(price), float(quantity))
+                for price, quantity in state.levels(state.bids, True, 10)
+            ]
+            assert book.asks.top(10) == [
+                (float(price), float(quantity))
+                for price, quantity in state.levels(state.asks, False, 10)
+            ]
+
+        # the first events are buffered while the snapshot is fetched
+        await book.subscribed.wait()
+        await next_synced()
+        assert_matches_server()
+
+        # events are missed while disconnected
+        await server.disconnect_all()
+        for _ in range(3):
+            server._market_tick()
+        await next_synced()
+        assert_matches_server()
+
+        update.cancel()
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_snapshots_are_retried_with_backoff():
+    """
+    Test that failed snapshot fetches are retried with backoff instead of at every event,
+    with a bounded buffer of events meanwhile.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        book = LocalOrderBook(
+            client, "BTCUSDT", base_url=server.ws_url, max_buffered_events=5
+        )
+        book._backoff_base = 0.1
+        fetch_order_book = client.fetch_order_book
+        fetched_at = []
+
+        async def failing_fetch_order_book(symbol: str, limit: int) -> dict:
+            fetched_at.append(monotonic())
+            if len(fetched_at) <= 3:
+                raise BinanceApiException(-1003, "Too many requests.")
+            return await fetch_order_book(symbol, limit)
+
+        client.fetch_order_book = failing_fetch_order_book  # type: ignore
+        updates = book.stream()
+        update = create_task(updates.__anext__())
+        await book.subscribed.wait()
+
+        # moves the market every 10 ms until the book is synced
+        while not update.done():
+            server._market_tick()
+            await wait({update}, timeout=0.01)
+        assert update.result() is book
+        assert book.last_update_id == server._symbols["BTCUSDT"].update_id
+
+        intervals = [
+            later - earlier for earlier, later in zip(fetched_at, fetched_at[1:])
+        ]
+        assert len(fetched_at) == 4
+        assert min(intervals) >= 0.05
+        await updates.aclose()
+        await client.dispose()
@@ -0,0 +1,83 @@
+import pytest
+
+from binance_python.base_api_client import BinanceApiException, CONNECTION_ERROR_CODE
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import decode_event
+from binance_python.spot.order_tracker import OrderHandle, OrderTracker
+
+
+@pytest.mark.asyncio
+async def test_handle_resolved_from_execution_reports():
+    """
+    Test that the futures of an order handle are resolved by its execution reports.
+    """
+    tracker = OrderTracker(BinanceSpotClient("", ""))
+    handle = tracker._handles["abc"] = OrderHandle("BTCUSDT", "abc")
+    report = {
+        "e": "executionReport",
+        "s": "BTCUSDT",
+        "i": 7,
+        "c": "abc",
+        "C": "",
+        "r": "NONE",
+    }
+
+    tracker.apply(decode_event({**report, "X": "NEW", "z": "0.0"}))
+    assert handle.accepted.result() == 7
+    assert not handle.done.done()
+
+    tracker.apply(decode_event({**report, "X": "PARTIALLY_FILLED", "z": "0.5"}))
+    tracker.apply(
+        decode_event({**report, "c": "cancel", "C": "abc", "X": "CANCELED", "z": "0.5"})
+    )
+    assert handle.done.result() == "CANCELED"
+    assert handle.filled.result() is False
+    assert handle.executed_quantity == 0.5
+    assert not tracker._handles
+
+
+@pytest.mark.asyncio
+async def test_rejected_order_is_not_accepted():
+    """
+    Test that a rejected order fails its "accepted" future instead of resolving it.
+    """
+    tracker = OrderTracker(BinanceSpotClient("", ""))
+    handle = tracker._handles["abc"] = OrderHandle("BTCUSDT", "abc")
+    report = {"e": "executionReport", "s": "BTCUSDT", "i": 7, "c": "abc", "C": ""}
+
+    tracker.apply(
+        decode_event(
+            {**report, "X": "REJECTED", "z": "0.0", "r": "INSUFFICIENT_BALANCES"}
+        )
+    )
+
+    with pytest.raises(BinanceApiException, match="INSUFFICIENT_BALANCES"):
+        handle.accepted.result()
+    assert handle.done.result() == "REJECTED"
+    assert handle.filled.result() is False
+
+
+@pytest.mark.asyncio
+async def test_wait_retries_failed_status_queries():
+    """
+    Test that waiting for an order keeps going when a status query fails.
+    """
+    client = BinanceSpotClient("", "")
+    tracker = OrderTracker(client)
+    handle = OrderHandle("BTCUSDT", "abc")
+    replies = [
+        BinanceApiException(CONNECTION_ERROR_CODE, "timed out"),
+        {"orderId": 7, "status": "FILLED", "executedQty": "1.0"},
+    ]
+
+    async def fetch_order_status(symbol: str, order_id: int) -> dict:
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    client.fetch_order_status = fetch_order_status  # type: ignore
+
+    assert await tracker.wait(handle, timeout=0.01) == "FILLED"
+    assert handle.filled.result() is True
+    await client.dispose()
@@ -0,0 +1,113 @@
+import pytest
+from decimal import Decimal
+import numpy as np
+
+from binance_python.spot.enums import OrderSide, OrderType
+from binance_python.spot.order_validator import (
+    OrderValidationError,
+    SymbolOrderValidator,
+)
+
+
+@pytest.fixture
+def validator():
+    """
+    Provides a validator compiled from typical BTCUSDT filters.
+    """
+    return SymbolOrderValidator(
+        {  # type: ignore
+            "symbol": "BTCUSDT",
+            "filters": [
+                {
+                    "filterType": "PRICE_FILTER",
+                    "minPrice": "0.01000000",
+                    "maxPrice": "1000000.00000000",
+                    "tickSize": "0.01000000",
+                },
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": "0.00001000",
+                    "maxQty": "9000.00000000",
+                    "stepSize": "0.00001000",
+                },
+                {
+                    "filterType": "MIN_NOTIONAL",
+                    "minNotional": "10.00000000",
+                    "applyToMarket": True,
+                    "avgPriceMins": 5,
+                },
+                {
+                    "filterType": "PERCENT_PRICE_BY_SIDE",
+                    "bidMultiplierUp": "5",
+                    "bidMultiplierDown": "0.2",
+                    "askMultiplierUp": "5",
+                    "askMultiplierDown": "0.2",
+                    "avgPriceMins": 5,
+                },
+            ],
+        }
+    )
+
+
+def test_quantize(validator: SymbolOrderValidator):
+    """
+    Test that prices and quantities are rounded to the tick and step sizes.
+    """
+    assert validator.quantize_price(20000.126) == Decimal("20000.13")
+    assert validator.quantize_quantity(0.29) == Decimal("0.29000")
+    assert validator.quantize_quantity("0.123456789") == Decimal("0.12345")
+
+
+def test_validate(validator: SymbolOrderValidator):
+    """
+    Test that orders violating the filters are rejected locally.
+    """
+    validator.validate(OrderSide.BUY, OrderType.LIMIT, "0.001", "20000.01")
+
+    with pytest.raises(OrderValidationError) as exc_info:
+        validator.validate(OrderSide.BUY, OrderType.LIMIT, "0.001", "20000.001")
+    assert exc_info.value.filter_type == "PRICE_FILTER"
+
+    with pytest.raises(OrderValidationError) as exc_info:
+        validator.validate(OrderSide.BUY, OrderType.LIMIT, "0.0001", "20000")
+    assert exc_info.value.filter_type == "MIN_NOTIONAL"
+
+    with pytest.raises(OrderValidationError) as exc_info:
+        validator.validate(
+            OrderSide.SELL, OrderType.LIMIT, "1", "200000", avg_price="20000"
+        )
+    assert exc_info.value.filter_type == "PERCENT_PRICE_BY_SIDE"
+
+
+def test_validate_batch(validator: SymbolOrderValidator):
+    """
+    Test that a batch of orders is quantized and checked at once.
+    """
+    batch = validator.validate_batch(
+        OrderSide.BUY,
+        prices=[20000.004, 0.001, 20000.0],
+        quantities=[0.001, 1.0, 0.0001],
+        avg_price="20000",
+    )
+
+    assert batch.valid.tolist() == [True, False, False]
+    assert batch.failed_filter.tolist() == ["", "PRICE_FILTER", "MIN_NOTIONAL"]
+    assert batch.price(0) == Decimal("20000.00")
+    assert batch.quantity(0) == Decimal("0.00100")
+
+
+def test_validate_batch_keeps_quantities_on_the_grid(
+    validator: SymbolOrderValidator,
+):
+    """
+    Test that quantities already on the step grid keep their exact step count at realistic sizes.
+    """
+    steps = np.arange(123400000, 123700000)
+    quantities = [float(f"{value / 100000:.5f}") for value in steps.tolist()]
+
+    batch = validator.validate_batch(
+        OrderSide.SELL, prices=[20000.0] * len(quantities), quantities=quantities
+    )
+
+    assert (batch.quantity_steps == steps).all()
+    assert batch.quantity(len(quantities) - 1) == Decimal("1236.99999")
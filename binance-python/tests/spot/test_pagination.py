@@ -0,0 +1,117 @@
+import pytest
+from asyncio import sleep
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.spot.client import BinanceSpotClient, MAX_TIME_RANGE
+
+
+class _History:
+    """
+    Trades history served with the pagination rules of the server.
+    """
+
+    def __init__(self, count: int, interval: int) -> None:
+        self.rows = [{"id": index, "time": index * interval} for index in range(count)]
+        self.calls: list[tuple] = []
+
+    async def fetch(self, from_id, start_time, end_time, limit) -> list[dict]:
+        self.calls.append((from_id, start_time, end_time))
+        if from_id is not None and (start_time is not None or end_time is not None):
+            raise BinanceApiException(
+                -1128, "Combination of optional parameters invalid."
+            )
+        if start_time is not None and end_time is not None:
+            if end_time - start_time > MAX_TIME_RANGE:
+                raise BinanceApiException(
+                    -1127, "More than 24 hours between startTime and endTime."
+                )
+        if start_time is not None and end_time is None:
+            # a start time alone covers the next 24 hours
+            end_time = start_time + MAX_TIME_RANGE
+
+        # later time windows are answered first
+        await sleep(0.01 if start_time is None else 0.1 - start_time / 1e10)
+        rows = self.rows
+        if from_id is not None:
+            rows = [row for row in rows if row["id"] >= from_id]
+        if start_time is not None:
+            rows = [row for row in rows if row["time"] >= start_time]
+        if end_time is not None:
+            rows = [row for row in rows if row["time"] <= end_time]
+        return rows[:limit]
+
+
+async def _ids(pages) -> list[list[int]]:
+    return [[row["id"] for row in page] async for page in pages]
+
+
+@pytest.mark.asyncio
+async def test_paginate_advances_the_id_cursor():
+    """
+    Test that pages follow the id cursor and stop at the first page that is not full.
+    """
+    history = _History(count=25, interval=1000)
+
+    pages = await _ids(
+        BinanceSpotClient._paginate(history.fetch, "id", 0, None, None, 10)
+    )
+
+    assert pages == [list(range(10)), list(range(10, 20)), list(range(20, 25))]
+    assert [call[0] for call in history.calls] == [0, 10, 20]
+
+
+@pytest.mark.asyncio
+async def test_paginate_walks_long_time_ranges_past_quiet_days():
+    """
+    Test that a time range over 24 hours walks 24 hours windows up to the first rows,
+    continues with the id cursor and is cut at its end time locally.
+    """
+    hour = 3600000
+    history = _History(count=100, interval=hour)
+    # nothing happens during the first 30 hours
+    history.rows = history.rows[30:]
+
+    pages = await _ids(
+        BinanceSpotClient._paginate(history.fetch, "id", None, 2 * hour, 80 * hour, 20)
+    )
+
+    assert sum(pages, []) == list(range(30, 81))
+    assert history.calls[:2] == [
+        (None, 2 * hour, 26 * hour - 1),
+        (None, 26 * hour, 50 * hour - 1),
+    ]
+    assert all(call[1:] == (None, None) for call in history.calls[2:])
+
+
+@pytest.mark.asyncio
+async def test_paginate_continues_after_a_short_window():
+    """
+    Test that a window with fewer rows than the page size does not end a longer time range.
+    """
+    hour = 3600000
+    history = _History(count=10, interval=10 * hour)
+
+    pages = await _ids(
+        BinanceSpotClient._paginate(history.fetch, "id", None, 0, 100 * hour, 20)
+    )
+
+    assert sum(pages, []) == list(range(10))
+    assert history.calls[1] == (3, None, None)
+
+
+@pytest.mark.asyncio
+async def test_paginate_windows_yields_pages_in_order():
+    """
+    Test that time windows fetched concurrently yield their pages in time order.
+    """
+    hour = 3600000
+    history = _History(count=120, interval=hour)
+
+    pages = await _ids(
+        BinanceSpotClient._paginate_windows(
+            history.fetch, "id", 0, 100 * hour, 10 * hour, 4, 4
+        )
+    )
+
+    assert sum(pages, []) == list(range(101))
+    assert max(len(page) for page in pages) == 4
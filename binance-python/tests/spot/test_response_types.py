@@ -135,6 +135,48 @@ async def test_place_order_response(client: BinanceSpotClient, trade_symbol: str
     await client.cancel_order(trade_symbol, order_id)
 
 
+@pytest.mark.asyncio
+async def test_cancel_replace_order_response(
+    client: BinanceSpotClient, trade_symbol: str
+):
+    """
+    Test return type of cancel_replace_order endpoint.
+    """
+    # get entry price for a buy limit order
+    price_data = await client.fetch_latest_price(trade_symbol)
+    entry_price = round(float(price_data["price"]) * 0.8, 1)
+
+    # creates a test limit order
+    new_order_data = await client.place_order(
+        symbol=trade_symbol,
+        order_side=OrderSide.BUY,
+        order_type=OrderType.LIMIT,
+        amount=0.01,
+        price=entry_price,
+        time_in_force=TimeInForce.GTC,
+    )
+
+    # replaces it with a lower price
+    data = await client.cancel_replace_order(
+        symbol=trade_symbol,
+        cancel_order_id=new_order_data["orderId"],
+        order_side=OrderSide.BUY,
+        order_type=OrderType.LIMIT,
+        amount=0.01,
+        price=round(entry_price * 0.9, 1),
+        time_in_force=TimeInForce.GTC,
+    )
+
+    # CancelReplaceResponse
+    assert "cancelResult" in data
+    assert "newOrderResult" in data
+    assert "cancelResponse" in data
+    assert "newOrderResponse" in data
+
+    # cancel the created test order
+    await client.cancel_order(trade_symbol, data["newOrderResponse"]["orderId"])
+
+
 @pytest.mark.asyncio
 async def test_fetch_order_status_response(
     client: BinanceSpotClient, trade_symbol: str
@@ -0,0 +1,67 @@
+import pytest
+
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.enums import OrderSide, OrderType
+from binance_python.spot.events import ExecutionReportEvent
+from binance_python.spot.trade_store import TradeStore, TradeSynchronizer
+
+
+def _fill(trade_id: int, order_id: int, time: int) -> ExecutionReportEvent:
+    return ExecutionReportEvent(
+        {
+            "e": "executionReport",
+            "s": "BTCUSDT",
+            "S": "BUY",
+            "x": "TRADE",
+            "i": order_id,
+            "g": -1,
+            "t": trade_id,
+            "L": "20000.00",
+            "l": "0.01000000",
+            "Y": "200.00000000",
+            "n": "0",
+            "N": "BTC",
+            "T": time,
+            "m": False,
+        }
+    )
+
+
+def test_live_fills_are_queryable_without_advancing_the_cursor():
+    """
+    Test that execution report fills are stored once, queried by order and time, and leave the sync cursor alone.
+    """
+    store = TradeStore(":memory:")
+
+    assert store.apply(_fill(7, 100, 1000))
+    assert not store.apply(_fill(7, 100, 1000))
+    assert store.apply(_fill(8, 101, 2000))
+
+    assert [trade["id"] for trade in store.trades("BTCUSDT", order_id=101)] == [8]
+    assert [trade["id"] for trade in store.trades(start_time=1500)] == [8]
+    assert store.trades("BTCUSDT")[0]["isBuyer"] is True
+    assert store.sync_cursor("BTCUSDT") is None
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_new_trades():
+    """
+    Test that a sync resumes from the cursor left by the previous one.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        store = TradeStore(":memory:")
+        synchronizer = TradeSynchronizer(client, store)
+
+        for _ in range(3):
+            await client.place_order("BTCUSDT", OrderSide.BUY, OrderType.MARKET, 0.01)
+        assert await synchronizer.sync(["BTCUSDT", "ETHUSDT"]) == {
+            "BTCUSDT": 3,
+            "ETHUSDT": 0,
+        }
+
+        await client.place_order("BTCUSDT", OrderSide.SELL, OrderType.MARKET, 0.01)
+        assert await synchronizer.sync_symbol("BTCUSDT") == 1
+        assert store.count("BTCUSDT") == 4
+        assert store.sync_cursor("BTCUSDT") == store.trades("BTCUSDT")[-1]["id"]
+        await client.dispose()
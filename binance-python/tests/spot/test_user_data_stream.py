@@ -0,0 +1,69 @@
+import pytest
+from asyncio import create_task, sleep, wait_for
+
+from binance_python.base_api_client import BinanceApiException, CONNECTION_ERROR_CODE
+from binance_python.base_ws_client import STREAM_GAP_EVENT
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.user_data_stream import BinanceUserDataStream
+
+
+@pytest.mark.asyncio
+async def test_keeps_the_listen_key_while_rest_is_down():
+    """
+    Test that a disconnection during a REST outage keeps the stream and its listen key,
+    and that only an expiration replaces the key.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        keep_alive_listen_key = client.keep_alive_listen_key
+        rest_down = False
+        keep_alives = []
+
+        async def flaky_keep_alive_listen_key(listen_key: str) -> None:
+            if rest_down:
+                raise BinanceApiException(
+                    CONNECTION_ERROR_CODE, "Unable to connect with binance server"
+                )
+            keep_alives.append(listen_key)
+            await keep_alive_listen_key(listen_key)
+
+        client.keep_alive_listen_key = flaky_keep_alive_listen_key  # type: ignore
+        user_data_stream = BinanceUserDataStream(client, base_url=server.ws_url)
+        user_data_stream._backoff_base = user_data_stream._backoff_max = 0.02
+        messages = user_data_stream.stream()
+        gap = create_task(anext(messages))
+        await wait_for(user_data_stream.subscribed.wait(), 5.0)
+        listen_key = user_data_stream._listen_key
+
+        rest_down = True
+        await server.disconnect_all()
+        assert (await wait_for(gap, 5.0))["e"] == STREAM_GAP_EVENT
+        message = create_task(anext(messages))
+        await wait_for(user_data_stream.subscribed.wait(), 5.0)
+        await sleep(0.1)
+        rest_down = False
+        await wait_for(user_data_stream._check_task, 5.0)  # type: ignore
+        assert keep_alives == [listen_key]
+        assert user_data_stream._listen_key == listen_key
+
+        server._send_account_position(["USDT"])
+        assert (await wait_for(message, 5.0))["e"] == "outboundAccountPosition"
+
+        # an expired key is replaced
+        server.expire_listen_keys()
+        assert (await wait_for(anext(messages), 5.0))["e"] == "listenKeyExpired"
+        message = create_task(anext(messages))
+
+        async def subscribed_to_a_new_key() -> None:
+            while user_data_stream._listen_key == listen_key or not any(
+                user_data_stream._listen_key in connection.streams
+                for connection in server._connections
+            ):
+                await sleep(0.01)
+
+        await wait_for(subscribed_to_a_new_key(), 5.0)
+        server._send_account_position(["USDT"])
+        assert (await wait_for(message, 5.0))["e"] == "outboundAccountPosition"
+
+        await messages.aclose()  # type: ignore
+        await client.dispose()
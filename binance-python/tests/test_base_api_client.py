@@ -0,0 +1,61 @@
+import pytest
+from asyncio import gather, sleep
+from httpx import Limits
+
+from binance_python.fake_server import FakeBinanceServer
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_reusable_connections():
+    """
+    Test that warming up opens one connection per request, and that later requests reuse them.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+
+        await client.warm_up(4)
+        assert client.pool_stats.new_connections == 4
+        assert client.pool_stats.requests == 4
+
+        await client.fetch_latest_price("BTCUSDT")
+        assert client.pool_stats.new_connections == 4
+        assert client.pool_stats.hits == 1
+        assert client.pool_stats.in_flight == 0
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_reuses_the_pooled_connections():
+    """
+    Test that the background keep alive pings over the already open connections.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client()
+        await client.warm_up(2)
+
+        client.start_keep_alive(2, interval=0.01)
+        await sleep(0.1)
+
+        assert client.pool_stats.requests > 2
+        assert client.pool_stats.new_connections == 2
+
+        # the keep alive is stopped with the client, even in the middle of a ping
+        await client.dispose()
+        assert client._keep_alive_task is None
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_the_pool_limit_are_counted_as_waits():
+    """
+    Test that requests sent while all the connections are busy are counted as waits.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = server.client(
+            limits=Limits(max_connections=2, max_keepalive_connections=2)
+        )
+
+        await gather(*[client.fetch_latest_price("BTCUSDT") for _ in range(5)])
+        assert client.pool_stats.requests == 5
+        assert client.pool_stats.waits == 3
+        assert client.pool_stats.new_connections == 2
+        await client.dispose()
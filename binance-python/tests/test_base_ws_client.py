@@ -0,0 +1,204 @@
+from asyncio import create_task, gather, get_running_loop, sleep, wait_for
+from time import monotonic
+import pytest
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.base_ws_client import (
+    BaseWebsocketClient,
+    ConflatingQueue,
+    MessageQueue,
+    OverflowPolicy,
+    QueueStats,
+    STREAM_GAP_EVENT,
+)
+from binance_python.fake_server import FakeBinanceServer
+
+
+@pytest.mark.asyncio
+async def test_control_replies_resolve_requests():
+    """
+    Test that control replies resolve the request with the same id and are not taken as data.
+    """
+    client = BaseWebsocketClient(None)
+    accepted = client._requests[1] = get_running_loop().create_future()
+    rejected = client._requests[2] = get_running_loop().create_future()
+
+    assert client._handle_reply({"result": None, "id": 1})
+    assert client._handle_reply(
+        {"error": {"code": 2, "msg": "Invalid request"}, "id": 2}
+    )
+    assert not client._handle_reply({"e": "trade", "E": 1, "t": 12345})
+
+    assert accepted.result() is None
+    with pytest.raises(BinanceApiException):
+        rejected.result()
+    assert not client._requests
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    """
+    Test that a full queue drops the oldest message or asks for a disconnection, as configured.
+    """
+    queue = MessageQueue(2)
+    client = BaseWebsocketClient(None, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    for trade_id in range(3):
+        assert await client._enqueue(queue, {"t": trade_id})
+    assert [queue.get_nowait()[1]["t"] for _ in range(2)] == [1, 2]
+    assert client.queue_stats.dropped == 1
+
+    client = BaseWebsocketClient(None, overflow_policy=OverflowPolicy.DISCONNECT)
+    for trade_id in range(2):
+        assert await client._enqueue(queue, {"t": trade_id})
+    assert not await client._enqueue(queue, {"t": 2})
+    assert client.queue_stats.max_depth == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_stream_gaps():
+    """
+    Test that dropping the oldest messages never discards a stream gap marker.
+    """
+    queue = MessageQueue(2)
+    client = BaseWebsocketClient(None, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    await queue.put((0.0, {"e": STREAM_GAP_EVENT}))
+    for trade_id in range(3):
+        assert await client._enqueue(queue, {"t": trade_id})
+
+    assert [queue.get_nowait()[1] for _ in range(2)] == [
+        {"e": STREAM_GAP_EVENT},
+        {"t": 2},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_conflating_queue_keeps_latest_message():
+    """
+    Test that the conflating queue keeps only the latest message of each stream.
+    """
+    stats = QueueStats()
+    queue = ConflatingQueue(stats)
+    for update_id, symbol in enumerate(["BTCUSDT", "ETHUSDT", "BTCUSDT"]):
+        await queue.put(
+            (0.0, {"stream": f"{symbol.lower()}@bookTicker", "data": {"u": update_id}})
+        )
+
+    batch = await queue.get_batch()
+
+    assert [message["data"]["u"] for _, message in batch] == [1, 2]
+    assert stats.conflated == 1
+    assert queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_control_messages_respect_the_rate():
+    """
+    Test that control messages sent concurrently take consecutive slots instead of waking together.
+    """
+    client = BaseWebsocketClient(None, max_control_messages_per_second=20.0)
+    sent_at = []
+
+    async def send() -> None:
+        await client._wait_control_slot()
+        sent_at.append(monotonic())
+
+    await gather(*[send() for _ in range(6)])
+
+    intervals = [later - earlier for earlier, later in zip(sent_at, sent_at[1:])]
+    assert min(intervals) > 0.04
+
+
+async def _publish_trades(server: FakeBinanceServer, count: int) -> None:
+    for trade_id in range(count):
+        server.publish("btcusdt@trade", {"e": "trade", "t": trade_id})
+        await sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_reconnects_with_a_gap_and_resubscribes():
+    """
+    Test that a lost connection yields a stream gap, then the streams are subscribed again.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = BaseWebsocketClient(None, base_url=server.ws_url)
+        other = BaseWebsocketClient(None, base_url=server.ws_url)
+        client.subscribe(["btcusdt@trade"])
+        assert other.subscriptions == set()
+
+        messages = client._stream(raw_stream=False)
+        gap = create_task(anext(messages))
+        await wait_for(client.subscribed.wait(), 5.0)
+        await server.disconnect_all()
+        assert (await wait_for(gap, 5.0))["e"] == STREAM_GAP_EVENT
+
+        await wait_for(client.subscribed.wait(), 5.0)
+        server.publish("btcusdt@trade", {"e": "trade", "t": 1})
+        message = await wait_for(anext(messages), 5.0)
+        assert message == {"stream": "btcusdt@trade", "data": {"e": "trade", "t": 1}}
+        await messages.aclose()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_reports_one_gap_per_outage():
+    """
+    Test that failed reconnection attempts do not yield a stream gap each.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = BaseWebsocketClient(
+            None, base_url=server.ws_url, backoff_base=0.01, backoff_max=0.02
+        )
+        client.subscribe(["btcusdt@trade"])
+        connect = client._connect
+        server_down = False
+        failures = []
+
+        async def flaky_connect(url: str):
+            # the server is unreachable for the first attempts after the disconnection
+            if server_down and len(failures) < 4:
+                failures.append(url)
+                raise OSError("connection refused")
+            return await connect(url)
+
+        client._connect = flaky_connect  # type: ignore
+        messages = client._stream(raw_stream=False)
+        gap = create_task(anext(messages))
+        await wait_for(client.subscribed.wait(), 5.0)
+        server_down = True
+        await server.disconnect_all()
+        assert (await wait_for(gap, 5.0))["e"] == STREAM_GAP_EVENT
+
+        await wait_for(client.subscribed.wait(), 5.0)
+        assert len(failures) == 4
+        server.publish("btcusdt@trade", {"e": "trade", "t": 1})
+        message = await wait_for(anext(messages), 5.0)
+        assert message == {"stream": "btcusdt@trade", "data": {"e": "trade", "t": 1}}
+        await messages.aclose()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_renews_the_connection_without_a_gap():
+    """
+    Test that an old connection is replaced by a subscribed one, without gaps, losses or duplicates.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        client = BaseWebsocketClient(
+            None, base_url=server.ws_url, max_connection_age=0.3
+        )
+        client.subscribe(["btcusdt@trade"])
+        messages = client._stream(raw_stream=False)
+        first = create_task(anext(messages))
+        await wait_for(client.subscribed.wait(), 5.0)
+
+        publisher = create_task(_publish_trades(server, 200))
+        connections = set()
+        trade_ids = []
+        while len(trade_ids) < 200:
+            message = await wait_for(first if not trade_ids else anext(messages), 5.0)
+            assert message["data"]["e"] == "trade"
+            trade_ids.append(message["data"]["t"])
+            connections.add(client._websocket)
+
+        await publisher
+        await messages.aclose()  # type: ignore
+        assert trade_ids == list(range(200))
+        assert len(connections) >= 2
@@ -0,0 +1,15 @@
+from binance_python.clock_sync import ClockSync
+
+
+def test_offset_from_lowest_rtt_sample():
+    """
+    Test that the offset is estimated from the sample with the lowest round trip time.
+    """
+    clock = ClockSync()
+
+    clock.add_sample(sent_at=1000.0, server_time=1600, received_at=1200.0)
+    clock.add_sample(sent_at=2000.0, server_time=2520, received_at=2040.0)
+    clock.add_sample(sent_at=3000.0, server_time=3900, received_at=3600.0)
+
+    assert clock.rtt == 40.0
+    assert clock.offset == 500.0
@@ -0,0 +1,48 @@
+import pytest
+from asyncio import wait_for
+
+from binance_python.base_api_client import BinanceApiException
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.spot.client import BinanceSpotClient
+from binance_python.spot.events import TradeEvent
+from binance_python.spot.market_stream import BinanceMarketStream
+
+
+@pytest.mark.asyncio
+async def test_rejects_bad_signatures_and_exceeded_weight():
+    """
+    Test that the fake server checks signatures and request weight limits as the server does.
+    """
+    async with FakeBinanceServer(weight_limit=30) as server:
+        client = BinanceSpotClient(
+            server.api_key, "wrong secret", base_url=server.rest_url
+        )
+        with pytest.raises(BinanceApiException) as error:
+            await client.fetch_account_info()
+        assert error.value.error_code == -1022
+
+        # the weight of the failed request counts: 20 + 2 + 20 exceeds 30
+        await client.fetch_latest_price("BTCUSDT")
+        with pytest.raises(BinanceApiException) as error:
+            await client.fetch_exchange_info()
+        assert error.value.error_code == -1003
+        assert client.rate_limiter.retry_after > 0
+        await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_streams_subscribed_market_data():
+    """
+    Test that market streams subscribed through the control channel are generated.
+    """
+    async with FakeBinanceServer(market_rate=100.0) as server:
+        market_stream = BinanceMarketStream(base_url=server.ws_url)
+        market_stream.subscribe(["btcusdt@trade"])
+
+        async def first_message():
+            async for stream, event in market_stream.stream():
+                return stream, event
+
+        stream, event = await wait_for(first_message(), 5.0)
+        assert stream == "btcusdt@trade"
+        assert isinstance(event, TradeEvent) and event.symbol == "BTCUSDT"
@@ -0,0 +1,32 @@
+from binance_python.metrics import LatencyHistogram, Metrics
+
+
+def test_histogram_percentiles():
+    """
+    Test that the histogram percentiles are within the bucket precision.
+    """
+    histogram = LatencyHistogram()
+    for millisecond in range(1, 1001):
+        histogram.record(millisecond / 1000)
+
+    assert abs(histogram.percentile(50) - 0.5) < 0.5 / 64
+    assert abs(histogram.percentile(99) - 0.99) < 0.99 / 64
+    assert histogram.percentile(100) == histogram.max == 1.0
+    assert histogram.count == 1000
+
+
+def test_prometheus_export():
+    """
+    Test that requests, errors and stream messages are exported in the Prometheus text format.
+    """
+    metrics = Metrics()
+    metrics.record_request("GET /api/v3/order", 0.02, None, "10")
+    metrics.record_request("GET /api/v3/order", 0.03, -2013, "14")
+    metrics.record_message("btcusdt@trade", 1_000_000, 1000.25)
+
+    text = metrics.to_prometheus()
+
+    assert 'binance_request_seconds_count{endpoint="GET /api/v3/order"} 2' in text
+    assert 'binance_errors_total{code="-2013"} 1' in text
+    assert "binance_used_weight 14" in text
+    assert 'binance_stream_messages_total{stream="btcusdt@trade"} 1' in text
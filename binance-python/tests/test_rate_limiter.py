@@ -0,0 +1,70 @@
+import pytest
+
+from binance_python.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_acquire_reserves_budget():
+    """
+    Test that acquired weight and orders are subtracted from the budget.
+    """
+    limiter = RateLimiter(weight_limit=100, orders_10s_limit=10)
+
+    await limiter.acquire(weight=30, orders=2)
+
+    assert limiter.remaining_weight == 70
+    assert limiter.remaining_orders_10s == 8
+
+
+@pytest.mark.asyncio
+async def test_headers_sync_usage():
+    """
+    Test that the usage reported by the server headers is applied.
+    """
+    limiter = RateLimiter(weight_limit=100)
+    await limiter.acquire(weight=1)
+
+    limiter.update_from_headers(
+        {"x-mbx-used-weight-1m": "90", "x-mbx-order-count-10s": "3"}
+    )
+
+    assert limiter.remaining_weight == 10
+    assert limiter.remaining_orders_10s == 97
+
+
+def test_block_sets_retry_after():
+    """
+    Test that a 429 / 418 response blocks further requests.
+    """
+    limiter = RateLimiter()
+
+    limiter.block(30.0)
+
+    assert 29.0 < limiter.retry_after <= 30.0
+
+
+def test_update_limits_from_exchange_info():
+    """
+    Test that limits are configured from the exchange info rate limits.
+    """
+    limiter = RateLimiter()
+
+    limiter.update_limits(
+        [
+            {
+                "rateLimitType": "REQUEST_WEIGHT",
+                "interval": "MINUTE",
+                "intervalNum": 1,
+                "limit": 1200,
+            },
+            {
+                "rateLimitType": "ORDERS",
+                "interval": "SECOND",
+                "intervalNum": 10,
+                "limit": 50,
+            },
+        ]
+    )
+
+    assert limiter.remaining_weight == 1200
+    assert limiter.remaining_orders_10s == 50
@@ -0,0 +1,40 @@
+import pytest
+
+from binance_python.recorder import StreamRecorder, StreamReplayer
+from binance_python.spot.market_stream import BinanceMarketStream
+
+
+@pytest.mark.asyncio
+async def test_replay_recorded_segments(tmp_path):
+    """
+    Test that frames are replayed in order across rotated segments.
+    """
+    recorder = StreamRecorder(str(tmp_path), max_segment_bytes=64)
+    for trade_id in range(5):
+        recorder.write(f'{{"e":"trade","t":{trade_id}}}', 1000.0 + trade_id / 1000)
+    recorder.close()
+
+    replayer = StreamReplayer(str(tmp_path), speed=100.0, start_time=1000.001)
+    messages = [message async for message in replayer]
+
+    assert [message["t"] for message in messages] == [1, 2, 3, 4]
+    assert len(list(tmp_path.iterdir())) > 1
+
+
+@pytest.mark.asyncio
+async def test_conflated_stream_replays_recorded_messages(tmp_path):
+    """
+    Test that the conflated stream of a replaying client plays the recording instead of connecting.
+    """
+    recorder = StreamRecorder(str(tmp_path))
+    for trade_id in range(3):
+        frame = f'{{"stream":"btcusdt@trade","data":{{"e":"trade","s":"BTCUSDT","t":{trade_id}}}}}'
+        recorder.write(frame, 1000.0 + trade_id / 1000)
+    recorder.close()
+
+    market_stream = BinanceMarketStream(base_url="ws://127.0.0.1:1")
+    market_stream.replay(StreamReplayer(str(tmp_path), speed=None))
+    batches = [batch async for batch in market_stream.conflated_stream()]
+
+    assert batches
+    assert batches[-1]["btcusdt@trade"].trade_id == 2
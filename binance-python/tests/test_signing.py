@@ -0,0 +1,41 @@
+import pytest
+from hashlib import sha256
+from hmac import new as hmac
+
+from binance_python.signing import Ed25519Signer, HmacSigner
+
+
+def test_hmac_signer():
+    """
+    Test that the pre-keyed signer matches a fresh HMAC SHA256.
+    """
+    signer = HmacSigner("secret")
+    payload = b"symbol=BTCUSDT&timestamp=1650000000000"
+
+    expected = hmac(b"secret", payload, sha256).hexdigest()
+
+    assert signer.sign(payload) == expected
+    assert signer.sign(payload) == expected
+
+
+def test_ed25519_signer():
+    """
+    Test that Ed25519 signatures are verifiable and url encoded.
+    """
+    ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+    serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+    from base64 import b64decode
+    from urllib.parse import unquote
+
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    payload = b"symbol=BTCUSDT&timestamp=1650000000000"
+
+    signature = Ed25519Signer(pem).sign(payload)
+
+    assert "+" not in signature and "/" not in signature
+    private_key.public_key().verify(b64decode(unquote(signature)), payload)
@@ -0,0 +1,67 @@
+import pytest
+from asyncio import create_task, sleep, wait_for
+
+from binance_python.fake_server import FakeBinanceServer
+from binance_python.stream_pool import StreamPool
+
+
+@pytest.mark.asyncio
+async def test_assigns_streams_to_the_least_loaded_connection():
+    """
+    Test that streams are spread across the connections, up to their capacity.
+    """
+    pool = StreamPool(connections=2, max_streams_per_connection=3)
+
+    pool.subscribe(["a@trade", "b@trade", "c@trade", "d@trade", "a@trade"])
+
+    assert pool.connection_streams() == [{"a@trade", "c@trade"}, {"b@trade", "d@trade"}]
+    with pytest.raises(ValueError):
+        pool.subscribe(["e@trade", "f@trade", "g@trade"])
+    assert len(pool.streams) == 4
+
+
+async def _publish_trades(server: FakeBinanceServer, stream: str, count: int) -> None:
+    for trade_id in range(count):
+        server.publish(stream, {"e": "trade", "t": trade_id})
+        await sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_rebalance_moves_streams_once_subscribed():
+    """
+    Test that unsubscribing rebalances the streams, and the server ends with the subscriptions of the pool.
+    Messages of a moved stream are neither lost nor duplicated.
+    """
+    async with FakeBinanceServer(market_rate=0.0) as server:
+        pool = StreamPool(connections=2, base_url=server.ws_url)
+        streams = ["btcusdt@trade", "ethusdt@trade", "bnbusdt@trade", "ltcusdt@trade"]
+        subscribed = pool.subscribe(streams)
+        messages = pool.stream()
+        trade_ids = []
+
+        async def consume() -> None:
+            async for message in messages:
+                assert message["stream"] == "ltcusdt@trade"
+                if message["data"]["t"] < 0:
+                    return
+                trade_ids.append(message["data"]["t"])
+
+        consumer = create_task(consume())
+        await wait_for(subscribed, 5.0)
+
+        # "ltcusdt@trade" moves while its trades are published
+        publisher = create_task(_publish_trades(server, "ltcusdt@trade", 100))
+        await sleep(0.05)
+        await wait_for(pool.unsubscribe(["btcusdt@trade", "bnbusdt@trade"]), 5.0)
+        await publisher
+
+        expected = [{"ltcusdt@trade"}, {"ethusdt@trade"}]
+        assert pool.connection_streams() == expected
+        server_streams = [connection.streams for connection in server._connections]
+        assert sorted(server_streams, key=sorted) == sorted(expected, key=sorted)
+
+        server.publish("ltcusdt@trade", {"e": "trade", "t": -1})
+        await wait_for(consumer, 5.0)
+        assert sorted(trade_ids) == list(range(100))
+        assert not pool._overlaps
+        await messages.aclose()  # type: ignore